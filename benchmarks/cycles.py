@@ -0,0 +1,64 @@
+"""Benchmark measuring how finding import cycles scales with project size.
+
+Condenses the dependencies of synthetic projects with an increasing
+number of modules, where modules mostly depend on later modules but
+some depend on earlier ones and create cycles, and prints the time
+taken in total and per dependency.
+
+Usage: python benchmarks/cycles.py [repetitions]
+
+"""
+
+import sys
+import os
+import random
+import timeit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from moduledependency.graph import DependencyGraph
+from moduledependency.cycles import CycleDetector
+
+# Number of modules in each generated project
+MODULE_COUNTS = (1000, 10000, 100000)
+# Number of dependencies each module has
+DEPENDENCIES_PER_MODULE = 5
+# Fraction of dependencies which point to an earlier module
+BACK_EDGE_FRACTION = 0.01
+
+
+def generateGraph(numModules):
+	"""Return DependencyGraph of a synthetic project containing some cycles."""
+	randomGenerator = random.Random(numModules)
+	dependencies = {}
+	for i in range(numModules):
+		targets = set()
+		for j in range(DEPENDENCIES_PER_MODULE):
+			if randomGenerator.random() < BACK_EDGE_FRACTION:
+				targets.add( randomGenerator.randrange(0, i + 1) )
+			else:
+				targets.add( randomGenerator.randrange(i, numModules) )
+		dependencies["project.module_{}".format(i)] = set( "project.module_{}".format(t) for t in targets )
+	return DependencyGraph(dependencies)
+
+def timeBest(function, repetitions):
+	"""Return the best time, in seconds, taken to call function."""
+	return min(timeit.Timer(function).repeat(repeat=repetitions, number=1))
+
+def main(repetitions):
+	"""Run the benchmark and print the results."""
+	detector = CycleDetector()
+	print("{:>10} {:>12} {:>8} {:>12} {:>18}".format("modules", "dependencies", "cycles",
+		"condense (s)", "us per dependency"))
+	for numModules in MODULE_COUNTS:
+		graph = generateGraph(numModules)
+		numCycles = len(detector.findCycles(graph))
+		condenseTime = timeBest(lambda: detector.condense(graph), repetitions)
+		print("{:>10} {:>12} {:>8} {:>12.4f} {:>18.2f}".format(numModules, graph.numEdges, numCycles,
+			condenseTime, condenseTime * 1000000 / graph.numEdges))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		main(int(sys.argv[1]))
+	else:
+		main(3)
@@ -0,0 +1,65 @@
+"""Benchmark measuring the time taken to prune dependencies to every depth.
+
+Prunes the dependencies of a synthetic project to each depth from 0
+to the depth of its deepest module, first with one call to
+DepthPruner.prune() per depth and then with a single call to
+DepthPruner.pruneAll(), and prints the time taken by each.
+
+Usage: python benchmarks/depth_pruner.py [repetitions]
+
+"""
+
+import sys
+import os
+import timeit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from moduledependency.depth_pruner import DepthPruner
+
+# Number of modules in each generated project
+MODULE_COUNTS = (1000, 10000, 50000)
+# Number of dependencies each module has
+DEPENDENCIES_PER_MODULE = 10
+# Depth of the deepest modules in the generated projects
+MAXIMUM_DEPTH = 5
+
+
+def generateDependencies(numModules):
+	"""Return dependencies of a synthetic project with nested packages."""
+	names = []
+	for i in range(numModules):
+		# Spread modules across packages nested up to MAXIMUM_DEPTH levels
+		components = [ "project" ]
+		value = i
+		for level in range(1, MAXIMUM_DEPTH):
+			components.append("pack{}_{}".format(level, value % 4))
+			value //= 4
+		components.append("module_{}".format(i))
+		names.append(".".join(components))
+	dependencies = {}
+	for i, name in enumerate(names):
+		dependencies[name] = set( names[(i * 31 + j * 17) % numModules]
+			for j in range(DEPENDENCIES_PER_MODULE) )
+	return dependencies
+
+def timeBest(function, repetitions):
+	"""Return the best time, in seconds, taken to call function."""
+	return min(timeit.Timer(function).repeat(repeat=repetitions, number=1))
+
+def main(repetitions):
+	"""Run the benchmark and print the results."""
+	pruner = DepthPruner()
+	print("{:>10} {:>20} {:>15}".format("modules", "prune per depth (s)", "pruneAll (s)"))
+	for numModules in MODULE_COUNTS:
+		dependencies = generateDependencies(numModules)
+		perDepthTime = timeBest(lambda: [ pruner.prune(dependencies, depth)
+			for depth in range(MAXIMUM_DEPTH + 1) ], repetitions)
+		allTime = timeBest(lambda: pruner.pruneAll(dependencies), repetitions)
+		print("{:>10} {:>20.4f} {:>15.4f}".format(numModules, perDepthTime, allTime))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		main(int(sys.argv[1]))
+	else:
+		main(3)
@@ -0,0 +1,76 @@
+"""Benchmark comparing dependencies stored as dictionaries and as DependencyGraphs.
+
+Stores the dependencies of synthetic projects with an increasing
+number of modules as a dictionary of sets and as a DependencyGraph,
+and prints the memory each takes along with the time taken to
+whitelist and prune them.
+
+Usage: python benchmarks/graph.py [repetitions]
+
+"""
+
+import sys
+import os
+import timeit
+import tracemalloc
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from moduledependency.graph import DependencyGraph
+from moduledependency.whitelist import Whitelist, WhitelistApplier
+from moduledependency.depth_pruner import DepthPruner
+
+# Number of modules in each generated project
+MODULE_COUNTS = (1000, 10000, 100000)
+# Number of dependencies each module has
+DEPENDENCIES_PER_MODULE = 10
+# Number of modules in each package of the generated projects
+MODULES_PER_PACKAGE = 20
+
+
+def generateDependencies(numModules):
+	"""Return dependencies of a synthetic project, with names built separately like the resolver does."""
+	dependencies = {}
+	for i in range(numModules):
+		deps = set()
+		for j in range(DEPENDENCIES_PER_MODULE):
+			target = (i * 7 + j * 13) % numModules
+			deps.add("project.package_{}.module_{}".format(target // MODULES_PER_PACKAGE, target))
+		dependencies["project.package_{}.module_{}".format(i // MODULES_PER_PACKAGE, i)] = deps
+	return dependencies
+
+def measureMemory(function):
+	"""Return tuple containing result of function and the memory, in bytes, it allocated."""
+	tracemalloc.start()
+	result = function()
+	size = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	return result, size
+
+def timeBest(function, repetitions):
+	"""Return the best time, in seconds, taken to call function."""
+	return min(timeit.Timer(function).repeat(repeat=repetitions, number=1))
+
+def main(repetitions):
+	"""Run the benchmark and print the results."""
+	applier = WhitelistApplier()
+	pruner = DepthPruner()
+	print("{:>10} {:>10} {:>10} {:>16} {:>16} {:>14} {:>14}".format("modules", "dict (MB)", "graph (MB)",
+		"dict filter (s)", "graph filter (s)", "dict prune (s)", "graph prune (s)"))
+	for numModules in MODULE_COUNTS:
+		dependencies, dictSize = measureMemory(lambda: generateDependencies(numModules))
+		graph, graphSize = measureMemory(lambda: DependencyGraph(generateDependencies(numModules)))
+		whitelist = Whitelist(dependencies.keys())
+		dictFilterTime = timeBest(lambda: applier.applyWhitelist(dependencies, whitelist), repetitions)
+		graphFilterTime = timeBest(lambda: applier.applyWhitelist(graph, whitelist), repetitions)
+		dictPruneTime = timeBest(lambda: pruner.prune(dependencies, 1), repetitions)
+		graphPruneTime = timeBest(lambda: pruner.prune(graph, 1), repetitions)
+		print("{:>10} {:>10.2f} {:>10.2f} {:>16.4f} {:>16.4f} {:>14.4f} {:>14.4f}".format(numModules,
+			dictSize / 1000000, graphSize / 1000000, dictFilterTime, graphFilterTime,
+			dictPruneTime, graphPruneTime))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		main(int(sys.argv[1]))
+	else:
+		main(3)
@@ -0,0 +1,71 @@
+"""Benchmark measuring how parsing and resolving imports scales with import count.
+
+Parses synthetic modules containing an increasing number of import
+statements, then resolves the parsed imports of a synthetic project,
+and prints the time taken by each phase. Both phases put every
+ParsedImport into sets, so the time taken to build a set of the
+parsed imports is printed as well.
+
+Usage: python benchmarks/parse_resolve.py [repetitions]
+
+"""
+
+import sys
+import os
+import timeit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from moduledependency.dependency_extractor import ModuleDependencyExtractor
+from moduledependency.import_resolver import ImportResolver
+
+# Number of import statements in each generated module
+IMPORT_COUNTS = (1000, 10000, 50000)
+# Number of modules the generated imports are spread across
+NUM_MODULES = 5
+# Root directory of the synthetic project
+PROJECT_ROOT = "/synthetic/project"
+
+
+def generateImportSource(numImports):
+	"""Return source of a module containing the given number of imports."""
+	lines = []
+	for i in range(numImports):
+		if i % 3 == 0:
+			lines.append("import package_{}.module_{}".format(i % 50, i))
+		elif i % 3 == 1:
+			lines.append("from .sibling_{} import name_{}".format(i % 50, i))
+		else:
+			lines.append("from ..parent_{} import a, b, c".format(i))
+	return "\n".join(lines)
+
+def timeBest(function, repetitions):
+	"""Return the best time, in seconds, taken to call function."""
+	return min(timeit.Timer(function).repeat(repeat=repetitions, number=1))
+
+def main(repetitions):
+	"""Run the benchmark and print the results."""
+	extractor = ModuleDependencyExtractor()
+	resolver = ImportResolver(PROJECT_ROOT)
+	print("{:>10} {:>12} {:>12} {:>12} {:>14}".format(
+		"imports", "parse (s)", "resolve (s)", "set (s)", "us per import"))
+	for numImports in IMPORT_COUNTS:
+		source = generateImportSource(numImports)
+		parseTime = timeBest(lambda: extractor.extractFromString(source), repetitions)
+		# Spread the parsed imports across the modules of the project
+		imports = extractor.extractFromString(source)
+		modules = {}
+		for i in range(NUM_MODULES):
+			path = "{}/package_{}/module_{}.py".format(PROJECT_ROOT, i % 10, i)
+			modules[path] = set(imports)
+		resolveTime = timeBest(lambda: resolver.resolveImports(modules), repetitions)
+		importList = list(imports)
+		setTime = timeBest(lambda: set(importList), repetitions)
+		print("{:>10} {:>12.4f} {:>12.4f} {:>12.4f} {:>14.2f}".format(numImports, parseTime,
+			resolveTime, setTime, (parseTime + resolveTime) * 1000000 / numImports))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		main(int(sys.argv[1]))
+	else:
+		main(3)
@@ -0,0 +1,63 @@
+"""Benchmark measuring the effect of the import statement pre-filter.
+
+Extracts dependencies from a large data module and from a large
+generated code module, with ModuleDependencyExtractor's pre-filter
+enabled and disabled, and prints the time taken for each.
+
+Usage: python benchmarks/prefilter.py [repetitions]
+
+"""
+
+import sys
+import os
+import timeit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from moduledependency.dependency_extractor import ModuleDependencyExtractor
+
+# Number of entries/blocks in the generated sources
+SOURCE_SIZE = 20000
+
+
+def generateDataModule(numEntries):
+	"""Return source of a module that mostly contains a large literal."""
+	lines = [ "import collections", "", "DATA = {" ]
+	for i in range(numEntries):
+		lines.append('\t"key_{0}" : ("value {0}", {0}, [{0}.5, "import x"]),'.format(i))
+	lines.append("}")
+	return "\n".join(lines)
+
+def generateCodeModule(numBlocks):
+	"""Return source of a module that mostly contains generated functions."""
+	lines = [ "from .base import Base, helper", "" ]
+	for i in range(numBlocks):
+		lines.append("def generated_{0}(x, y = {0}):".format(i))
+		lines.append("\t# Generated function number {}".format(i))
+		lines.append("\treturn helper(x * y + {0}, 'from {0}')".format(i))
+	return "\n".join(lines)
+
+def timeExtraction(extractor, source, repetitions):
+	"""Return the best time, in seconds, taken to extract from source."""
+	timer = timeit.Timer(lambda: extractor.extractFromString(source))
+	return min(timer.repeat(repeat=repetitions, number=1))
+
+def main(repetitions):
+	"""Run the benchmark and print the results."""
+	sources = [
+		("data module", generateDataModule(SOURCE_SIZE)),
+		("code module", generateCodeModule(SOURCE_SIZE))
+	]
+	print("{:>12} {:>12} {:>16} {:>15} {:>8}".format(
+		"source", "size (KB)", "full parse (s)", "pre-filter (s)", "speedup"))
+	for name, source in sources:
+		fullTime = timeExtraction(ModuleDependencyExtractor(prefilter=False), source, repetitions)
+		filteredTime = timeExtraction(ModuleDependencyExtractor(prefilter=True), source, repetitions)
+		print("{:>12} {:>12.1f} {:>16.4f} {:>15.4f} {:>7.1f}x".format(
+			name, len(source) / 1024, fullTime, filteredTime, fullTime / filteredTime))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		main(int(sys.argv[1]))
+	else:
+		main(3)
@@ -0,0 +1,161 @@
+"""Generates synthetic Python projects for benchmarking.
+
+Writes a project whose modules are spread across nested packages and
+import each other with a mixture of absolute, relative and external
+imports. The shape of the project is controlled by a configuration,
+so benchmarks can measure how each stage of the pipeline scales.
+
+Usage: python benchmarks/project_generator.py output_directory [modules]
+
+"""
+
+import sys
+import os
+import random
+
+# Default configuration of generated projects
+DEFAULT_CONFIGURATION = {
+	# Number of modules in the project, excluding __init__.py files
+	"modules" : 1000,
+	# Number of nested packages modules are placed in
+	"packageDepth" : 3,
+	# Number of subpackages of each package
+	"packagesPerLevel" : 4,
+	# Number of import statements in each module
+	"importsPerModule" : 10,
+	# Fraction of import statements which are relative imports
+	"relativeImportRatio" : 0.3,
+	# Fraction of import statements which import modules from outside the project
+	"externalImportRatio" : 0.2,
+	# Approximate size of each module in bytes. Code without imports
+	# is added to modules until they reach this size.
+	"fileSize" : 4096,
+	# Seed of the random number generator, so projects are reproducible
+	"seed" : 0
+}
+# Name of the root package of generated projects
+ROOT_PACKAGE = "synthetic"
+# Modules from outside the project which are imported
+EXTERNAL_MODULES = ( "os", "os.path", "sys", "re", "json", "collections", "itertools" )
+# Code added to modules to pad them to the configured size
+FILLER_BLOCK = '''
+
+class Generated{0}(object):
+
+	"""Generated class which doesn't import anything."""
+
+	def method(self, value = {0}):
+		data = {{ "key" : 'value', "other" : [1, 2, 3] }} # comment
+		return "{{}} {{}}".format(value * 2, data["key"])
+'''
+
+
+def getConfiguration(**overrides):
+	"""Return default configuration with the given values replaced."""
+	configuration = dict(DEFAULT_CONFIGURATION)
+	for key, value in overrides.items():
+		if not key in configuration:
+			raise KeyError("Unknown configuration value '{}'".format(key))
+		configuration[key] = value
+	return configuration
+
+def getPackagePath(packageIndex, configuration):
+	"""Return list of the names of the packages containing the package with the given index."""
+	components = []
+	for level in range(configuration["packageDepth"]):
+		components.append("pack{}_{}".format(level, packageIndex % configuration["packagesPerLevel"]))
+		packageIndex //= configuration["packagesPerLevel"]
+	return components
+
+def generateModuleSource(moduleIndex, modules, configuration, randomGenerator):
+	"""Return source code of a module.
+
+	Arguments:
+	moduleIndex -- Index of the module to generate
+	modules -- List containing (package components, module name) tuples
+			   for every module in the project
+	configuration -- Configuration of the project
+	randomGenerator -- random.Random used to choose imports
+
+	"""
+	packageComponents, moduleName = modules[moduleIndex]
+	lines = []
+	for i in range(configuration["importsPerModule"]):
+		choice = randomGenerator.random()
+		if choice < configuration["externalImportRatio"]:
+			lines.append( "import {}".format(randomGenerator.choice(EXTERNAL_MODULES)) )
+		elif choice < configuration["externalImportRatio"] + configuration["relativeImportRatio"]:
+			# Import the module's own package from the package above
+			# it, or a module from the same package
+			if len(packageComponents) > 0 and randomGenerator.random() < 0.5:
+				lines.append( "from .. import {}".format(packageComponents[-1]) )
+			else:
+				# Modules are spread across packages in turn, so every
+				# numPackages'th module is in the same package
+				numPackages = configuration["packagesPerLevel"] ** configuration["packageDepth"]
+				first = moduleIndex % numPackages
+				numSiblings = (len(modules) - first + numPackages - 1) // numPackages
+				siblingIndex = first + numPackages * randomGenerator.randrange(numSiblings)
+				lines.append( "from .{} import name_{}".format(modules[siblingIndex][1], i) )
+		else:
+			otherComponents, otherName = modules[ randomGenerator.randrange(len(modules)) ]
+			fullName = ".".join( [ ROOT_PACKAGE ] + otherComponents + [ otherName ] )
+			if randomGenerator.random() < 0.5:
+				lines.append( "import {}".format(fullName) )
+			else:
+				lines.append( "from {} import name_{}".format(fullName, i) )
+	source = "\n".join(lines)
+	blockIndex = 0
+	while len(source) < configuration["fileSize"]:
+		source += FILLER_BLOCK.format(blockIndex)
+		blockIndex += 1
+	return source + "\n"
+
+def generateProject(outputDirectory, configuration = None):
+	"""Write a synthetic project and return the absolute path to its root directory.
+
+	The project is written to a directory named after ROOT_PACKAGE
+	inside the output directory, which must not already exist.
+
+	Arguments:
+	outputDirectory -- Directory to write the project to
+
+	Keyword arguments:
+	configuration -- Dictionary containing the configuration of the
+					 project. If None, DEFAULT_CONFIGURATION is used.
+					 (default: None)
+
+	"""
+	configuration = configuration or DEFAULT_CONFIGURATION
+	randomGenerator = random.Random(configuration["seed"])
+	projectDirectory = os.path.abspath(os.path.join(outputDirectory, ROOT_PACKAGE))
+	numPackages = configuration["packagesPerLevel"] ** configuration["packageDepth"]
+
+	# Spread modules evenly across the packages at the deepest level
+	modules = [ (getPackagePath(i % numPackages, configuration), "module_{}".format(i))
+		for i in range(configuration["modules"]) ]
+	os.makedirs(projectDirectory)
+	createdPackages = set()
+	for i, (packageComponents, moduleName) in enumerate(modules):
+		# Create every package containing the module
+		for level in range(len(packageComponents) + 1):
+			packageDirectory = os.path.join(projectDirectory, *packageComponents[:level])
+			if not packageDirectory in createdPackages:
+				if not os.path.isdir(packageDirectory):
+					os.makedirs(packageDirectory)
+				with open(os.path.join(packageDirectory, "__init__.py"), "w") as f:
+					f.write("")
+				createdPackages.add(packageDirectory)
+		filename = os.path.join(projectDirectory, *(packageComponents + [ moduleName + ".py" ]))
+		with open(filename, "w") as f:
+			f.write( generateModuleSource(i, modules, configuration, randomGenerator) )
+	return projectDirectory
+
+
+if __name__ == "__main__":
+	if len(sys.argv) < 2:
+		sys.exit(__doc__)
+	overrides = {}
+	if len(sys.argv) > 2:
+		overrides["modules"] = int(sys.argv[2])
+	print( generateProject(sys.argv[1], getConfiguration(**overrides)) )
@@ -0,0 +1,67 @@
+"""Benchmark measuring the time taken by transitive dependency queries.
+
+Queries the transitive dependants and dependencies of modules in a
+synthetic project with 100,000 dependencies, first with an empty
+closure cache and then again with the closures memoised by the
+first queries, and prints the average time taken per query.
+
+Usage: python benchmarks/reachability.py [repetitions]
+
+"""
+
+import sys
+import os
+import random
+import timeit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from moduledependency.graph import DependencyGraph
+
+# Number of modules in the synthetic project
+NUM_MODULES = 20000
+# Number of dependencies each module has
+DEPENDENCIES_PER_MODULE = 5
+# Number of modules queried in each repetition
+NUM_QUERIES = 200
+
+
+def generateGraph():
+	"""Return DependencyGraph of a layered synthetic project, where modules only depend on later modules."""
+	randomGenerator = random.Random(0)
+	dependencies = {}
+	for i in range(NUM_MODULES):
+		targets = [ randomGenerator.randrange(i + 1, NUM_MODULES + 1) for j in range(DEPENDENCIES_PER_MODULE) ]
+		dependencies["project.module_{}".format(i)] = set( "project.module_{}".format(t) for t in targets )
+	return DependencyGraph(dependencies)
+
+def timeBest(function, repetitions):
+	"""Return the best time, in seconds, taken to call function."""
+	return min(timeit.Timer(function).repeat(repeat=repetitions, number=1))
+
+def runQueries(graph, names):
+	"""Query transitive dependants and dependencies of every name."""
+	for name in names:
+		graph.getTransitiveDependants(name)
+		graph.getTransitiveDependencies(name)
+
+def main(repetitions):
+	"""Run the benchmark and print the results."""
+	graph = generateGraph()
+	graph.getReverseArrays()
+	names = random.Random(1).sample(list(graph), NUM_QUERIES)
+	print("{} modules, {} dependencies".format(graph.numNodes, graph.numEdges))
+	def runCold():
+		graph.clearClosures()
+		runQueries(graph, names)
+	coldTime = timeBest(runCold, repetitions)
+	memoisedTime = timeBest(lambda: runQueries(graph, names), repetitions)
+	print("{:>10} {:>16}".format("memoised", "ms per query"))
+	print("{:>10} {:>16.3f}".format("no", coldTime * 1000 / (2 * NUM_QUERIES)))
+	print("{:>10} {:>16.3f}".format("yes", memoisedTime * 1000 / (2 * NUM_QUERIES)))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		main(int(sys.argv[1]))
+	else:
+		main(3)
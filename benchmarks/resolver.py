@@ -0,0 +1,63 @@
+"""Benchmark measuring how resolving imports scales with relative imports per file.
+
+Resolves the imports of a synthetic project whose modules each make
+an increasing number of relative imports, and prints the time taken
+in total and per import.
+
+Usage: python benchmarks/resolver.py [repetitions]
+
+"""
+
+import sys
+import os
+import timeit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from moduledependency.import_resolver import ImportResolver
+from moduledependency.parser import ParsedImport
+
+# Number of relative imports made by each module
+IMPORTS_PER_FILE = (1, 10, 100, 1000)
+# Number of modules in the synthetic project
+NUM_MODULES = 200
+# Number of modules in each package of the synthetic project
+MODULES_PER_PACKAGE = 10
+# Root directory of the synthetic project
+PROJECT_ROOT = "/synthetic/project"
+
+
+def generateDependencies(importsPerFile):
+	"""Return unresolved dependencies of a synthetic project."""
+	dependencies = {}
+	for i in range(NUM_MODULES):
+		path = "{}/package_{}/subpackage/module_{}.py".format(PROJECT_ROOT, i // MODULES_PER_PACKAGE, i)
+		imports = set()
+		for j in range(importsPerFile):
+			# Mix imports from the current and upper level packages
+			if j % 2 == 0:
+				imports.add( ParsedImport(".module_{}".format(j), True) )
+			else:
+				imports.add( ParsedImport("..other_{}.name".format(j), True) )
+		dependencies[path] = imports
+	return dependencies
+
+def timeBest(function, repetitions):
+	"""Return the best time, in seconds, taken to call function."""
+	return min(timeit.Timer(function).repeat(repeat=repetitions, number=1))
+
+def main(repetitions):
+	"""Run the benchmark and print the results."""
+	print("{:>16} {:>12} {:>14}".format("imports per file", "resolve (s)", "us per import"))
+	for importsPerFile in IMPORTS_PER_FILE:
+		dependencies = generateDependencies(importsPerFile)
+		# Use a new resolver for every repetition so caches start empty
+		resolveTime = timeBest(lambda: ImportResolver(PROJECT_ROOT).resolveImports(dependencies), repetitions)
+		print("{:>16} {:>12.4f} {:>14.2f}".format(importsPerFile, resolveTime,
+			resolveTime * 1000000 / (importsPerFile * NUM_MODULES)))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		main(int(sys.argv[1]))
+	else:
+		main(3)
@@ -0,0 +1,201 @@
+"""Benchmark suite timing every stage of the pipeline on synthetic projects.
+
+Generates a synthetic project for each configuration in
+CONFIGURATIONS, times each stage of the pipeline on it separately
+and prints the results. The results are also written to a JSON
+report, so they can be compared between runs to track regressions
+and the effect of optimisations.
+
+Each stage is timed with the output of the previous stage as its
+input, so the stages are timed on realistic data:
+
+  tokenise        -- Tokeniser on every module's source
+  tokenise_regex  -- RegexTokeniser on every module's source
+  parse           -- ImportParser on every module's tokens
+  extract         -- ModuleDependencyExtractor on every module
+                     (reading, prefiltering, tokenising and parsing)
+  extract_mmap    -- Same as extract, but memory mapping every module
+                     and only decoding its import statements
+  extract_ast     -- AstDependencyExtractor on every module
+  extract_async   -- Same as extract, but reading 16 modules at once
+                     with an AsyncFileProcessor
+  resolve         -- ImportResolver on the extracted imports
+  whitelist       -- WhitelistApplier on the resolved dependencies
+  graph           -- Building a DependencyGraph of the whitelisted dependencies
+  prune           -- DepthPruner on the graph, to depth 1
+  weights         -- WeightAnalyser on the graph, with the size of
+                     every module measured beforehand
+  output_<name>   -- Each built-in outputter on the graph
+
+Usage: python benchmarks/suite.py [repetitions] [report_filename]
+
+"""
+
+import sys
+import os
+import json
+import time
+import timeit
+import platform
+import tempfile
+import shutil
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from project_generator import generateProject, getConfiguration
+from moduledependency import VERSION
+from moduledependency.tokeniser import Tokeniser, RegexTokeniser
+from moduledependency.parser import ImportParser
+from moduledependency.dependency_extractor import ModuleDependencyExtractor
+from moduledependency.ast_extractor import AstDependencyExtractor
+from moduledependency.async_processor import AsyncFileProcessor
+from moduledependency.import_resolver import ImportResolver
+from moduledependency.whitelist import Whitelist, WhitelistApplier
+from moduledependency.walker import ProjectWalker
+from moduledependency.graph import DependencyGraph
+from moduledependency.depth_pruner import DepthPruner
+from moduledependency.weights import WeightAnalyser, measureModules
+from moduledependency.outputter import OutputterFactory
+from moduledependency.run import OUTPUTTER_DIRECTORY
+
+# Configurations of the projects the pipeline is timed on. Values
+# not given are taken from project_generator.DEFAULT_CONFIGURATION.
+CONFIGURATIONS = (
+	{ "modules" : 100 },
+	{ "modules" : 1000 },
+	{ "modules" : 5000 },
+	{ "modules" : 1000, "packageDepth" : 6, "packagesPerLevel" : 2 },
+	{ "modules" : 1000, "importsPerModule" : 50, "relativeImportRatio" : 0.6 },
+	{ "modules" : 1000, "fileSize" : 32768 }
+)
+# Names of the outputters which are timed
+OUTPUTTER_NAMES = ( "dot", "python", "xml" )
+# Default filename of the JSON report
+DEFAULT_REPORT_FILENAME = "benchmark_report.json"
+
+
+def timeBest(function, repetitions):
+	"""Return the best time, in seconds, taken to call function."""
+	return min(timeit.Timer(function).repeat(repeat=repetitions, number=1))
+
+def readSources(modulePaths):
+	"""Return list containing the source code of every module."""
+	sources = []
+	for path in modulePaths:
+		with open(path, "r") as f:
+			sources.append(f.read())
+	return sources
+
+def timeStages(projectDirectory, repetitions):
+	"""Return tuple containing dictionaries of the time taken by each stage and the size of the project."""
+	walker = ProjectWalker()
+	walker.scan(projectDirectory)
+	sources = readSources(walker.modulePaths)
+	timings = {}
+
+	timings["tokenise"] = timeBest(lambda: [ Tokeniser().tokenise(source) for source in sources ], repetitions)
+	timings["tokenise_regex"] = timeBest(lambda: [ RegexTokeniser().tokenise(source) for source in sources ],
+		repetitions)
+	tokenLists = [ RegexTokeniser().tokenise(source) for source in sources ]
+	timings["parse"] = timeBest(lambda: [ ImportParser().parse(tokens) for tokens in tokenLists ], repetitions)
+
+	extractor = ModuleDependencyExtractor()
+	extract = lambda: { path : extractor.extract(path) for path in walker.modulePaths }
+	timings["extract"] = timeBest(extract, repetitions)
+	extracted = extract()
+	mappedExtractor = ModuleDependencyExtractor(memoryMap=True)
+	timings["extract_mmap"] = timeBest(lambda: [ mappedExtractor.extract(path) for path in walker.modulePaths ],
+		repetitions)
+	astExtractor = AstDependencyExtractor()
+	timings["extract_ast"] = timeBest(lambda: [ astExtractor.extract(path) for path in walker.modulePaths ],
+		repetitions)
+	asyncProcessor = AsyncFileProcessor(walker, [], extractor, 16)
+	timings["extract_async"] = timeBest(lambda: asyncProcessor.process(projectDirectory), repetitions)
+	# Use a new resolver every time so its caches start empty
+	timings["resolve"] = timeBest(lambda: ImportResolver(projectDirectory).resolveImports(extracted), repetitions)
+	resolved = ImportResolver(projectDirectory).resolveImports(extracted)
+	applier = WhitelistApplier()
+	whitelist = Whitelist(walker.packageNames)
+	timings["whitelist"] = timeBest(lambda: applier.applyWhitelist(resolved, whitelist), repetitions)
+	whitelisted = applier.applyWhitelist(resolved, whitelist)
+	timings["graph"] = timeBest(lambda: DependencyGraph(whitelisted), repetitions)
+	graph = DependencyGraph(whitelisted)
+	pruner = DepthPruner()
+	timings["prune"] = timeBest(lambda: pruner.prune(graph, 1), repetitions)
+	moduleSizes = measureModules(extracted, ImportResolver(projectDirectory))
+	timings["weights"] = timeBest(lambda: WeightAnalyser().analyse(graph, moduleSizes), repetitions)
+
+	factory = OutputterFactory(OUTPUTTER_DIRECTORY)
+	for name in OUTPUTTER_NAMES:
+		outputter = factory.createOutputter(name)
+		timings["output_" + name] = timeBest(lambda: outputter.createOutput(graph), repetitions)
+
+	sizes = {
+		"files" : len(walker.modulePaths),
+		"bytes" : sum( len(source) for source in sources ),
+		"imports" : sum( len(imports) for imports in extracted.values() ),
+		"dependencies" : graph.numEdges
+	}
+	return timings, sizes
+
+def runSuite(repetitions, configurations = CONFIGURATIONS):
+	"""Time the pipeline on a project generated for each configuration and return the report.
+
+	The report is a dictionary which can be written as JSON.
+
+	Arguments:
+	repetitions -- Number of times each stage is timed. The best
+				   time is reported.
+
+	Keyword arguments:
+	configurations -- Collection of dictionaries overriding values of
+					  the default project configuration.
+					  (default: CONFIGURATIONS)
+
+	"""
+	report = {
+		"version" : VERSION,
+		"python" : platform.python_version(),
+		"platform" : platform.platform(),
+		"timestamp" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"repetitions" : repetitions,
+		"results" : []
+	}
+	for overrides in configurations:
+		configuration = getConfiguration(**overrides)
+		outputDirectory = tempfile.mkdtemp()
+		try:
+			projectDirectory = generateProject(outputDirectory, configuration)
+			timings, sizes = timeStages(projectDirectory, repetitions)
+		finally:
+			shutil.rmtree(outputDirectory)
+		report["results"].append({
+			"configuration" : configuration,
+			"sizes" : sizes,
+			"timings" : timings
+		})
+	return report
+
+def printReport(report):
+	"""Print the time taken by each stage for every configuration as a table."""
+	stages = list(report["results"][0]["timings"].keys())
+	print("{:>24} ".format("configuration") + " ".join( "{:>14}".format(stage) for stage in stages ))
+	for result in report["results"]:
+		configuration = result["configuration"]
+		description = "{}m d{} i{} {}KB".format(configuration["modules"], configuration["packageDepth"],
+			configuration["importsPerModule"], configuration["fileSize"] // 1024)
+		print("{:>24} ".format(description) + " ".join( "{:>14.4f}".format(result["timings"][stage])
+			for stage in stages ))
+
+def main(repetitions, reportFilename):
+	"""Run the benchmark suite, print the results and write the JSON report."""
+	report = runSuite(repetitions)
+	printReport(report)
+	with open(reportFilename, "w") as f:
+		json.dump(report, f, indent=4, sort_keys=True)
+	print("report written to {}".format(reportFilename))
+
+
+if __name__ == "__main__":
+	repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+	reportFilename = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_REPORT_FILENAME
+	main(repetitions, reportFilename)
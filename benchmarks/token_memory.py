@@ -0,0 +1,60 @@
+"""Benchmark measuring memory allocated when tokenising Python source.
+
+Tokenises synthetic Python sources with Tokeniser and RegexTokeniser
+while tracing memory allocations, and prints the peak memory used
+per MB of source, as well as the number of distinct Token objects
+that make up each token stream.
+
+Usage: python benchmarks/token_memory.py [number_of_blocks]
+
+"""
+
+import sys
+import os
+import tracemalloc
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from moduledependency.tokeniser import Tokeniser, RegexTokeniser
+
+# Block of source code which is repeated to create large sources
+SOURCE_BLOCK = '''from .package import module_a, module_b
+
+def function_{0}(first, second = None):
+	"""Docstring of the function."""
+	values = [first * 2, second or 0, (first + 1) / 3]
+	return dict(key = values[0], other = values[1:])
+'''
+
+
+def generateSource(numBlocks):
+	"""Return synthetic Python source made from the given number of blocks."""
+	return "".join( SOURCE_BLOCK.format(i) for i in range(numBlocks) )
+
+def measureTokeniser(tokeniser, source):
+	"""Return tuple containing the peak bytes allocated while tokenising
+	source, the number of tokens and the number of distinct token objects."""
+	tracemalloc.start()
+	try:
+		tokens = tokeniser.tokenise(source)
+		peak = tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+	return peak, len(tokens), len(set( id(token) for token in tokens ))
+
+def main(numBlocks):
+	"""Run the benchmark and print the results."""
+	source = generateSource(numBlocks)
+	megabytes = len(source.encode("utf-8")) / (1024 * 1024)
+	print("source size: {:.2f} MB".format(megabytes))
+	print("{:>16} {:>16} {:>10} {:>16}".format("tokeniser", "peak MB per MB", "tokens", "token objects"))
+	for tokeniser in (Tokeniser(), RegexTokeniser()):
+		peak, numTokens, numObjects = measureTokeniser(tokeniser, source)
+		print("{:>16} {:>16.2f} {:>10} {:>16}".format(type(tokeniser).__name__,
+			peak / (1024 * 1024) / megabytes, numTokens, numObjects))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		main(int(sys.argv[1]))
+	else:
+		main(5000)
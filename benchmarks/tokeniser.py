@@ -0,0 +1,64 @@
+"""Benchmark comparing the speed of Tokeniser and RegexTokeniser.
+
+Tokenises synthetic Python sources of increasing size with both
+tokenisers and prints the time taken by each, as well as the
+speedup RegexTokeniser gives over Tokeniser.
+
+Usage: python benchmarks/tokeniser.py [repetitions]
+
+"""
+
+import sys
+import os
+import timeit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from moduledependency.tokeniser import Tokeniser, RegexTokeniser
+
+# Block of source code which is repeated to create large sources.
+# Contains a mixture of imports, strings, comments and other code.
+SOURCE_BLOCK = '''import os.path
+from .package import module_a, module_b # trailing comment
+from ..parent import (first,
+	second)
+
+class Example{0}(object):
+
+	"""Docstring which mentions import statements and 'quotes'."""
+
+	def method(self, value = 0.5):
+		data = {{ "key" : 'value', "other" : [1, 2, 3] }}
+		return "{{}} {{}}".format(value * 2, data["key"])
+'''
+
+# Sizes of the generated sources, as the number of repeated blocks
+SOURCE_SIZES = (100, 1000, 10000)
+
+
+def generateSource(numBlocks):
+	"""Return synthetic Python source made from the given number of blocks."""
+	return "".join( SOURCE_BLOCK.format(i) for i in range(numBlocks) )
+
+def timeTokeniser(tokeniser, source, repetitions):
+	"""Return the best time, in seconds, taken to tokenise source."""
+	timer = timeit.Timer(lambda: tokeniser.tokenise(source))
+	return min(timer.repeat(repeat=repetitions, number=1))
+
+def main(repetitions):
+	"""Run the benchmark and print the results."""
+	print("{:>12} {:>14} {:>14} {:>8}".format("source (KB)", "Tokeniser (s)", "Regex (s)", "speedup"))
+	for numBlocks in SOURCE_SIZES:
+		source = generateSource(numBlocks)
+		if Tokeniser().tokenise(source) != RegexTokeniser().tokenise(source):
+			raise RuntimeError("Tokenisers produced different token streams")
+		originalTime = timeTokeniser(Tokeniser(), source, repetitions)
+		regexTime = timeTokeniser(RegexTokeniser(), source, repetitions)
+		print("{:>12.1f} {:>14.4f} {:>14.4f} {:>7.1f}x".format(
+			len(source) / 1024, originalTime, regexTime, originalTime / regexTime))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		main(int(sys.argv[1]))
+	else:
+		main(3)
@@ -0,0 +1,78 @@
+"""Benchmark measuring how applying a whitelist scales with project size.
+
+Applies the whitelist of synthetic projects with an increasing number
+of modules to their dependencies, using an indexed Whitelist and, for
+the smaller projects, the plain list returned by
+WhitelistGenerator.generate(), and prints the time taken by each.
+
+Usage: python benchmarks/whitelist.py [repetitions]
+
+"""
+
+import sys
+import os
+import timeit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from moduledependency.whitelist import Whitelist, WhitelistApplier
+
+# Number of modules in each generated project
+MODULE_COUNTS = (1000, 10000, 100000)
+# Largest project the plain list whitelist is timed with
+MAX_LIST_MODULES = 1000
+# Number of dependencies each module has
+DEPENDENCIES_PER_MODULE = 10
+# Number of modules in each package of the generated projects
+MODULES_PER_PACKAGE = 20
+
+
+def generateProject(numModules):
+	"""Return tuple containing whitelist and dependencies of a synthetic project."""
+	names = []
+	for i in range(numModules):
+		names.append("project.package_{}.module_{}".format(i // MODULES_PER_PACKAGE, i))
+	whitelist = [ "project" ]
+	whitelist += [ "project.package_{}".format(i) for i in range(numModules // MODULES_PER_PACKAGE) ]
+	whitelist += names
+	dependencies = {}
+	for i, name in enumerate(names):
+		deps = set()
+		for j in range(DEPENDENCIES_PER_MODULE):
+			target = (i * 7 + j * 13) % numModules
+			# Mix project modules, objects imported from them and external modules
+			if j % 3 == 0:
+				deps.add(names[target])
+			elif j % 3 == 1:
+				deps.add("{}.function_{}".format(names[target], j))
+			else:
+				deps.add("external_{}.module".format(target))
+		dependencies[name] = deps
+	return whitelist, dependencies
+
+def timeBest(function, repetitions):
+	"""Return the best time, in seconds, taken to call function."""
+	return min(timeit.Timer(function).repeat(repeat=repetitions, number=1))
+
+def main(repetitions):
+	"""Run the benchmark and print the results."""
+	applier = WhitelistApplier()
+	print("{:>10} {:>12} {:>15} {:>15}".format("modules", "list (s)", "Whitelist (s)", "us per module"))
+	for numModules in MODULE_COUNTS:
+		whitelist, dependencies = generateProject(numModules)
+		if numModules <= MAX_LIST_MODULES:
+			# Time the lookups which used to be done by scanning the list
+			listTime = timeBest(lambda: [ applier.inWhitelist(dep, whitelist)
+				for deps in dependencies.values() for dep in deps ], repetitions)
+			listTimeStr = "{:>12.4f}".format(listTime)
+		else:
+			listTimeStr = "{:>12}".format("-")
+		indexedTime = timeBest(lambda: applier.applyWhitelist(dependencies, Whitelist(whitelist)), repetitions)
+		print("{:>10} {} {:>15.4f} {:>15.2f}".format(numModules, listTimeStr, indexedTime,
+			indexedTime * 1000000 / numModules))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		main(int(sys.argv[1]))
+	else:
+		main(3)
@@ -0,0 +1,249 @@
+"""Contains functionality to identify dependencies in Python source code
+using Python's own parser."""
+
+import os.path
+import ast
+import importlib.util
+
+from .dependency_extractor import ModuleDependencyExtractor
+from .parser import (ParsedImport, IMPORT_CONTEXTS, CONTEXT_TOP_LEVEL, CONTEXT_TRY,
+	CONTEXT_FUNCTION, CONTEXT_TYPE_CHECKING)
+
+
+class ImportVisitor(ast.NodeVisitor):
+
+	"""Finds every import in an abstract syntax tree, along with the context it was made in.
+
+	Contexts are nested, and the context which comes later in
+	IMPORT_CONTEXTS takes precedence (e.g. an import inside a "try"
+	statement inside a function is a function import).
+
+	"""
+
+	def __init__(self):
+		"""Construct instance of ImportVisitor."""
+		self.imports = []
+		self.context = CONTEXT_TOP_LEVEL
+
+	def visitInContext(self, nodes, context):
+		"""Visit a list of nodes inside a context.
+
+		Arguments:
+		nodes -- List of AST nodes to visit
+		context -- Context the nodes are in. Ignored if the current
+				   context takes precedence over it.
+
+		"""
+		previousContext = self.context
+		if IMPORT_CONTEXTS.index(context) > IMPORT_CONTEXTS.index(previousContext):
+			self.context = context
+		for node in nodes:
+			self.visit(node)
+		self.context = previousContext
+
+	def addImport(self, node, moduleName, relative):
+		"""Add import made by an import statement node."""
+		self.imports.append( ParsedImport(moduleName, relative, self.context,
+			node.lineno, node.col_offset + 1) )
+
+	def visit_Import(self, node):
+		for alias in node.names:
+			self.addImport(node, alias.name, False)
+
+	def visit_ImportFrom(self, node):
+		# Names are built in the same way as by ImportParser, so both
+		# engines produce the same dependencies. A single leading dot
+		# is removed if the root module is named (e.g. "from .a import
+		# b" is "a.b"), but other dots are kept (e.g. "from .. import
+		# b" is "..b" and "from ..a import b" is "..a.b").
+		if node.level == 1 and node.module:
+			rootModuleName = node.module
+		else:
+			rootModuleName = "." * node.level + (node.module or "")
+		separator = "" if node.module == None else "."
+		for alias in node.names:
+			if alias.name == "*":
+				self.addImport(node, rootModuleName, node.level > 0)
+			else:
+				self.addImport(node, rootModuleName + separator + alias.name, node.level > 0)
+
+	def visitFunction(self, node):
+		# Decorators and default values run when the function is defined
+		for child in node.decorator_list:
+			self.visit(child)
+		self.visit(node.args)
+		self.visitInContext(node.body, CONTEXT_FUNCTION)
+
+	visit_FunctionDef = visitFunction
+	visit_AsyncFunctionDef = visitFunction
+
+	def visit_Lambda(self, node):
+		self.visit(node.args)
+		self.visitInContext([ node.body ], CONTEXT_FUNCTION)
+
+	def visitTry(self, node):
+		self.visitInContext(node.body, CONTEXT_TRY)
+		self.visitInContext(node.handlers, CONTEXT_TRY)
+		for child in node.orelse + node.finalbody:
+			self.visit(child)
+
+	visit_Try = visitTry
+	visit_TryStar = visitTry
+
+	def visit_If(self, node):
+		self.visit(node.test)
+		if self.isTypeChecking(node.test):
+			self.visitInContext(node.body, CONTEXT_TYPE_CHECKING)
+		else:
+			for child in node.body:
+				self.visit(child)
+		for child in node.orelse:
+			self.visit(child)
+
+	def isTypeChecking(self, test):
+		"""Return True if an "if" statement's test is TYPE_CHECKING or typing.TYPE_CHECKING."""
+		if isinstance(test, ast.Name):
+			return test.id == "TYPE_CHECKING"
+		elif isinstance(test, ast.Attribute):
+			return test.attr == "TYPE_CHECKING"
+		return False
+
+
+class AstDependencyExtractor(ModuleDependencyExtractor):
+
+	"""Extracts dependencies by parsing source code into an abstract syntax tree.
+
+	Slower than the token-based ModuleDependencyExtractor, but uses
+	Python's own parser, so only real import statements are found
+	and every import is tagged with its context, line and column.
+	Files are read as bytes so Python's parser decodes them using
+	their PEP 263 encoding declaration.
+
+	Files which are not valid Python (e.g. Python 2 code) are
+	extracted by the token-based engine instead, whose imports
+	have no context, line or column.
+
+	"""
+
+	# Name of the engine, used to keep cached results of different engines apart
+	ENGINE = "ast"
+
+	def __init__(self, whitelist = None, counters = None):
+		"""Create new instance of AstDependencyExtractor.
+
+		Keyword arguments:
+		whitelist -- List of strings denoting the names of packages
+					 or modules that are allowed. If not provided,
+					 no whitelist will be used to filter results.
+					 (default: None)
+		counters -- collections.Counter which the number of files,
+					bytes and imports extracted are added to, as
+					well as the number of files that could not be
+					parsed. If not provided, nothing is counted.
+					(default: None)
+
+		"""
+		super().__init__(whitelist, counters=counters)
+
+	def extract(self, filename):
+		"""Read a file and return the set of dependencies in its source code.
+
+		Arguments:
+		filename -- Path to the file to extract dependencies from
+
+		"""
+		if not isinstance(filename, str):
+			raise TypeError("Filename must be a string")
+		if self.counters != None:
+			self.counters["files"] += 1
+			self.counters["bytes"] += os.path.getsize(filename)
+		with open(filename, "rb") as f:
+			return self.extractFromString(f.read())
+
+	def extractFromBytes(self, data):
+		"""Take Python source code as bytes and return the code's set of dependencies.
+
+		Arguments:
+		data -- Bytes containing Python source code to analyse
+
+		"""
+		return self.extractFromString(data)
+
+	def extractFromString(self, data):
+		"""Take Python source code and return the code's set of dependencies.
+
+		Arguments:
+		data -- String or bytes containing Python source code to analyse
+
+		"""
+		try:
+			tree = ast.parse(data)
+		except (SyntaxError, ValueError):
+			if self.counters != None:
+				self.counters["syntax_errors"] += 1
+			if isinstance(data, bytes):
+				data = importlib.util.decode_source(data)
+			return super().extractFromString(data)
+
+		visitor = ImportVisitor()
+		visitor.visit(tree)
+		# If the same module is imported more than once, keep the import
+		# which runs soonest, so an import made at the top level of a
+		# module isn't hidden by the same import inside a function
+		earliestImports = {}
+		for parsedImport in visitor.imports:
+			if not parsedImport in earliestImports or (IMPORT_CONTEXTS.index(parsedImport.context) <
+					IMPORT_CONTEXTS.index(earliestImports[parsedImport].context)):
+				earliestImports[parsedImport] = parsedImport
+		foundDependencies = set(earliestImports.values())
+		if self.usingWhitelist():
+			foundDependencies = self.applyWhitelist(foundDependencies)
+		if self.counters != None:
+			self.counters["imports"] += len(foundDependencies)
+		return foundDependencies
+
+
+class ImportTimeExtractor:
+
+	"""Wraps an extractor so only imports which run when a module is imported are returned.
+
+	Deferred imports (see ParsedImport.isDeferred()) are discarded,
+	so the dependencies found form the graph of modules loaded at
+	import time. The wrapped extractor must find the context of
+	imports, like AstDependencyExtractor does.
+
+	"""
+
+	def __init__(self, extractor):
+		"""Construct instance of ImportTimeExtractor.
+
+		Arguments:
+		extractor -- Extractor whose deferred imports are discarded
+
+		"""
+		self.extractor = extractor
+		# Results differ from the wrapped extractor's, so they're cached separately
+		self.ENGINE = extractor.ENGINE + ":import-time"
+		# Shared with the wrapped extractor, so counts made by worker
+		# processes can be sent back
+		self.counters = extractor.counters
+
+	def extract(self, filename):
+		"""Return dependencies of a file which run at import time.
+
+		Arguments:
+		filename -- Path to the file to extract dependencies from
+
+		"""
+		return set( dependency for dependency in self.extractor.extract(filename)
+			if not dependency.isDeferred() )
+
+	def extractFromBytes(self, data):
+		"""Return dependencies in Python source code, stored as bytes, which run at import time.
+
+		Arguments:
+		data -- Bytes containing Python source code to analyse
+
+		"""
+		return set( dependency for dependency in self.extractor.extractFromBytes(data)
+			if not dependency.isDeferred() )
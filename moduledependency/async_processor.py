@@ -0,0 +1,210 @@
+"""Contains functionality for extracting dependencies from many files
+while reading them concurrently."""
+
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+def readFile(filename):
+    """Return contents of a file as bytes.
+
+    Arguments:
+    filename -- Path to the file to read
+
+    """
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+class AsyncFileProcessor:
+
+    """Extracts data from files while many of them are being read at once.
+
+    Can be used in place of fileprocessor.FileProcessor. Files are
+    read by a pool of threads, so the time spent waiting for slow
+    filesystems (e.g. network filesystems) overlaps. Each file is
+    extracted as soon as it has been read, in a single thread of its
+    own, as extractors aren't thread-safe. Extraction never runs in
+    the event loop, so new reads are started while files are being
+    extracted.
+
+    The extracted data is passed through a queue of limited size to
+    a consumer which collects the results. When the queue is full,
+    readers wait before reading more files, so the amount of data
+    waiting to be collected is bounded. Results are merged in order
+    of filename, so the result is the same regardless of the order
+    reads finish in.
+
+    """
+
+    # Default maximum number of extracted files waiting to be collected
+    DEFAULT_QUEUE_SIZE = 64
+
+    def __init__(self, searcher, filterers, extractor, concurrency, queueSize = None, cache = None,
+            pool = None):
+        """Construct instance of AsyncFileProcessor.
+
+        Arguments:
+        searcher -- Searcher used to find the files to process
+        filterers -- List of filterers applied to the found files
+        extractor -- Extractor used to extract data from each file.
+                     Must have an extractFromBytes() method, which
+                     is given the contents of each file.
+        concurrency -- Maximum number of files read at once. Must be
+                       a positive integer.
+
+        Keyword arguments:
+        queueSize -- Maximum number of extracted files waiting to be
+                     collected. If not provided, DEFAULT_QUEUE_SIZE
+                     is used. (default: None)
+        cache -- Instance of ExtractionCache. If provided, only
+                 files without a valid cache entry are read.
+                 Entries are stored under the extractor's ENGINE.
+                 (default: None)
+        pool -- concurrent.futures.ThreadPoolExecutor which files are
+                read in, instead of starting new threads, so a pool
+                can be shared by many runs. It is not shut down when
+                processing finishes. (default: None)
+
+        """
+        if not isinstance(concurrency, int):
+            raise TypeError("Concurrency limit must be an integer")
+        if concurrency < 1:
+            raise ValueError("Concurrency limit must be at least one")
+        self.searcher = searcher
+        self.filterers = filterers
+        self.extractor = extractor
+        self.concurrency = concurrency
+        self.queueSize = queueSize or self.DEFAULT_QUEUE_SIZE
+        self.cache = cache
+        self.pool = pool
+
+    def findFiles(self, directory):
+        """Return sorted list of files in directory which pass all filterers.
+
+        Arguments:
+        directory -- Path to the directory to search
+
+        """
+        filenames = self.searcher.search(directory)
+        for filterer in self.filterers:
+            filenames = filterer.filter(filenames)
+        return sorted(filenames)
+
+    def process(self, directory):
+        """Extract data from all of the files in a directory.
+
+        Returns dictionary where the keys are the paths to the
+        processed files and the values are the data extracted
+        from the respective file.
+
+        Arguments:
+        directory -- Path to the directory containing the files
+                     to process
+
+        """
+        filenames = self.findFiles(directory)
+        data = {}
+        # Only read files that haven't been cached. Files are stat'd
+        # before they're read, so files which change before their
+        # results are stored aren't cached.
+        stats = {}
+        if self.cache:
+            uncachedFilenames = []
+            for filename in filenames:
+                cached = self.cache.lookup(filename, self.extractor.ENGINE)
+                if cached == None:
+                    uncachedFilenames.append(filename)
+                    stats[filename] = os.stat(filename)
+                else:
+                    data[filename] = cached
+        else:
+            uncachedFilenames = filenames
+        if len(uncachedFilenames) > 0:
+            extracted = asyncio.run( self.processFiles(uncachedFilenames) )
+            for filename in uncachedFilenames:
+                data[filename] = extracted[filename]
+                if self.cache:
+                    self.cache.store(filename, extracted[filename], self.extractor.ENGINE, stats[filename])
+        # Rebuild dictionary so cached and extracted files are merged
+        # in the same order as the files were found
+        return { filename : data[filename] for filename in filenames }
+
+    async def processFiles(self, filenames):
+        """Read files concurrently and return dictionary mapping each file to the data extracted from it.
+
+        If reading or extracting any file fails, the exception is
+        raised once the reads in progress have finished.
+
+        Arguments:
+        filenames -- List of paths to the files to process
+
+        """
+        with ThreadPoolExecutor(max_workers=1) as extractionPool:
+            if self.pool:
+                return await self.processFilesInPool(filenames, self.pool, extractionPool)
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                return await self.processFilesInPool(filenames, pool, extractionPool)
+
+    async def processFilesInPool(self, filenames, pool, extractionPool):
+        """Read files concurrently in a thread pool and return dictionary mapping each file to its data.
+
+        Arguments:
+        filenames -- List of paths to the files to process
+        pool -- concurrent.futures.Executor the files are read in
+        extractionPool -- concurrent.futures.Executor with a single
+                          worker, which the files are extracted in
+
+        """
+        queue = asyncio.Queue(self.queueSize)
+        # Readers share one iterator, so each file is read once
+        remaining = iter(filenames)
+        readers = [ asyncio.ensure_future(self.readFiles(remaining, pool, extractionPool, queue))
+            for i in range(min(self.concurrency, len(filenames))) ]
+        consumer = asyncio.ensure_future(self.collectResults(len(filenames), queue))
+        try:
+            await asyncio.gather(consumer, *readers)
+        finally:
+            for task in readers + [ consumer ]:
+                task.cancel()
+        return consumer.result()
+
+    async def readFiles(self, filenames, pool, extractionPool, queue):
+        """Read and extract files, and put their data in a queue, until none are left.
+
+        Arguments:
+        filenames -- Iterator over the paths to the files to read,
+                     shared by every reader
+        pool -- concurrent.futures.Executor the files are read in
+        extractionPool -- concurrent.futures.Executor with a single
+                          worker, which the files are extracted in
+        queue -- asyncio.Queue which (filename, size, data) tuples are
+                 put in. Waits while it is full.
+
+        """
+        loop = asyncio.get_running_loop()
+        for filename in filenames:
+            contents = await loop.run_in_executor(pool, readFile, filename)
+            data = await loop.run_in_executor(extractionPool, self.extractor.extractFromBytes, contents)
+            await queue.put( (filename, len(contents), data) )
+
+    async def collectResults(self, numFiles, queue):
+        """Take the data of extracted files from a queue and return dictionary mapping each file to its data.
+
+        Arguments:
+        numFiles -- Number of files to take from the queue
+        queue -- asyncio.Queue containing (filename, size, data) tuples
+
+        """
+        counters = getattr(self.extractor, "counters", None)
+        extracted = {}
+        for i in range(numFiles):
+            filename, size, data = await queue.get()
+            # Files aren't given to the extractor's extract(), so the
+            # files and bytes it would count are counted here instead
+            if counters != None:
+                counters["files"] += 1
+                counters["bytes"] += size
+            extracted[filename] = data
+        return extracted
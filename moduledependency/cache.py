@@ -0,0 +1,276 @@
+"""Contains functionality for caching extracted dependencies between runs."""
+
+import os
+import json
+import sqlite3
+import hashlib
+from array import array
+
+from .parser import ParsedImport
+from .dependency_extractor import EXTRACTOR_VERSION
+from .graph import DependencyGraph
+
+
+class ExtractionCache:
+
+    """Persistent store of the dependencies extracted from each file.
+
+    Entries are stored in an SQLite database inside the cache
+    directory, separately for each extraction engine (see the
+    ENGINE attribute of extractors). An entry is only used if the file's modification
+    time and size are unchanged, or if content hashing is enabled
+    and the file's content is unchanged. All entries are discarded
+    when the cache was written by a different version of the
+    extraction logic.
+
+    The resolved DependencyGraph of whole projects can be stored too,
+    along with a fingerprint of the project's files, so queries can
+    reuse it without extracting anything while no file has changed.
+
+    """
+
+    # Name of the database file inside the cache directory
+    DATABASE_FILENAME = "moduledependency_cache.sqlite3"
+    # Version of the database layout. Must be changed whenever the
+    # tables or the way dependencies are stored changes.
+    FORMAT_VERSION = 3
+    # Type code of the arrays used to store graphs
+    GRAPH_ARRAY_TYPECODE = "l"
+
+    def __init__(self, cacheDirectory, useHashes = False):
+        """Construct instance of ExtractionCache.
+
+        The cache directory is created if it doesn't exist.
+
+        Arguments:
+        cacheDirectory -- Path to directory to store the cache in
+
+        Keyword arguments:
+        useHashes -- If True, a hash of each file's contents is
+                     stored and used to detect unchanged files
+                     whose modification time has changed (e.g.
+                     after a fresh checkout). (default: False)
+
+        """
+        if not os.path.isdir(cacheDirectory):
+            os.makedirs(cacheDirectory)
+        self.filename = os.path.join(cacheDirectory, self.DATABASE_FILENAME)
+        self.useHashes = useHashes
+        self.hits = 0
+        self.misses = 0
+
+        self.connection = sqlite3.connect(self.filename)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS metadata "
+            "(key TEXT PRIMARY KEY, value TEXT)")
+        self.checkVersion()
+
+    def getVersion(self):
+        """Return string identifying the format and extraction logic of cached entries."""
+        return "{}.{}".format(self.FORMAT_VERSION, EXTRACTOR_VERSION)
+
+    def checkVersion(self):
+        """Discard all entries if they were stored by a different version.
+
+        The tables are dropped and recreated, so they always have
+        the layout of the current version.
+
+        """
+        row = self.connection.execute(
+            "SELECT value FROM metadata WHERE key = 'version'").fetchone()
+        if not row or row[0] != self.getVersion():
+            self.connection.execute("DROP TABLE IF EXISTS files")
+            self.connection.execute("DROP TABLE IF EXISTS graphs")
+            self.connection.execute("INSERT OR REPLACE INTO metadata VALUES ('version', ?)",
+                (self.getVersion(),))
+        self.connection.execute("CREATE TABLE IF NOT EXISTS files "
+            "(path TEXT, engine TEXT, mtime INTEGER, size INTEGER, hash TEXT, dependencies TEXT, "
+            "PRIMARY KEY (path, engine))")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS graphs "
+            "(project TEXT PRIMARY KEY, fingerprint TEXT, names TEXT, numDependants INTEGER, "
+            "edgeOffsets BLOB, edgeTargets BLOB, reverseOffsets BLOB, reverseTargets BLOB)")
+        self.connection.commit()
+
+    def hashFile(self, filename):
+        """Return SHA-1 hex digest of a file's contents.
+
+        Arguments:
+        filename -- Path to the file to hash
+
+        """
+        hasher = hashlib.sha1()
+        with open(filename, "rb") as f:
+            hasher.update(f.read())
+        return hasher.hexdigest()
+
+    def serialise(self, dependencies):
+        """Return string representation of a set of ParsedImport objects.
+
+        The context, line and column of imports are only stored if
+        the import's context is known.
+
+        """
+        return json.dumps(sorted(
+            [dep.moduleName, dep.relative] if dep.context == None else
+            [dep.moduleName, dep.relative, dep.context, dep.line, dep.column]
+            for dep in dependencies ))
+
+    def deserialise(self, data):
+        """Return set of ParsedImport objects from their string representation."""
+        return set( ParsedImport(*values) for values in json.loads(data) )
+
+    def lookup(self, filename, engine = "tokens"):
+        """Return cached dependencies of a file, or None if no valid entry exists.
+
+        Arguments:
+        filename -- Absolute path to the file
+
+        Keyword arguments:
+        engine -- Name of the engine the dependencies were extracted
+                  by. (default: "tokens")
+
+        """
+        row = self.connection.execute("SELECT mtime, size, hash, dependencies "
+            "FROM files WHERE path = ? AND engine = ?", (filename, engine)).fetchone()
+        if row:
+            mtime, size, fileHash, dependencies = row
+            stat = os.stat(filename)
+            if stat.st_mtime_ns == mtime and stat.st_size == size:
+                self.hits += 1
+                return self.deserialise(dependencies)
+            # If file was touched, its contents may still be the same
+            elif self.useHashes and stat.st_size == size and fileHash == self.hashFile(filename):
+                self.connection.execute("UPDATE files SET mtime = ? WHERE path = ? AND engine = ?",
+                    (stat.st_mtime_ns, filename, engine))
+                self.hits += 1
+                return self.deserialise(dependencies)
+        self.misses += 1
+        return None
+
+    def store(self, filename, dependencies, engine = "tokens", stat = None):
+        """Store dependencies extracted from a file.
+
+        If the file changed after it was read, the dependencies may
+        be out of date, so they aren't stored. Otherwise they would
+        be stored under the new modification time and size, and used
+        by later runs until the file changed again.
+
+        Arguments:
+        filename -- Absolute path to the file
+        dependencies -- Set of ParsedImport objects extracted
+                        from the file
+
+        Keyword arguments:
+        engine -- Name of the engine the dependencies were extracted
+                  by. (default: "tokens")
+        stat -- Result of os.stat() on the file, taken before it was
+                read. If None, the file is assumed not to have changed
+                since it was read. (default: None)
+
+        """
+        # Hashed before the file is checked for changes, so changes
+        # made while it is being hashed are detected too
+        if self.useHashes:
+            fileHash = self.hashFile(filename)
+        else:
+            fileHash = None
+        currentStat = os.stat(filename)
+        if stat == None:
+            stat = currentStat
+        elif (stat.st_mtime_ns, stat.st_size) != (currentStat.st_mtime_ns, currentStat.st_size):
+            return
+        self.connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+            (filename, engine, stat.st_mtime_ns, stat.st_size, fileHash, self.serialise(dependencies)))
+
+    def getFingerprint(self, filenames):
+        """Return string which changes whenever any of the given files change.
+
+        Uses the path, modification time and size of every file,
+        so files are not read. The order of filenames is ignored.
+
+        Arguments:
+        filenames -- Collection of absolute paths to files
+
+        """
+        hasher = hashlib.sha1()
+        for filename in sorted(filenames):
+            stat = os.stat(filename)
+            hasher.update("{}\0{}\0{}\n".format(filename, stat.st_mtime_ns, stat.st_size).encode("utf-8"))
+        return hasher.hexdigest()
+
+    def lookupGraph(self, projectDirectory, fingerprint):
+        """Return cached DependencyGraph of a project, or None if no valid entry exists.
+
+        Arguments:
+        projectDirectory -- Absolute path to the project's root directory
+        fingerprint -- Fingerprint of the project's current files,
+                       returned by getFingerprint()
+
+        """
+        row = self.connection.execute("SELECT fingerprint, names, numDependants, edgeOffsets, "
+            "edgeTargets, reverseOffsets, reverseTargets FROM graphs WHERE project = ?",
+            (projectDirectory,)).fetchone()
+        if not row or row[0] != fingerprint:
+            return None
+        arrays = []
+        for data in row[3:]:
+            values = array(self.GRAPH_ARRAY_TYPECODE)
+            values.frombytes(data)
+            arrays.append(values)
+        return DependencyGraph.fromArrays(json.loads(row[1]), row[2], *arrays)
+
+    def storeGraph(self, projectDirectory, fingerprint, graph):
+        """Store DependencyGraph of a project, replacing any graph stored for it before.
+
+        The graph's reverse arrays are built and stored too.
+
+        Arguments:
+        projectDirectory -- Absolute path to the project's root directory
+        fingerprint -- Fingerprint of the project's files, returned by
+                       getFingerprint(), when the graph was found
+        graph -- DependencyGraph to store
+
+        """
+        reverseOffsets, reverseTargets = graph.getReverseArrays()
+        self.connection.execute("INSERT OR REPLACE INTO graphs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (projectDirectory, fingerprint, json.dumps(graph.names), graph.numDependants,
+            graph.edgeOffsets.tobytes(), graph.edgeTargets.tobytes(),
+            reverseOffsets.tobytes(), reverseTargets.tobytes()))
+
+    def commit(self):
+        """Write all stored entries to disk."""
+        self.connection.commit()
+
+    def close(self):
+        """Write all stored entries to disk and close the cache."""
+        self.connection.commit()
+        self.connection.close()
+
+
+class CachingExtractor:
+
+    """Wraps an extractor so it only extracts from files not in a cache."""
+
+    def __init__(self, extractor, cache):
+        """Construct instance of CachingExtractor.
+
+        Arguments:
+        extractor -- Extractor used for files that aren't cached
+        cache -- Instance of ExtractionCache
+
+        """
+        self.extractor = extractor
+        self.cache = cache
+
+    def extract(self, filename):
+        """Return dependencies of a file, using the cache if possible.
+
+        Arguments:
+        filename -- Path to the file to extract dependencies from
+
+        """
+        dependencies = self.cache.lookup(filename, self.extractor.ENGINE)
+        if dependencies == None:
+            stat = os.stat(filename)
+            dependencies = self.extractor.extract(filename)
+            self.cache.store(filename, dependencies, self.extractor.ENGINE, stat)
+        return dependencies
@@ -5,6 +5,7 @@ into data that can be retrieved easily.
 
 import os
 import re
+import sys
 from copy import deepcopy
 
 class ArgumentProcessor:
@@ -13,7 +14,7 @@ class ArgumentProcessor:
 
     # Options that must be specified. Each value is a tuple of strings,
     # where each tuple rperesents the possible names of a mandatory option.
-    MANDATORY_OPTIONS = [("p", "project")]
+    MANDATORY_OPTIONS = [("p", "project", "projects")]
 
     # Message printed when help option specified or there are 
     # not enough arguments
@@ -27,6 +28,11 @@ class ArgumentProcessor:
     -p=[project_directory]
     --project=[project_directory]
 
+    Or set many projects to generate dependencies for in one run.
+    Directories are separated by commas, or read from standard input,
+    one per line, if "-" is given:
+    --projects=[directory1,directory2,...]
+
     ===OPTIONAL ARGUMENTS===
     Silence command line output:
     -q
@@ -36,6 +42,74 @@ class ArgumentProcessor:
     -d=[depth]
     --depth=[depth]
 
+    Set number of processes used to extract dependencies:
+    --jobs=[number_of_processes]
+
+    Read up to [number] files at once with a pool of threads, which
+    is faster when files are on a slow filesystem (e.g. NFS). Used
+    instead of multiple processes:
+    --io-concurrency=[number]
+
+    Set engine used to extract dependencies. "tokens" (the default)
+    is fastest, while "ast" uses Python's own parser, so it is more
+    accurate and finds where every import is made:
+    --engine=[tokens|ast]
+
+    Only use imports which run when a module is imported, leaving
+    out imports inside functions and "if TYPE_CHECKING:" blocks.
+    Uses the "ast" engine:
+    --import-time-only=[anything]
+
+    Cache extracted dependencies in a directory so unchanged files
+    are not processed again:
+    --cache-dir=[cache_directory]
+
+    Also detect unchanged files by hashing their contents:
+    --cache-hash=[anything]
+
+    Memory map files and only decode their import statements, which
+    is faster for very large files:
+    --mmap=[anything]
+
+    Keep running and print changes to the dependencies whenever
+    the project's files change, checking every [interval] seconds:
+    --watch=[interval]
+
+    Print every module which depends on a module, directly or
+    through other modules:
+    --depends-on=[module_name]
+
+    Print every module which a module requires, directly or
+    through other modules:
+    --required-by=[module_name]
+
+    Print the [number] modules which load the most code when they
+    are imported, counting every module they import, directly or
+    through other modules:
+    --weights=[number]
+
+    Print every import cycle in the project:
+    --cycles=[anything]
+
+    Collapse import cycles into single nodes before the results
+    are given to the outputter:
+    --condense=[anything]
+
+    Print every module which is affected by changes to some files,
+    because it is one of them or imports one of them, directly or
+    through other modules. Files are separated by commas, or read
+    from standard input, one per line, if "-" is given:
+    --changed=[file1,file2,...]
+
+    Print the time taken by each stage of the search and counts of
+    the files, bytes, tokens and imports processed to standard error:
+    --stats=[anything]
+
+    Write the output of each project given with --projects to its
+    own file in a directory, instead of to standard output. Must be
+    used with an outputter:
+    --output-dir=[output_directory]
+
     Set outputter to produce representation of dependency data:
     -o=[outputter_name]
     --outputter=[outputter]
@@ -56,7 +130,10 @@ class ArgumentProcessor:
     ]
     # Contains list of all standard, non-outputter specific options
     STANDARD_OPTIONS = [
-        "p", "project", "q", "quiet", "d", "depth", "o", "outputter"
+        "p", "project", "q", "quiet", "d", "depth", "o", "outputter", "jobs",
+        "cache-dir", "cache-hash", "watch", "depends-on", "required-by",
+        "cycles", "condense", "changed", "stats", "mmap", "engine",
+        "import-time-only", "weights", "io-concurrency", "projects", "output-dir"
     ]
 
     def __init__(self):
@@ -78,18 +155,53 @@ class ArgumentProcessor:
             self.setProjectDirectory( self.options["p"] )
         elif "project" in self.options:
             self.setProjectDirectory( self.options["project"] )
+        else:
+            self.projectDirectory = None
+        if "projects" in self.options:
+            self.setProjectDirectories( self.parseProjectDirectories(self.options["projects"]) )
+            # Project given with -p is searched first
+            if self.projectDirectory != None:
+                self.projectDirectories.insert(0, self.projectDirectory)
+            if "watch" in self.options or "changed" in self.options:
+                raise RuntimeError("Many projects cannot be watched or checked for changed files")
+        else:
+            self.projectDirectories = None
         if "d" in self.options:
             self.maxDepth = self.validateDepth(self.options["d"])
         elif "depth" in self.options:
             self.maxDepth = self.validateDepth(self.options["depth"])
         else:
             self.maxDepth = None
+        if "jobs" in self.options:
+            self.jobs = self.validateJobs(self.options["jobs"])
+        else:
+            self.jobs = 1
+        if "io-concurrency" in self.options:
+            self.ioConcurrency = self.validateIoConcurrency(self.options["io-concurrency"])
+        else:
+            self.ioConcurrency = None
+        if "watch" in self.options:
+            self.watchInterval = self.validateInterval(self.options["watch"])
+        else:
+            self.watchInterval = None
+        if "weights" in self.options:
+            self.weightCount = self.validateWeightCount(self.options["weights"])
+        else:
+            self.weightCount = None
+        self.dependsOn = self.options.get("depends-on")
+        self.requiredBy = self.options.get("required-by")
+        if "changed" in self.options:
+            self.changedFiles = self.parseChangedFiles(self.options["changed"])
+        else:
+            self.changedFiles = None
         if "o" in self.options:
             self.outputterName = self.options["o"]
         elif "outputter" in self.options:
             self.outputterName = self.options["outputter"]
         else:
             self.outputterName = None
+        if "output-dir" in self.options and self.outputterName == None:
+            raise RuntimeError("An outputter must be given to write output to a directory")
 
         if not self.checkMandatoryOptions(self.options):
             raise RuntimeError("Not all mandatory options have been specified")
@@ -107,6 +219,20 @@ class ArgumentProcessor:
             raise IOError("Directory '{}' does not exist".format(directory))
         self.projectDirectory = directory
 
+    def setProjectDirectories(self, directories):
+        """Set directories of the projects searched in one run.
+
+        If any directory does not exist, an IOError will be raised.
+
+        Arguments:
+        directories -- List of paths to project directories
+
+        """
+        for directory in directories:
+            if not os.path.isdir(directory):
+                raise IOError("Directory '{}' does not exist".format(directory))
+        self.projectDirectories = directories
+
     def getOption(self, optionName):
         """Return value of option with given name parsed from arguments.
 
@@ -248,6 +374,115 @@ class ArgumentProcessor:
             raise ValueError("Maximum depth cannot be negative")
         return depth
 
+    def validateJobs(self, jobs):
+        """Convert string into integer greater than zero and return result.
+
+        If string does not represent an integer or that integer
+        is less than one, then a ValueError is raised.
+
+        Arguments:
+        jobs -- String containing number of processes
+
+        """
+        try:
+            jobs = int(jobs)
+        except ValueError: # make error message nicer
+            raise ValueError("Invalid number of jobs '{}' provided".format(jobs))
+        if jobs < 1:
+            raise ValueError("Number of jobs must be at least one")
+        return jobs
+
+    def validateIoConcurrency(self, concurrency):
+        """Convert string into integer greater than zero and return result.
+
+        If string does not represent an integer or that integer
+        is less than one, then a ValueError is raised.
+
+        Arguments:
+        concurrency -- String containing maximum number of files
+                       read at once
+
+        """
+        try:
+            concurrency = int(concurrency)
+        except ValueError: # make error message nicer
+            raise ValueError("Invalid concurrency limit '{}' provided".format(concurrency))
+        if concurrency < 1:
+            raise ValueError("Concurrency limit must be at least one")
+        return concurrency
+
+    def validateWeightCount(self, count):
+        """Convert string into integer greater than zero and return result.
+
+        If string does not represent an integer or that integer
+        is less than one, then a ValueError is raised.
+
+        Arguments:
+        count -- String containing number of modules to print
+                 the weights of
+
+        """
+        try:
+            count = int(count)
+        except ValueError: # make error message nicer
+            raise ValueError("Invalid number of modules '{}' provided".format(count))
+        if count < 1:
+            raise ValueError("Number of modules must be at least one")
+        return count
+
+    def validateInterval(self, interval):
+        """Convert string into positive number of seconds and return result.
+
+        If string does not represent a number or that number
+        is not positive, then a ValueError is raised.
+
+        Arguments:
+        interval -- String containing number of seconds
+
+        """
+        try:
+            interval = float(interval)
+        except ValueError: # make error message nicer
+            raise ValueError("Invalid interval '{}' provided".format(interval))
+        if interval <= 0:
+            raise ValueError("Interval must be greater than zero")
+        return interval
+
+    def parseChangedFiles(self, changedFiles, stream = None):
+        """Return list of paths to changed files given as an option value.
+
+        Arguments:
+        changedFiles -- Comma-separated paths, or "-" to read paths
+                        from the stream, one per line
+
+        Keyword arguments:
+        stream -- File object paths are read from if changedFiles
+                  is "-". If None, standard input is used.
+                  (default: None)
+
+        """
+        if changedFiles == "-":
+            lines = (stream or sys.stdin).read().splitlines()
+        else:
+            lines = changedFiles.split(",")
+        return [ line.strip() for line in lines if len(line.strip()) > 0 ]
+
+    def parseProjectDirectories(self, projectDirectories, stream = None):
+        """Return list of paths to project directories given as an option value.
+
+        Arguments:
+        projectDirectories -- Comma-separated paths, or "-" to read
+                              paths from the stream, one per line
+
+        Keyword arguments:
+        stream -- File object paths are read from if projectDirectories
+                  is "-". If None, standard input is used.
+                  (default: None)
+
+        """
+        # Paths are given in the same way as changed files
+        return self.parseChangedFiles(projectDirectories, stream)
+
     def getOutputterArguments(self):
         """Return dictinary only containing non-standard arguments.
 
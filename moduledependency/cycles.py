@@ -0,0 +1,217 @@
+"""Contains functionality for finding import cycles in dependencies and
+collapsing them into a directed acyclic graph."""
+
+from array import array
+
+from .graph import DependencyGraph
+
+
+class Condensation:
+
+    """Dependencies with every strongly connected component collapsed into one node.
+
+    Each component is a group of packages/modules which all depend on
+    each other, directly or not. Components are stored in reverse
+    topological order, so every component comes after the components
+    it depends on.
+
+    """
+
+    def __init__(self, components, componentIds, componentDependencies, cycleIds):
+        """Construct instance of Condensation.
+
+        Arguments:
+        components -- List containing tuples of the sorted names in
+                      each component, in reverse topological order
+        componentIds -- Dictionary mapping each name to the index
+                        of its component
+        componentDependencies -- List containing sets of the indices
+                                 of the components each component
+                                 depends on
+        cycleIds -- List containing the indices of the components
+                    which are import cycles
+
+        """
+        self.components = components
+        self.componentIds = componentIds
+        self.componentDependencies = componentDependencies
+        self.cycleIds = cycleIds
+        self.graph = None
+
+    def getComponentName(self, componentId):
+        """Return name of a component.
+
+        Components containing one package/module are named after it.
+        Other components are named after all of their members, e.g.
+        "(project.a, project.b)".
+
+        Arguments:
+        componentId -- Index of the component
+
+        """
+        members = self.components[componentId]
+        if len(members) == 1:
+            return members[0]
+        return "({})".format(", ".join(members))
+
+    def getCycles(self):
+        """Return list containing sorted lists of the names in every import cycle.
+
+        A cycle is a component with more than one member, or a
+        package/module which depends on itself.
+
+        """
+        return sorted( list(self.components[componentId]) for componentId in self.cycleIds )
+
+    def getGraph(self):
+        """Return condensation DAG as a DependencyGraph.
+
+        The graph maps the name of every component to the names of
+        the components it depends on, so it can be given to an
+        outputter like any other dependencies.
+
+        """
+        if self.graph == None:
+            names = [ self.getComponentName(i) for i in range(len(self.components)) ]
+            self.graph = DependencyGraph( { names[i] : set( names[j] for j in dependencyIds )
+                for i, dependencyIds in enumerate(self.componentDependencies) } )
+        return self.graph
+
+
+class CycleDetector:
+
+    """Finds strongly connected components with an iterative version of Tarjan's algorithm.
+
+    No recursion is used, so graphs of any depth can be processed,
+    and every node and dependency is visited once, so the time
+    taken grows linearly with the size of the graph.
+
+    """
+
+    def findComponentIds(self, graph):
+        """Return tuple containing the component index of every node and the number of components.
+
+        Component indices are assigned in reverse topological order.
+
+        Arguments:
+        graph -- DependencyGraph to find the components of
+
+        """
+        numNodes = graph.numNodes
+        numDependants = graph.numDependants
+        offsets = graph.edgeOffsets
+        targets = graph.edgeTargets
+
+        # Order each node was first visited in, and the lowest order of
+        # any node reachable from it which is still on the stack
+        order = array("l", [ -1 ]) * numNodes
+        lowLink = array("l", [ 0 ]) * numNodes
+        onStack = bytearray(numNodes)
+        componentIds = array("l", [ -1 ]) * numNodes
+        numComponents = 0
+        nextOrder = 0
+        # Nodes which haven't been assigned to a component yet
+        componentStack = []
+
+        for root in range(numNodes):
+            if order[root] != -1:
+                continue
+            order[root] = lowLink[root] = nextOrder
+            nextOrder += 1
+            componentStack.append(root)
+            onStack[root] = 1
+            # Stack of nodes being visited and the position of the
+            # next dependency to look at for each of them, replacing
+            # the call stack of the recursive algorithm
+            visiting = [ root ]
+            positions = [ offsets[root] if root < numDependants else 0 ]
+            while len(visiting) > 0:
+                node = visiting[-1]
+                position = positions[-1]
+                end = offsets[node + 1] if node < numDependants else 0
+                descended = False
+                while position < end:
+                    target = targets[position]
+                    position += 1
+                    if order[target] == -1:
+                        # Visit dependency before continuing with this node
+                        positions[-1] = position
+                        order[target] = lowLink[target] = nextOrder
+                        nextOrder += 1
+                        componentStack.append(target)
+                        onStack[target] = 1
+                        visiting.append(target)
+                        positions.append( offsets[target] if target < numDependants else 0 )
+                        descended = True
+                        break
+                    elif onStack[target] and order[target] < lowLink[node]:
+                        lowLink[node] = order[target]
+                if descended:
+                    continue
+
+                # All dependencies of the node have been visited
+                visiting.pop()
+                positions.pop()
+                if len(visiting) > 0 and lowLink[node] < lowLink[visiting[-1]]:
+                    lowLink[visiting[-1]] = lowLink[node]
+                if lowLink[node] == order[node]:
+                    # Node is the root of a component, which contains it
+                    # and every node above it on the stack
+                    while True:
+                        member = componentStack.pop()
+                        onStack[member] = 0
+                        componentIds[member] = numComponents
+                        if member == node:
+                            break
+                    numComponents += 1
+        return componentIds, numComponents
+
+    def condense(self, dependencies):
+        """Return Condensation of dependencies.
+
+        Arguments:
+        dependencies -- Dictionary where the keys are the packages/modules
+                        in the project and the values are packages/modules
+                        that the respective key imported, or a DependencyGraph.
+
+        """
+        graph = dependencies if isinstance(dependencies, DependencyGraph) else DependencyGraph(dependencies)
+        componentIds, numComponents = self.findComponentIds(graph)
+        names = graph.names
+        offsets = graph.edgeOffsets
+        targets = graph.edgeTargets
+
+        members = [ [] for i in range(numComponents) ]
+        for nodeId, componentId in enumerate(componentIds):
+            members[componentId].append(names[nodeId])
+        components = [ tuple(sorted(memberNames)) for memberNames in members ]
+        componentDependencies = [ set() for i in range(numComponents) ]
+        cycles = set( componentId for componentId in range(numComponents)
+            if len(members[componentId]) > 1 )
+        for nodeId in range(graph.numDependants):
+            componentId = componentIds[nodeId]
+            for position in range(offsets[nodeId], offsets[nodeId + 1]):
+                targetComponentId = componentIds[targets[position]]
+                if targetComponentId != componentId:
+                    componentDependencies[componentId].add(targetComponentId)
+                elif targets[position] == nodeId:
+                    # Package/module depends on itself
+                    cycles.add(componentId)
+        return Condensation(components,
+            { names[nodeId] : componentId for nodeId, componentId in enumerate(componentIds) },
+            componentDependencies, sorted(cycles))
+
+    def findCycles(self, dependencies):
+        """Return list containing sorted lists of the names in every import cycle.
+
+        Every strongly connected component with more than one
+        package/module is an import cycle, as is every package/module
+        that depends on itself.
+
+        Arguments:
+        dependencies -- Dictionary where the keys are the packages/modules
+                        in the project and the values are packages/modules
+                        that the respective key imported, or a DependencyGraph.
+
+        """
+        return self.condense(dependencies).getCycles()
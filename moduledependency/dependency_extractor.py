@@ -1,17 +1,31 @@
 """Contains functionalty to identify dependencies in Python source code."""
 
 import os.path
+import io
 import re
-from collections import Iterable
+import mmap
+import tokenize
+from collections.abc import Iterable
 
 from fileprocessor.extractors import TextExtractor
 from .tokeniser import Tokeniser
+from .import_finder import ImportStatementFinder
 from .parser import ImportParser, ParsedImport
+from .whitelist import Whitelist
 from . import util
 
+# Version of the extraction logic. Must be changed whenever the
+# tokeniser, parser or extractor changes the dependencies found in
+# a file, so results cached by older versions are discarded.
+EXTRACTOR_VERSION = 1
+
 class ModuleDependencyExtractor(TextExtractor):
 
-	def __init__(self, whitelist = None):
+	# Name of the engine, used to keep cached results of different engines apart
+	ENGINE = "tokens"
+
+	def __init__(self, whitelist = None, tokeniser = None, prefilter = True, counters = None,
+			memoryMap = False):
 		"""Create new instance of ModuleDependencyExtractor.
 
 		Keyword arguments:
@@ -19,14 +33,46 @@ class ModuleDependencyExtractor(TextExtractor):
 					 or modules that are allowed. If not provided,
 					 no whitelist will be used to filter results.
 					 (default: None)
+		tokeniser -- Object used to tokenise source code, such as
+					 an instance of Tokeniser or RegexTokeniser. If
+					 not provided, a Tokeniser is used. (default: None)
+		prefilter -- If True, only the import statements found by an
+					 ImportStatementFinder are tokenised and parsed,
+					 instead of the whole source. (default: True)
+		counters -- collections.Counter which the number of files,
+					bytes, tokens and imports extracted are added
+					to. If not provided, nothing is counted.
+					(default: None)
+		memoryMap -- If True, files are memory mapped and their bytes
+					 are searched for import statements, so only the
+					 statements are decoded. The encoding of each file
+					 is found from its PEP 263 declaration. Requires
+					 prefilter to be True. (default: False)
 
 		"""
+		if memoryMap and not prefilter:
+			raise ValueError("Memory mapped extraction requires prefiltering import statements")
 		if whitelist != None and not isinstance(whitelist, Iterable):
 			raise TypeError("Whitelist must be an iterable collection of strings")
-		self.whitelist = whitelist				
+		self.whitelist = whitelist
+		# Index of the whitelist, so checking whether a dependency
+		# is whitelisted doesn't require scanning every entry
+		if whitelist != None:
+			self.whitelistIndex = Whitelist(whitelist)
+		else:
+			self.whitelistIndex = None
 
-		self.tokeniser = Tokeniser()
+		if tokeniser:
+			self.tokeniser = tokeniser
+		else:
+			self.tokeniser = Tokeniser()
 		self.parser = ImportParser()
+		if prefilter:
+			self.importFinder = ImportStatementFinder()
+		else:
+			self.importFinder = None
+		self.counters = counters
+		self.memoryMap = memoryMap
 
 	def usingWhitelist(self):
 		"""Return True if this extractor is using a whitelist to filter depedencies."""
@@ -103,17 +149,14 @@ class ModuleDependencyExtractor(TextExtractor):
 			# If so, remove the "." prefix
 			if moduleName[0] == ".":
 				moduleName = moduleName[1:]
-			for name in self.whitelist:
-				# Check if whitelisted package contains the relative module OR it
-				# at least contains the relative module somewhere
-				if self.belongsTo(name, moduleName) or self.packageHasComponent(name, moduleName):
-					return True
+			# Check if whitelisted package contains the relative module OR it
+			# at least contains the relative module somewhere. Equivalent to
+			# checking belongsTo() or packageHasComponent() for every name.
+			return (self.whitelistIndex.containsPackageOf(moduleName) or
+				self.whitelistIndex.hasComponent(moduleName))
 		else:
-			for name in self.whitelist:
-				# Check if module name belongs to the whitelisted package/module
-				if self.belongsTo(name, moduleName):
-					return True
-		return False
+			# Check if module name belongs to the whitelisted package/module
+			return self.whitelistIndex.containsPackageOf(moduleName)
 
 	def applyWhitelist(self, dependencies):
 		"""Filter dependencies not in extractor's whitelist and return filtered dependencies
@@ -128,6 +171,78 @@ class ModuleDependencyExtractor(TextExtractor):
 		allowedDependencies = [ dep for dep in dependencies if self.inWhitelist(dep) ]
 		return set(allowedDependencies)
 
+	def extract(self, filename):
+		"""Read a file and return the set of dependencies in its source code.
+
+		Arguments:
+		filename -- Path to the file to extract dependencies from
+
+		"""
+		if self.counters != None:
+			self.counters["files"] += 1
+			self.counters["bytes"] += os.path.getsize(filename)
+		if self.memoryMap:
+			return self.extractFromMappedFile(filename)
+		return super().extract(filename)
+
+	def extractFromMappedFile(self, filename):
+		"""Memory map a file and return the set of dependencies in its source code.
+
+		The file's bytes are searched for import statements and
+		only those are decoded. Files whose encoding is not ASCII
+		compatible are decoded in full instead.
+
+		Arguments:
+		filename -- Path to the file to extract dependencies from
+
+		"""
+		with open(filename, "rb") as f:
+			# Empty files cannot be mapped
+			if os.fstat(f.fileno()).st_size == 0:
+				return set()
+			with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+				return self.extractFromBytes(data)
+
+	def extractFromBytes(self, data):
+		"""Take Python source code as bytes and return the code's set of dependencies.
+
+		The encoding is found from the code's PEP 263 declaration. If
+		import statements are prefiltered and the encoding is ASCII
+		compatible, the bytes are searched for import statements and
+		only those are decoded. Otherwise, the code is decoded in full.
+
+		Arguments:
+		data -- Bytes or mmap.mmap containing Python source code
+
+		"""
+		encoding = self.detectEncoding( data if isinstance(data, mmap.mmap) else io.BytesIO(data) )
+		if self.importFinder and util.isAsciiCompatible(encoding):
+			return self.extractFromStatements( self.importFinder.findStatementsInBytes(data, encoding) )
+		else:
+			return self.extractFromString( data[:].decode(encoding) )
+
+	def detectEncoding(self, data):
+		"""Return encoding of Python source code stored as bytes.
+
+		The encoding is given by a UTF-8 byte order mark or a PEP 263
+		declaration (e.g. "# -*- coding: latin-1 -*-") in the first
+		two lines, and is UTF-8 otherwise. Unknown or invalid
+		declarations are ignored.
+
+		Arguments:
+		data -- mmap.mmap or binary file object (e.g. io.BytesIO)
+				containing the source code
+
+		"""
+		data.seek(0)
+		try:
+			encoding, lines = tokenize.detect_encoding(data.readline)
+		except SyntaxError:
+			encoding = "utf-8"
+		finally:
+			data.seek(0)
+		return encoding
+
 	def extractFromString(self, data):
 		"""Take Python source code as text and return the code's set of dependencies.
 
@@ -135,9 +250,34 @@ class ModuleDependencyExtractor(TextExtractor):
 		data -- String containing Python source code to analyse
 
 		"""
-		tokens = self.tokeniser.tokenise(data)
+		# Only tokenise the import statements if a finder is being used
+		if self.importFinder:
+			return self.extractFromStatements( self.importFinder.findStatements(data) )
+		return self.extractFromTokens( self.tokeniser.tokenise(data) )
+
+	def extractFromStatements(self, statements):
+		"""Return set of dependencies in a list of import statements.
+
+		Arguments:
+		statements -- List of strings containing import statements,
+					  as returned by ImportStatementFinder
+
+		"""
+		if len(statements) == 0:
+			return set()
+		return self.extractFromTokens( self.tokeniser.tokenise("\n".join(statements)) )
+
+	def extractFromTokens(self, tokens):
+		"""Return set of dependencies in a list of tokens of Python source code.
+
+		Arguments:
+		tokens -- List of Token objects produced by the tokeniser
+
+		"""
 		foundDepdendencies = self.parser.parse(tokens)
 		if self.usingWhitelist():
-			return self.applyWhitelist(foundDepdendencies)
-		else:
-			return foundDepdendencies
\ No newline at end of file
+			foundDepdendencies = self.applyWhitelist(foundDepdendencies)
+		if self.counters != None:
+			self.counters["tokens"] += len(tokens)
+			self.counters["imports"] += len(foundDepdendencies)
+		return foundDepdendencies
\ No newline at end of file
@@ -1,6 +1,158 @@
 """Contains functionality for pruning dependencies with a certain
 depth so higher-level views of dependencies can be constructed."""
 
+from array import array
+
+from .graph import DependencyGraph
+
+
+class PruningIndex:
+
+    """Interned representation of dependencies which can be pruned to any depth.
+
+    Every package/module name is mapped to an integer ID, and the
+    dependencies are stored as arrays of IDs. For each depth, a table
+    containing the ID of every name's pruned name is computed once,
+    so pruning to a depth is a lookup in that table followed by
+    removing duplicate edges. Names are only split and joined when
+    a table is built, and only if pruning actually changes them.
+
+    """
+
+    def __init__(self, dependencies):
+        """Construct instance of PruningIndex.
+
+        Arguments:
+        dependencies -- Dictionary where the keys are the packages/modules
+                        in the project and the values are packages/modules
+                        that the respective key imported, or a
+                        DependencyGraph. The IDs and arrays of a
+                        DependencyGraph are reused.
+
+        """
+        if isinstance(dependencies, DependencyGraph):
+            # Copy names and IDs since pruned names are added to them
+            self.names = list(dependencies.names)
+            self.ids = dict(dependencies.ids)
+            self.dependantIds = array("l", range(dependencies.numDependants))
+            self.edgeOffsets = dependencies.edgeOffsets
+            self.edgeTargets = dependencies.edgeTargets
+        else:
+            # Name of each ID and ID of each name
+            self.names = []
+            self.ids = {}
+            # IDs of the dependant modules. The IDs of the dependencies of
+            # dependant i are edgeTargets[edgeOffsets[i]:edgeOffsets[i + 1]].
+            self.dependantIds = array("l")
+            self.edgeOffsets = array("l", [ 0 ])
+            self.edgeTargets = array("l")
+            for dependantName, dependencyList in dependencies.items():
+                self.dependantIds.append( self.intern(dependantName) )
+                self.edgeTargets.extend( [ self.intern(name) for name in dependencyList ] )
+                self.edgeOffsets.append( len(self.edgeTargets) )
+        self.numNodes = len(self.names)
+
+        # Number of components in each node's name. Names pruned to
+        # that depth or deeper are not changed, except names that are
+        # shorter than their number of components (e.g. "."), which
+        # DepthPruner.prunePackageName() always shortens. Those have
+        # -1 levels, so they are always pruned.
+        self.levels = array("l")
+        self.maximumLevels = 1
+        for name in self.names:
+            numComponents = name.count(".") + 1
+            if len(name) >= numComponents:
+                self.levels.append(numComponents)
+                self.maximumLevels = max(self.maximumLevels, numComponents)
+            else:
+                self.levels.append(-1)
+                self.maximumLevels = max(self.maximumLevels, len(name))
+        # Ancestor tables which have been computed, keyed by depth
+        self.ancestorTables = {}
+
+    def intern(self, name):
+        """Return ID of name, assigning it a new ID if it doesn't have one.
+
+        Arguments:
+        name -- Full name of package/module
+
+        """
+        nameId = self.ids.get(name)
+        if nameId == None:
+            nameId = len(self.names)
+            self.ids[name] = nameId
+            self.names.append(name)
+        return nameId
+
+    def getAncestorTable(self, depth):
+        """Return array containing ID of the pruned name of every node at a depth.
+
+        Arguments:
+        depth -- Depth to prune names to. Must be an integer
+                 greater than or equal to 0.
+
+        """
+        if depth < 0:
+            raise ValueError("Cannot have negative depth")
+        # Tables are the same for every depth past the deepest name
+        depth = min(depth, self.maximumLevels - 1)
+        table = self.ancestorTables.get(depth)
+        if table == None:
+            table = array("l", range(self.numNodes))
+            names = self.names
+            for nodeId, numLevels in enumerate(self.levels):
+                if numLevels > depth + 1 or numLevels == -1:
+                    name = names[nodeId]
+                    components = name.split(".")
+                    table[nodeId] = self.intern( ".".join(components[:depth + 1]) )
+            self.ancestorTables[depth] = table
+        return table
+
+    def prune(self, depth):
+        """Return dependencies with all names pruned to a depth.
+
+        Equivalent to DepthPruner.prune().
+
+        Arguments:
+        depth -- Depth to prune names to. Must be an integer
+                 greater than or equal to 0.
+
+        """
+        table = self.getAncestorTable(depth)
+        offsets = self.edgeOffsets
+        targets = self.edgeTargets
+        # Merge pruned dependency IDs of dependants with the same pruned
+        # name, so duplicates are removed before creating any strings
+        prunedIds = {}
+        for i, dependantId in enumerate(self.dependantIds):
+            prunedId = table[dependantId]
+            merged = prunedIds.get(prunedId)
+            if merged == None:
+                merged = prunedIds[prunedId] = set()
+            merged.update( map(table.__getitem__, targets[offsets[i]:offsets[i + 1]]) )
+
+        names = self.names
+        prunedDependencies = {}
+        for prunedId, dependencyIds in prunedIds.items():
+            # Remove recursive dependencies that can result from pruning
+            dependencyIds.discard(prunedId)
+            prunedDependencies[names[prunedId]] = set( map(names.__getitem__, dependencyIds) )
+        return prunedDependencies
+
+    def pruneAll(self, maximumDepth = None):
+        """Return dictionary mapping depths to the dependencies pruned to that depth.
+
+        Keyword arguments:
+        maximumDepth -- Greatest depth to prune to. If None, every
+                        depth up to the depth of the deepest name
+                        is included. (default: None)
+
+        """
+        if maximumDepth == None:
+            maximumDepth = self.maximumLevels - 1
+        return { depth : self.prune(depth) for depth in range(maximumDepth + 1) }
+
+
 class DepthPruner:
 
     """Used to prune dependencies with a specified depth.
@@ -74,31 +226,45 @@ class DepthPruner:
         Arguments:
         dependencies -- Returns dictionary where the keys are the packages/modules
                         in the project and the values are packages/modules that
-                        the respective key imported.
+                        the respective key imported. If a DependencyGraph is
+                        given, the pruned dependencies are returned as a
+                        DependencyGraph too.
         depth -- Depth to prune package names to. For example, if depth = 1 then
                  "a.b.c" will be pruned to "a.b". Value must be an integer
                  greater than or equal to 0.
 
         """
-        prunedDependencies = {}
-        for dependantName, dependencyList in dependencies.items():
-            prunedName, prunedSet = self.pruneDependencyList(
-                dependantName, dependencyList, depth)
-            try:
-                # If there's alreayd some dependencies for the pruned dependant
-                # module, merge the current pruned list with the existing list.
-                # Duplicate values are removed using set union
-                existingDeps = prunedDependencies[prunedName]
-                mergedDeps = existingDeps.union( prunedSet )
-                prunedDependencies[prunedName] = mergedDeps
-            # If there are currently no dependencies for the pruned name
-            except KeyError:
-                prunedDependencies[prunedName] = prunedSet
-
-        # Remove recursive dependencies that can result from pruning process
-        # (e.g. "project.a -> project.a" is removed)
-        for dependantName, dependencySet in prunedDependencies.items():
-            if dependantName in dependencySet:
-                dependencySet.remove(dependantName)
-
-        return prunedDependencies
\ No newline at end of file
+        if depth < 0:
+            raise ValueError("Cannot have negative depth")
+        # Duplicate dependant names are merged, and duplicate and
+        # recursive dependencies (e.g. "project.a -> project.a") that
+        # result from pruning are removed, by the index
+        prunedDependencies = PruningIndex(dependencies).prune(depth)
+        if isinstance(dependencies, DependencyGraph):
+            return DependencyGraph(prunedDependencies)
+        return prunedDependencies
+
+    def pruneAll(self, dependencies, maximumDepth = None):
+        """Prune a collection of dependencies to every depth up to a maximum.
+
+        Returns dictionary where the keys are depths and the values
+        are the dependencies pruned to the respective depth, as
+        returned by prune(). The names and dependencies are only
+        interned once, and each depth's table of pruned names is
+        built from them, splitting only the names which that depth
+        changes.
+
+        Arguments:
+        dependencies -- Dictionary where the keys are the packages/modules
+                        in the project and the values are packages/modules that
+                        the respective key imported, or a DependencyGraph.
+
+        Keyword arguments:
+        maximumDepth -- Greatest depth to prune to. If None, every
+                        depth up to the depth of the deepest name
+                        is included. (default: None)
+
+        """
+        if maximumDepth != None and maximumDepth < 0:
+            raise ValueError("Cannot have negative depth")
+        return PruningIndex(dependencies).pruneAll(maximumDepth)
\ No newline at end of file
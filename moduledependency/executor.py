@@ -2,15 +2,26 @@
 
 import sys
 import os
+import time
 import collections
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-from fileprocessor.searchers import FileSearcher
-from fileprocessor.filterers import ExtensionFilterer, IncludeListFilterer
 from fileprocessor import FileProcessor
 from .dependency_extractor import ModuleDependencyExtractor
-from .whitelist import WhitelistApplier
+from .ast_extractor import AstDependencyExtractor, ImportTimeExtractor
+from .parallel import ParallelFileProcessor
+from .async_processor import AsyncFileProcessor
+from .cache import ExtractionCache, CachingExtractor
+from .whitelist import Whitelist, WhitelistApplier
+from .walker import ProjectWalker
 from .import_resolver import ImportResolver
 from .depth_pruner import DepthPruner
+from .graph import DependencyGraph
+from .cycles import CycleDetector
+from .weights import WeightAnalyser, measureModules
+from .watcher import DependencyWatcher
+from .stats import PipelineStatistics
 
 class Executor:
 
@@ -21,10 +32,37 @@ class Executor:
 
     """
 
+    # Engines which can be used to extract dependencies from files,
+    # and the class of their extractors. The token-based engine is
+    # faster, while the AST engine is more accurate and finds the
+    # context, line and column of every import.
+    ENGINES = {
+        ModuleDependencyExtractor.ENGINE : ModuleDependencyExtractor,
+        AstDependencyExtractor.ENGINE : AstDependencyExtractor
+    }
+    # Line written before the output of each project when many
+    # projects are searched, so it can be told which project each
+    # part of the output belongs to
+    PROJECT_HEADER = "results for project '{}':"
+
     def __init__(self):
         """Construct new instance of Executor."""
         self.outputter = None
         self.maximumDepth = None
+        self.jobs = 1
+        self.ioConcurrency = None
+        # Pool of workers shared by every project in executeProjects()
+        self.pool = None
+        self.cache = None
+        self.detectCycles = False
+        self.condenseOutput = False
+        self.condensation = None
+        self.statistics = None
+        self.memoryMap = False
+        self.engine = ModuleDependencyExtractor.ENGINE
+        self.importTimeOnly = False
+        self.analyseWeights = False
+        self.weights = None
 
     def setOutputter(self, newOutputter):
         """Change object which outputs results of dependency search.
@@ -56,66 +94,577 @@ class Executor:
             raise ValueError("Maximum depth cannot be negative")
         self.maximumDepth = maxDepth
 
-    def searchForDependencies(self, projectDirectory):
+    def setJobs(self, jobs):
+        """Set number of processes used to extract dependencies from files.
+
+        Arguments:
+        jobs -- Positive integer representing the number of
+                processes to use. If 1, all files are extracted
+                in the current process.
+
+        """
+        if not isinstance(jobs, int):
+            raise TypeError("Number of jobs must be an integer")
+        if jobs < 1:
+            raise ValueError("Number of jobs must be at least one")
+        self.jobs = jobs
+
+    def setIoConcurrency(self, concurrency):
+        """Set number of files read at once when extracting dependencies.
+
+        When set, files are read concurrently by a pool of threads
+        and extracted as they finish being read, which is faster on
+        filesystems where opening and reading files is slow (e.g.
+        network filesystems). Concurrent reads are used instead of
+        multiple processes.
+
+        Arguments:
+        concurrency -- Positive integer representing the maximum
+                       number of files read at once. If None, files
+                       are read one at a time.
+
+        """
+        if concurrency != None:
+            if not isinstance(concurrency, int):
+                raise TypeError("Concurrency limit must be an integer")
+            if concurrency < 1:
+                raise ValueError("Concurrency limit must be at least one")
+        self.ioConcurrency = concurrency
+
+    def setCacheDirectory(self, cacheDirectory, useHashes = False):
+        """Set directory used to cache dependencies extracted from files.
+
+        Files which haven't changed since they were cached are not
+        extracted again.
+
+        Arguments:
+        cacheDirectory -- Path to directory to store the cache in.
+                          If None, no cache will be used.
+
+        Keyword arguments:
+        useHashes -- If True, file contents are hashed to detect
+                     files that are unchanged despite having a
+                     different modification time. (default: False)
+
+        """
+        if self.cache:
+            self.cache.close()
+        if cacheDirectory == None:
+            self.cache = None
+        else:
+            self.cache = ExtractionCache(cacheDirectory, useHashes)
+
+    def setMemoryMapping(self, memoryMap):
+        """Set whether files are memory mapped and searched as bytes when extracting dependencies.
+
+        Only the import statements of memory mapped files are decoded,
+        which avoids decoding and copying the whole of large files.
+
+        Arguments:
+        memoryMap -- If True, files are memory mapped
+
+        """
+        self.memoryMap = memoryMap
+
+    def setEngine(self, engine):
+        """Set engine used to extract dependencies from files.
+
+        Arguments:
+        engine -- Name of the engine, which must be a key of ENGINES.
+                  "tokens" is the fast, token-based engine, and "ast"
+                  uses Python's own parser. Memory mapping is only
+                  used by the "tokens" engine.
+
+        """
+        if not engine in self.ENGINES:
+            raise ValueError("Unknown extraction engine '{}'. Valid engines: {}".format(
+                engine, ", ".join(sorted(self.ENGINES))))
+        self.engine = engine
+
+    def setImportTimeOnly(self, importTimeOnly):
+        """Set whether only imports which run when a module is imported are used.
+
+        Deferred imports, made inside functions or "if TYPE_CHECKING:",
+        are discarded, so the dependencies found are the modules loaded
+        at import time. Finding where imports are made requires the AST
+        engine, so it is used regardless of the engine that was set.
+
+        Arguments:
+        importTimeOnly -- If True, deferred imports are discarded
+
+        """
+        self.importTimeOnly = importTimeOnly
+
+    def createExtractor(self, counters = None):
+        """Return extractor of the executor's engine.
+
+        Keyword arguments:
+        counters -- collections.Counter passed to the extractor,
+                    which it adds the work it does to. (default: None)
+
+        """
+        if self.importTimeOnly:
+            return ImportTimeExtractor( AstDependencyExtractor(counters=counters) )
+        if self.engine == AstDependencyExtractor.ENGINE:
+            return AstDependencyExtractor(counters=counters)
+        return ModuleDependencyExtractor(counters=counters, memoryMap=self.memoryMap)
+
+    def setCycleDetection(self, detectCycles, condenseOutput = False):
+        """Set whether import cycles are searched for after dependencies are found.
+
+        When enabled, execute() stores the Condensation of the
+        dependencies it returns in the executor's condensation field,
+        which holds every import cycle and the condensation DAG.
+
+        Arguments:
+        detectCycles -- If True, import cycles are searched for
+
+        Keyword arguments:
+        condenseOutput -- If True, the condensation DAG is fed to the
+                          outputter instead of the dependencies. Only
+                          used if cycles are detected. (default: False)
+
+        """
+        self.detectCycles = detectCycles
+        self.condenseOutput = condenseOutput
+
+    def setWeightAnalysis(self, analyseWeights):
+        """Set whether the size of the code loaded by importing each module is found.
+
+        When enabled, searchForDependencies() measures the bytes,
+        lines and imports of every module in the project and stores
+        the ImportWeights of the dependencies it finds in the
+        executor's weights field. Weights are found before the
+        dependencies are pruned, so they include everything each
+        module loads.
+
+        Arguments:
+        analyseWeights -- If True, import weights are found
+
+        """
+        self.analyseWeights = analyseWeights
+
+    def setStatistics(self, statistics):
+        """Set object which records the time taken by each stage of a search and the work done.
+
+        The stages are "walk", "extract", "resolve", "whitelist",
+        "weights", "prune", "cycles" and "output". The counters are:
+
+          modules -- Python files found in the project
+          files -- Files read and extracted (not found in the cache)
+          bytes -- Bytes read from the extracted files
+          tokens -- Tokens produced by the tokeniser
+          imports -- Imports found in the extracted files
+          cache_hits, cache_misses -- Files found and not found
+                                      in the cache
+          graph_cache_hits -- Projects whose whole dependency graph
+                              was found in the cache
+          dependencies -- Dependencies in the resolved and
+                          whitelisted graph
+
+        Statistics are added to every time the executor is run, so
+        a new instance should be set for each run that is reported
+        separately.
+
+        Arguments:
+        statistics -- Instance of PipelineStatistics. If None,
+                      nothing is recorded, so running the executor
+                      has no extra cost.
+
+        """
+        if statistics != None and not isinstance(statistics, PipelineStatistics):
+            raise TypeError("Statistics must be an instance of PipelineStatistics")
+        self.statistics = statistics
+
+    def timeStage(self, stage):
+        """Return context manager which records the time taken inside it, if statistics are being recorded.
+
+        Arguments:
+        stage -- Name of the stage being timed
+
+        """
+        if self.statistics:
+            return self.statistics.timeStage(stage)
+        return contextlib.nullcontext()
+
+    def extractDependencies(self, projectDirectory, walker = None):
+        """Extract unresolved dependencies from every module in a project.
+
+        Returns dictionary where the keys are the absolute paths
+        to the project's modules and the values are sets of
+        ParsedImport objects found in the respective module.
+
+        Arguments:
+        projectDirectory -- Absolute path to the root directory
+                            of the project.
+
+        Keyword arguments:
+        walker -- ProjectWalker used to find the project's modules.
+                  After extraction, it holds the names of all of the
+                  project's packages/modules. If not provided, a new
+                  ProjectWalker is used. (default: None)
+
+        """
+        # The walker only finds Python files, so no filterers are needed
+        searcher = walker or ProjectWalker()
+        filterers = []
+        extractor = self.createExtractor( collections.Counter() if self.statistics else None )
+        if self.ioConcurrency:
+            processor = AsyncFileProcessor(searcher, filterers, extractor, self.ioConcurrency,
+                cache=self.cache, pool=self.pool)
+        elif self.jobs > 1:
+            processor = ParallelFileProcessor(searcher, filterers, extractor, self.jobs,
+                cache=self.cache, pool=self.pool)
+        elif self.cache:
+            processor = FileProcessor(searcher, filterers, CachingExtractor(extractor, self.cache))
+        else:
+            processor = FileProcessor(searcher, filterers, extractor)
+        if self.cache:
+            hits, misses = self.cache.hits, self.cache.misses
+        with self.timeStage("extract"):
+            dependencies = processor.process(projectDirectory)
+            if self.cache:
+                self.cache.commit()
+        if self.statistics:
+            self.statistics.update(extractor.counters)
+            if self.cache:
+                self.statistics.count("cache_hits", self.cache.hits - hits)
+                self.statistics.count("cache_misses", self.cache.misses - misses)
+        return dependencies
+
+    def searchForDependencies(self, projectDirectory, walker = None):
         """Search for dependencies in a project.
 
-        Returns dictionary where the keys are the packages/modules
-        in the project and the values are packages/modules that
-        the respective key imported.
+        Returns DependencyGraph, which maps the packages/modules
+        in the project to the packages/modules that the respective
+        key imported.
 
         Arguments:
         projectDirectory -- Absolute path to the root directory
                             of the project to search for
                             dependencies in.
 
+        Keyword arguments:
+        walker -- ProjectWalker used to find the project's modules.
+                  If it already scanned the project, the project
+                  is not walked again. If not provided, a new
+                  ProjectWalker is used. (default: None)
+
         """
         if not os.path.isdir(projectDirectory):
             raise IOError("'{}' is not a valid directory".format(projectDirectory))
         # Important to make the project directory an absolute path
         projectDirectory = os.path.abspath(projectDirectory)
-        
-        # Extract dependencies for the project directory
-        searcher = FileSearcher(True)
-        filterers = [ ExtensionFilterer(["py"]) ]
-        extractor = ModuleDependencyExtractor()
-        processor = FileProcessor(searcher, filterers, extractor)
-        dependencies = processor.process(projectDirectory)
+
+        # Extract dependencies for the project directory. The same
+        # walk of the project also finds the names of its modules.
+        walker = walker or ProjectWalker()
+        if walker.projectDirectory != projectDirectory:
+            self.scanProject(projectDirectory, walker)
+        dependencies = self.extractDependencies(projectDirectory, walker)
         # Resolve relative imports
-        resolver = ImportResolver(projectDirectory)
-        dependencies = resolver.resolveImports(dependencies)
+        with self.timeStage("resolve"):
+            resolver = ImportResolver(projectDirectory)
+            resolved = DependencyGraph( resolver.resolveImports(dependencies) )
+        # Modules are measured now, while the imports of each are known
+        if self.analyseWeights:
+            with self.timeStage("weights"):
+                sizes = measureModules(dependencies, resolver)
+        dependencies = resolved
         # Finally, apply a whitelist to the dependencies to only
-        # include modules that belong to the scanned project
-        whitelistApplier = WhitelistApplier()
-        return whitelistApplier.applyToProject(projectDirectory, dependencies)
+        # include modules that belong to the scanned project. Every
+        # later stage works on the compact graph.
+        with self.timeStage("whitelist"):
+            whitelistApplier = WhitelistApplier()
+            dependencies = whitelistApplier.applyWhitelist(dependencies, Whitelist(walker.packageNames))
+        if self.statistics:
+            self.statistics.count("dependencies", dependencies.numEdges)
+        if self.analyseWeights:
+            with self.timeStage("weights"):
+                self.weights = WeightAnalyser().analyse(dependencies, sizes)
+        return dependencies
+
+    def scanProject(self, projectDirectory, walker):
+        """Scan a project with a ProjectWalker, recording it as the walk stage.
+
+        Arguments:
+        projectDirectory -- Absolute path to the root directory
+                            of the project.
+        walker -- ProjectWalker used to scan the project
+
+        """
+        with self.timeStage("walk"):
+            walker.scan(projectDirectory)
+        if self.statistics:
+            self.statistics.count("modules", len(walker.modulePaths))
+
+    def getDependencyGraph(self, projectDirectory):
+        """Return DependencyGraph of a project, reusing the cached graph if no file changed.
+
+        If the executor has a cache and the project's Python files
+        have the same paths, modification times and sizes as when
+        the cached graph was stored, nothing is extracted. Otherwise,
+        the dependencies are searched for and the resulting graph
+        is cached.
+
+        Arguments:
+        projectDirectory -- Absolute path to the root directory
+                            of the project.
+
+        """
+        if not os.path.isdir(projectDirectory):
+            raise IOError("'{}' is not a valid directory".format(projectDirectory))
+        projectDirectory = os.path.abspath(projectDirectory)
+
+        walker = ProjectWalker()
+        self.scanProject(projectDirectory, walker)
+        if self.cache:
+            # Graphs found by different engines may differ
+            fingerprint = "{}:{}".format(self.createExtractor().ENGINE,
+                self.cache.getFingerprint(walker.modulePaths))
+            graph = self.cache.lookupGraph(projectDirectory, fingerprint)
+            if graph != None:
+                if self.statistics:
+                    self.statistics.count("graph_cache_hits")
+                return graph
+        graph = self.searchForDependencies(projectDirectory, walker)
+        if self.cache:
+            self.cache.storeGraph(projectDirectory, fingerprint, graph)
+            self.cache.commit()
+        return graph
+
+    def findAffectedModules(self, projectDirectory, changedFiles):
+        """Return sorted list of the modules affected by changes to some files.
+
+        A module is affected if it is one of the changed modules or
+        imports one of them, directly or through other modules.
+        Importing anything from inside a changed module or package
+        (e.g. "project.a.function") counts as importing it. Changed
+        files which aren't Python files inside the project are ignored.
+
+        The project's graph is found with getDependencyGraph(), so
+        the query is answered from the cache if nothing changed
+        since the graph was cached.
+
+        Arguments:
+        projectDirectory -- Absolute path to the root directory
+                            of the project.
+        changedFiles -- Collection of paths to the changed files.
+                        Relative paths are relative to the current
+                        working directory.
+
+        """
+        graph = self.getDependencyGraph(projectDirectory)
+        projectDirectory = os.path.abspath(projectDirectory)
+        resolver = ImportResolver(projectDirectory)
+        changedNames = set()
+        for filename in changedFiles:
+            path = os.path.abspath(filename)
+            if path.endswith(".py") and path.startswith(projectDirectory + os.sep):
+                changedNames.add( resolver.getModuleName(path) )
 
-    def execute(self, projectDirectory):
+        # Find nodes of the changed modules and of everything inside them
+        startIds = []
+        for nodeId, name in enumerate(graph.names):
+            while len(name) > 0 and not name in changedNames:
+                name = name.rpartition(".")[0]
+            if len(name) > 0:
+                startIds.append(nodeId)
+        affected = set( graph.getName(nodeId) for nodeId in graph.getReachableFromIds(startIds, True) )
+        # Changed modules are affected, but names of objects inside them aren't modules
+        affected.update( graph.getName(nodeId) for nodeId in startIds
+            if nodeId < graph.numDependants or graph.getName(nodeId) in changedNames )
+        return sorted(affected)
+
+    def execute(self, projectDirectory, stream = None):
         """Execute dependency search.
 
         If an outputter has been assigned to this executor, then
         the results of the dependency search are feed to the
         outputter as well.
 
-        Returns dictionary where the keys are the packages/modules
-        in the project and the values are packages/modules that
-        the respective key imported.
+        Returns DependencyGraph, which maps the packages/modules
+        in the project to the packages/modules that the respective
+        key imported.
 
         Arguments:
         projectDirectory -- Absolute path to the root directory
                             of the project to search for
                             dependencies.
 
+        Keyword arguments:
+        stream -- Text stream the output is written to. If None,
+                  standard output is used. (default: None)
+
         """
         # Get the resolved dependencies
         dependencies = self.searchForDependencies(projectDirectory)
         # If a maximum depth was specified, use a DepthPruner to prune
         # dependencies found
         if self.maximumDepth:
-            pruner = DepthPruner()
-            dependencies = pruner.prune(dependencies, self.maximumDepth)
-        # If an outputter has been assigned, feed the dependencies to it
+            with self.timeStage("prune"):
+                pruner = DepthPruner()
+                dependencies = pruner.prune(dependencies, self.maximumDepth)
+        if self.detectCycles:
+            with self.timeStage("cycles"):
+                self.condensation = CycleDetector().condense(dependencies)
+        if self.detectCycles and self.condenseOutput:
+            self.outputDependencies( self.condensation.getGraph(), stream )
+        else:
+            self.outputDependencies(dependencies, stream)
+
+        return dependencies
+
+    def executeProjects(self, projectDirectories, outputDirectory = None, callback = None):
+        """Execute dependency search on many projects, sharing workers and the cache between them.
+
+        Each project is searched like execute(). If the executor uses
+        multiple processes or concurrent reads, one pool of workers
+        is started and used for every project, so the cost of starting
+        workers is only paid once.
+
+        Returns dictionary mapping the absolute path to each project's
+        root directory to its DependencyGraph, in the order the
+        projects were given.
+
+        Arguments:
+        projectDirectories -- List of paths to the root directories of
+                              the projects to search. An IOError is
+                              raised before any project is searched if
+                              any of them is not a directory.
+
+        Keyword arguments:
+        outputDirectory -- Directory which the output of each project
+                           is written to, in a file named after the
+                           project's directory and the outputter's
+                           EXTENSION. If None, the output of every
+                           project is written to standard output one
+                           after the other, each after a line
+                           containing PROJECT_HEADER. (default: None)
+        callback -- Function called with the absolute path to each
+                    project's root directory and its DependencyGraph
+                    once the project has been searched, such as to
+                    report the import cycles found. (default: None)
+
+        """
+        for projectDirectory in projectDirectories:
+            if not os.path.isdir(projectDirectory):
+                raise IOError("'{}' is not a valid directory".format(projectDirectory))
+        if outputDirectory != None and not os.path.isdir(outputDirectory):
+            os.makedirs(outputDirectory)
+
+        results = {}
+        usedFilenames = set()
+        with self.createPool() as pool:
+            self.pool = pool
+            try:
+                for projectDirectory in projectDirectories:
+                    projectDirectory = os.path.abspath(projectDirectory)
+                    if outputDirectory != None and self.outputter:
+                        filename = self.getOutputFilename(outputDirectory, projectDirectory, usedFilenames)
+                        with open(filename, "w") as stream:
+                            results[projectDirectory] = self.execute(projectDirectory, stream)
+                    else:
+                        print(self.PROJECT_HEADER.format(projectDirectory))
+                        results[projectDirectory] = self.execute(projectDirectory)
+                    if callback:
+                        callback(projectDirectory, results[projectDirectory])
+            finally:
+                self.pool = None
+        return results
+
+    def createPool(self):
+        """Return pool of workers used to extract dependencies, or a context which gives None if no pool is needed.
+
+        The pool is a context manager which shuts it down on exit.
+
+        """
+        if self.ioConcurrency:
+            return ThreadPoolExecutor(max_workers=self.ioConcurrency)
+        elif self.jobs > 1:
+            return ProcessPoolExecutor(max_workers=self.jobs)
+        return contextlib.nullcontext()
+
+    def getOutputFilename(self, outputDirectory, projectDirectory, usedFilenames):
+        """Return path to file the output of a project is written to.
+
+        Files are named after the project's directory. If another
+        project with the same name was already given a file, a number
+        is added to the name (e.g. "project-2.dot").
+
+        Arguments:
+        outputDirectory -- Directory containing the output files
+        projectDirectory -- Absolute path to the project's root directory
+        usedFilenames -- Set of the filenames already used, which the
+                         returned filename is added to
+
+        """
+        name = os.path.basename(projectDirectory.rstrip(os.sep)) or "project"
+        extension = self.outputter.EXTENSION
+        filename = "{}.{}".format(name, extension)
+        number = 2
+        while filename in usedFilenames:
+            filename = "{}-{}.{}".format(name, number, extension)
+            number += 1
+        usedFilenames.add(filename)
+        return os.path.join(outputDirectory, filename)
+
+    def outputDependencies(self, dependencies, stream = None):
+        """Feed dependencies to the executor's outputter, if it has one.
+
+        Arguments:
+        dependencies -- Dictionary or DependencyGraph where the keys
+                        are package/module names and the values are
+                        packages/modules that their respective keys
+                        imported.
+
+        Keyword arguments:
+        stream -- Text stream the output is written to. If None,
+                  standard output is used. (default: None)
+
+        """
         if self.outputter:
-            output = self.outputter.createOutput(dependencies)
-            if output:
-                print(output)
+            with self.timeStage("output"):
+                self.outputter.writeOutput(dependencies, stream or sys.stdout)
+
+    def watch(self, projectDirectory, interval, callback, maxPolls = None):
+        """Search for dependencies and keep them up to date as files change.
+
+        The dependencies of the whole project are first found and
+        fed to the outputter like execute(). The project is then
+        polled for changes, and every change to the dependencies is
+        passed to the callback as a DependencyDiff. Only files which
+        changed are processed again.
+
+        Returns the dependencies of the project after the last poll.
+
+        Arguments:
+        projectDirectory -- Absolute path to the root directory
+                            of the project to watch.
+        interval -- Number of seconds to wait between polls.
+        callback -- Function called with a DependencyDiff whenever
+                    the dependencies change.
+
+        Keyword arguments:
+        maxPolls -- Number of times to poll the project before
+                    returning. If None, the project is polled
+                    until the program is interrupted. (default: None)
+
+        """
+        if not os.path.isdir(projectDirectory):
+            raise IOError("'{}' is not a valid directory".format(projectDirectory))
+        projectDirectory = os.path.abspath(projectDirectory)
 
-        return dependencies
\ No newline at end of file
+        # execute() doesn't prune when the maximum depth is 0, so
+        # the watcher mustn't either
+        watcher = DependencyWatcher(projectDirectory, self.maximumDepth or None, self.createExtractor())
+        dependencies = watcher.start( self.extractDependencies(projectDirectory) )
+        self.outputDependencies(dependencies)
+        numPolls = 0
+        while maxPolls == None or numPolls < maxPolls:
+            time.sleep(interval)
+            diff = watcher.poll()
+            if not diff.isEmpty():
+                callback(diff)
+            numPolls += 1
+        return watcher.getDependencies()
\ No newline at end of file
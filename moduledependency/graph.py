@@ -0,0 +1,385 @@
+"""Contains a compact, read-only representation of a project's dependencies."""
+
+import sys
+from array import array
+from collections.abc import Mapping
+
+from .util import LRUCache
+
+
+class DependencyGraph(Mapping):
+
+    """Dependencies stored as interned names and integer adjacency arrays.
+
+    Every package/module name is interned and mapped to an integer
+    node ID. The dependencies of the dependant with ID i are stored
+    as the node IDs edgeTargets[edgeOffsets[i]:edgeOffsets[i + 1]],
+    so a whole project takes a handful of flat arrays instead of a
+    Python set for every module. Dependants always have the IDs
+    0 to len(graph) - 1, and names which are only ever depended
+    on have the IDs after that.
+
+    The graph is a read-only mapping from dependant names to frozen
+    sets of dependency names, so it can be used wherever the
+    dictionary of sets used by the rest of the package is accepted,
+    and it compares equal to a dictionary with the same contents.
+
+    Transitive dependencies and dependants are found by traversing
+    the arrays, and the results are memoised so later queries can
+    reuse them.
+
+    """
+
+    # Default maximum number of transitive closures memoised in each direction
+    DEFAULT_CLOSURE_CACHE_SIZE = 4096
+
+    def __init__(self, dependencies = None):
+        """Construct instance of DependencyGraph.
+
+        Keyword arguments:
+        dependencies -- Dictionary where the keys are dependant
+                        packages/modules and the values are
+                        collections of packages/modules that the
+                        respective key depends on, or another
+                        DependencyGraph. If None, the graph is
+                        empty. (default: None)
+
+        """
+        if isinstance(dependencies, DependencyGraph):
+            # Graphs are never modified, so the arrays can be shared
+            self.names = list(dependencies.names)
+            self.ids = dict(dependencies.ids)
+            self.numDependants = dependencies.numDependants
+            self.edgeOffsets = dependencies.edgeOffsets
+            self.edgeTargets = dependencies.edgeTargets
+            self.reverseOffsets = dependencies.reverseOffsets
+            self.reverseTargets = dependencies.reverseTargets
+            self.clearClosures()
+            return
+
+        self.names = []
+        self.ids = {}
+        self.edgeOffsets = array("l", [ 0 ])
+        self.edgeTargets = array("l")
+        # Reverse adjacency arrays, built the first time they're needed
+        self.reverseOffsets = None
+        self.reverseTargets = None
+        self.clearClosures()
+        if dependencies == None:
+            dependencies = {}
+        # Intern dependants first so they have the lowest IDs
+        for dependantName in dependencies:
+            self.intern(dependantName)
+        self.numDependants = len(self.names)
+        intern = self.intern
+        for dependencyList in dependencies.values():
+            self.edgeTargets.extend( set(map(intern, dependencyList)) )
+            self.edgeOffsets.append( len(self.edgeTargets) )
+
+    @classmethod
+    def fromArrays(cls, names, numDependants, edgeOffsets, edgeTargets,
+            reverseOffsets = None, reverseTargets = None):
+        """Return DependencyGraph built directly from its names and adjacency arrays.
+
+        Used to restore a graph without building any sets, e.g. when
+        loading it from a cache. See the class' documentation for
+        how the arrays are laid out.
+
+        Arguments:
+        names -- List containing the name of each node ID
+        numDependants -- Number of nodes which are dependants
+        edgeOffsets -- Array of offsets of each dependant's dependencies
+        edgeTargets -- Array containing the IDs of all dependencies
+
+        Keyword arguments:
+        reverseOffsets -- Offsets of the reverse arrays returned by
+                          getReverseArrays(). If None, they are built
+                          when needed. (default: None)
+        reverseTargets -- Targets of the reverse arrays returned by
+                          getReverseArrays(). (default: None)
+
+        """
+        graph = cls()
+        for name in names:
+            graph.intern(name)
+        graph.numDependants = numDependants
+        graph.edgeOffsets = edgeOffsets
+        graph.edgeTargets = edgeTargets
+        if reverseOffsets != None and reverseTargets != None:
+            graph.reverseOffsets = reverseOffsets
+            graph.reverseTargets = reverseTargets
+        return graph
+
+    @classmethod
+    def fromDict(cls, dependencies):
+        """Return DependencyGraph containing dependencies given as a dictionary.
+
+        Arguments:
+        dependencies -- Dictionary where the keys are dependant
+                        packages/modules and the values are
+                        collections of packages/modules that the
+                        respective key depends on
+
+        """
+        return cls(dependencies)
+
+    def toDict(self):
+        """Return dependencies as a dictionary which maps names to sets of names."""
+        names = self.names
+        offsets = self.edgeOffsets
+        targets = self.edgeTargets
+        return { names[i] : set( map(names.__getitem__, targets[offsets[i]:offsets[i + 1]]) )
+            for i in range(self.numDependants) }
+
+    def intern(self, name):
+        """Return ID of name, assigning it a new ID if it doesn't have one.
+
+        Only used while the graph is constructed.
+
+        Arguments:
+        name -- Name of package/module. Strings are interned with
+                sys.intern(), so equal names share one object.
+
+        """
+        nameId = self.ids.get(name)
+        if nameId == None:
+            if isinstance(name, str):
+                name = sys.intern(name)
+            nameId = len(self.names)
+            self.ids[name] = nameId
+            self.names.append(name)
+        return nameId
+
+    @property
+    def numNodes(self):
+        """Number of distinct names in the graph, including dependencies."""
+        return len(self.names)
+
+    @property
+    def numEdges(self):
+        """Number of dependencies in the graph."""
+        return len(self.edgeTargets)
+
+    def getId(self, name):
+        """Return node ID of name, or None if the name is not in the graph."""
+        return self.ids.get(name)
+
+    def getName(self, nodeId):
+        """Return name of the node with the given ID."""
+        return self.names[nodeId]
+
+    def getDependencyIds(self, nodeId):
+        """Return array containing IDs of the dependencies of a node.
+
+        Nodes which aren't dependants have no dependencies.
+
+        Arguments:
+        nodeId -- ID of the node
+
+        """
+        if nodeId < self.numDependants:
+            return self.edgeTargets[self.edgeOffsets[nodeId]:self.edgeOffsets[nodeId + 1]]
+        else:
+            return array("l")
+
+    def iterEdges(self):
+        """Yield every dependency in the graph as a (dependant, dependency) tuple of names."""
+        names = self.names
+        offsets = self.edgeOffsets
+        targets = self.edgeTargets
+        for i in range(self.numDependants):
+            dependantName = names[i]
+            for j in range(offsets[i], offsets[i + 1]):
+                yield dependantName, names[targets[j]]
+
+    def filter(self, predicate):
+        """Return graph only containing the names a predicate accepts.
+
+        Dependants which are not accepted are removed along with
+        their dependencies, and dependencies which are not accepted
+        are removed from every dependant. The predicate is only
+        called once for each distinct name.
+
+        Arguments:
+        predicate -- Function which takes a name and returns
+                     True if the name should be kept
+
+        """
+        names = self.names
+        offsets = self.edgeOffsets
+        targets = self.edgeTargets
+        # New ID of every accepted node, or -1 if it isn't accepted.
+        # Accepted dependants keep their order, so they still have
+        # the lowest IDs.
+        newIds = array("l", [ -1 ]) * len(names)
+        graph = DependencyGraph()
+        def accept(nodeIds):
+            for nodeId in nodeIds:
+                if predicate(names[nodeId]):
+                    newIds[nodeId] = len(graph.names)
+                    graph.names.append(names[nodeId])
+        accept( range(self.numDependants) )
+        graph.numDependants = len(graph.names)
+        accept( range(self.numDependants, len(names)) )
+        graph.ids = { name : nodeId for nodeId, name in enumerate(graph.names) }
+        for i in range(self.numDependants):
+            if newIds[i] != -1:
+                graph.edgeTargets.extend( [ newIds[target]
+                    for target in targets[offsets[i]:offsets[i + 1]] if newIds[target] != -1 ] )
+                graph.edgeOffsets.append( len(graph.edgeTargets) )
+        return graph
+
+    def getReverseArrays(self):
+        """Return tuple containing reverse adjacency arrays, building them if necessary.
+
+        The IDs of the dependants of node i are stored in the
+        second array, between the offsets at i and i + 1 of the
+        first. Unlike the forward arrays, there are offsets for
+        every node.
+
+        """
+        if self.reverseOffsets == None:
+            numNodes = len(self.names)
+            offsets = self.edgeOffsets
+            targets = self.edgeTargets
+            # Count dependants of each node, then place each dependant
+            # at the next free position of its dependency's range
+            counts = array("l", [ 0 ]) * (numNodes + 1)
+            for target in targets:
+                counts[target + 1] += 1
+            for nodeId in range(numNodes):
+                counts[nodeId + 1] += counts[nodeId]
+            reverseOffsets = array("l", counts)
+            reverseTargets = array("l", [ 0 ]) * len(targets)
+            for i in range(self.numDependants):
+                for j in range(offsets[i], offsets[i + 1]):
+                    target = targets[j]
+                    reverseTargets[counts[target]] = i
+                    counts[target] += 1
+            self.reverseOffsets = reverseOffsets
+            self.reverseTargets = reverseTargets
+        return self.reverseOffsets, self.reverseTargets
+
+    def clearClosures(self, cacheSize = DEFAULT_CLOSURE_CACHE_SIZE):
+        """Discard all memoised transitive closures.
+
+        Keyword arguments:
+        cacheSize -- Maximum number of closures memoised in each
+                     direction. (default: DEFAULT_CLOSURE_CACHE_SIZE)
+
+        """
+        # Closures of dependencies and dependants respectively
+        self.closureCaches = ( LRUCache(cacheSize), LRUCache(cacheSize) )
+
+    def getReachableIds(self, nodeId, reverse = False):
+        """Return frozen set containing IDs of every node reachable from a node.
+
+        The graph is traversed depth-first, so each query takes
+        time linear in the number of nodes and dependencies it
+        reaches. Results are memoised, so repeating a query only
+        costs a lookup. The node itself is only included if it
+        is part of a cycle.
+
+        Arguments:
+        nodeId -- ID of the node to start from
+
+        Keyword arguments:
+        reverse -- If True, dependants are followed instead of
+                   dependencies. (default: False)
+
+        """
+        cache = self.closureCaches[1 if reverse else 0]
+        reachable = cache.get(nodeId)
+        if reachable == None:
+            reachable = self.getReachableFromIds([ nodeId ], reverse)
+            cache.put(nodeId, reachable)
+        return reachable
+
+    def getReachableFromIds(self, nodeIds, reverse = False):
+        """Return frozen set containing IDs of every node reachable from any of the given nodes.
+
+        All of the nodes are traversed from at once, so the time taken
+        is linear in the number of nodes and dependencies reached, no
+        matter how many nodes are given. Results are not memoised.
+        The given nodes are only included if they are reachable from
+        one of the given nodes.
+
+        Arguments:
+        nodeIds -- Iterable of IDs of the nodes to start from
+
+        Keyword arguments:
+        reverse -- If True, dependants are followed instead of
+                   dependencies. (default: False)
+
+        """
+        if reverse:
+            offsets, targets = self.getReverseArrays()
+            numRows = len(self.names)
+        else:
+            offsets, targets = self.edgeOffsets, self.edgeTargets
+            numRows = self.numDependants
+        visited = bytearray(len(self.names))
+        reachable = []
+        stack = list(nodeIds)
+        while len(stack) > 0:
+            current = stack.pop()
+            if current >= numRows:
+                continue
+            for j in range(offsets[current], offsets[current + 1]):
+                target = targets[j]
+                if visited[target]:
+                    continue
+                visited[target] = 1
+                reachable.append(target)
+                stack.append(target)
+        return frozenset(reachable)
+
+    def getTransitiveDependencies(self, name):
+        """Return set containing every package/module a package/module depends on, directly or not.
+
+        Raises KeyError if the name is not in the graph.
+
+        Arguments:
+        name -- Name of the package/module
+
+        """
+        names = self.names
+        return set( map(names.__getitem__, self.getReachableIds(self.ids[name])) )
+
+    def getTransitiveDependants(self, name):
+        """Return set containing every package/module which depends on a package/module, directly or not.
+
+        Raises KeyError if the name is not in the graph.
+
+        Arguments:
+        name -- Name of the package/module
+
+        """
+        names = self.names
+        return set( map(names.__getitem__, self.getReachableIds(self.ids[name], True)) )
+
+    def __getitem__(self, name):
+        """Return frozen set containing the names of the dependencies of a dependant."""
+        nodeId = self.ids.get(name)
+        if nodeId == None or nodeId >= self.numDependants:
+            raise KeyError(name)
+        names = self.names
+        return frozenset( map(names.__getitem__,
+            self.edgeTargets[self.edgeOffsets[nodeId]:self.edgeOffsets[nodeId + 1]]) )
+
+    def __contains__(self, name):
+        """Return True if name is a dependant in the graph."""
+        nodeId = self.ids.get(name)
+        return nodeId != None and nodeId < self.numDependants
+
+    def __iter__(self):
+        """Return iterator over the names of the dependants."""
+        return iter(self.names[:self.numDependants])
+
+    def __len__(self):
+        """Return number of dependants in the graph."""
+        return self.numDependants
+
+    def __repr__(self):
+        """Return human-readable representation of object."""
+        return "DependencyGraph({})".format(self.toDict())
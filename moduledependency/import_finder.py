@@ -0,0 +1,202 @@
+"""Contains functionality for finding import statements in Python source
+code without tokenising all of it."""
+
+import re
+
+# Values of the bytes which findStatementEndInBytes() looks for
+BACKSLASH, HASH, OPEN_BRACKET, CLOSE_BRACKET, NEWLINE, SEMICOLON = b"\\#()\n;"
+
+
+class ImportStatementFinder:
+
+	"""Finds the regions of Python source code which contain import statements.
+
+	Only import statements affect the dependencies of a module, so
+	the rest of the source does not need to be tokenised or parsed.
+	Keywords inside string literals and comments are ignored, and
+	statements continued over multiple lines using brackets or
+	backslashes are returned in full.
+
+	"""
+
+	# Regular expression which matches string literals, comments and
+	# the keywords which start import statements. Strings and comments
+	# are matched as a whole so any keywords inside them are skipped.
+	# Keywords only start a statement if they're at the start of a line
+	# or follow a ";" or ":" (e.g. "try: import x").
+	SCAN_REGEX = re.compile(r"""
+		(?P<string>
+			'''(?:[^'\\]|\\.|'(?!''))*(?:'''|\Z)
+			|\"\"\"(?:[^"\\]|\\.|"(?!""))*(?:\"\"\"|\Z)
+			|'(?:[^'\\\n]|\\.)*'?
+			|"(?:[^"\\\n]|\\.)*"?
+		)
+		|(?P<comment>\#[^\n]*)
+		|(?:^|(?<=[;:]))[ \t\f]*(?P<keyword>import|from)\b
+	""", re.VERBOSE | re.DOTALL | re.MULTILINE)
+	# Same as SCAN_REGEX, but matches bytes. Keywords may also follow
+	# a UTF-8 byte order mark at the very start of the source.
+	BYTES_SCAN_REGEX = re.compile(rb"""
+		(?P<string>
+			'''(?:[^'\\]|\\.|'(?!''))*(?:'''|\Z)
+			|\"\"\"(?:[^"\\]|\\.|"(?!""))*(?:\"\"\"|\Z)
+			|'(?:[^'\\\n]|\\.)*'?
+			|"(?:[^"\\\n]|\\.)*"?
+		)
+		|(?P<comment>\#[^\n]*)
+		|(?:^|(?<=[;:])|(?<=\A\xef\xbb\xbf))[ \t\f]*(?P<keyword>import|from)\b
+	""", re.VERBOSE | re.DOTALL | re.MULTILINE)
+
+	def findStatements(self, source):
+		"""Return list of strings containing each import statement in source.
+
+		Arguments:
+		source -- Python source code to search
+
+		"""
+		if not isinstance(source, str):
+			raise TypeError("Source to search must be a string")
+		# Every import statement contains the "import" keyword, so
+		# sources without it can be discarded straight away
+		lastImport = source.rfind("import")
+		if lastImport == -1:
+			return []
+
+		statements = []
+		end = 0
+		for match in self.SCAN_REGEX.finditer(source, 0, self.getScanEnd(source, lastImport, "\n")):
+			start = match.start("keyword")
+			# Ignore strings, comments and keywords which are part of
+			# a statement that has already been found (e.g. the
+			# "import" in a backslash-continued "from" statement)
+			if start == -1 or start < end:
+				continue
+			end = self.findStatementEnd(source, start)
+			statements.append( source[start:end] )
+		return statements
+
+	def getScanEnd(self, source, lastImport, newline):
+		"""Return index that source only needs to be scanned up to for import statements.
+
+		Every import statement contains the "import" keyword, so no
+		statement starts after the last occurrence of "import". The
+		scan continues to the end of that line so the keyword is not
+		cut short (e.g. "importlib" is not matched as "import").
+		Imports are usually at the top of a module, so most of the
+		source is never scanned.
+
+		Arguments:
+		source -- Python source code, as a string or bytes
+		lastImport -- Index of the last occurrence of "import"
+		newline -- Newline character, of the same type as source
+
+		"""
+		end = source.find(newline, lastImport, len(source))
+		return len(source) if end == -1 else end
+
+	def findStatementEnd(self, source, start):
+		"""Return index of the character which ends a statement.
+
+		A statement ends at the first newline or ";" that is not
+		inside brackets, continued with a backslash or part of
+		a comment. If no such character is found, the end of the
+		source is returned.
+
+		Arguments:
+		source -- Python source code containing the statement
+		start -- Index of the first character of the statement
+
+		"""
+		depth = 0
+		index = start
+		length = len(source)
+		while index < length:
+			ch = source[index]
+			if ch == "\\":
+				# Skip the continued newline, which may be "\r\n"
+				if source.startswith("\r\n", index + 1):
+					index += 2
+				else:
+					index += 1
+			elif ch == "#":
+				# Skip to the end of the comment, leaving the newline
+				# to be processed like any other
+				newline = source.find("\n", index)
+				if newline == -1:
+					return length
+				index = newline - 1
+			elif ch == "(":
+				depth += 1
+			elif ch == ")":
+				depth -= 1
+			elif (ch == "\n" or ch == ";") and depth <= 0:
+				return index
+			index += 1
+		return length
+
+	def findStatementsInBytes(self, source, encoding = "utf-8"):
+		"""Return list of strings containing each import statement in source stored as bytes.
+
+		Only the import statements are decoded, so the rest of the
+		source is never copied or decoded. The encoding must be ASCII
+		compatible (see util.isAsciiCompatible()).
+
+		Arguments:
+		source -- Bytes-like object containing Python source code,
+				  such as bytes or an mmap.mmap
+
+		Keyword arguments:
+		encoding -- Encoding used to decode the statements.
+					(default: "utf-8")
+
+		"""
+		if isinstance(source, str):
+			raise TypeError("Source to search must be a bytes-like object")
+		# mmap.rfind() searches from the file position unless told otherwise
+		lastImport = source.rfind(b"import", 0, len(source))
+		if lastImport == -1:
+			return []
+
+		statements = []
+		end = 0
+		for match in self.BYTES_SCAN_REGEX.finditer(source, 0, self.getScanEnd(source, lastImport, b"\n")):
+			start = match.start("keyword")
+			if start == -1 or start < end:
+				continue
+			end = self.findStatementEndInBytes(source, start)
+			statements.append( source[start:end].decode(encoding) )
+		return statements
+
+	def findStatementEndInBytes(self, source, start):
+		"""Return index of the byte which ends a statement.
+
+		Same as findStatementEnd(), but for source code stored as bytes.
+
+		Arguments:
+		source -- Bytes-like object containing the statement
+		start -- Index of the first byte of the statement
+
+		"""
+		depth = 0
+		index = start
+		length = len(source)
+		while index < length:
+			byte = source[index]
+			if byte == BACKSLASH:
+				if source[index + 1:index + 3] == b"\r\n":
+					index += 2
+				else:
+					index += 1
+			elif byte == HASH:
+				newline = source.find(b"\n", index)
+				if newline == -1:
+					return length
+				index = newline - 1
+			elif byte == OPEN_BRACKET:
+				depth += 1
+			elif byte == CLOSE_BRACKET:
+				depth -= 1
+			elif (byte == NEWLINE or byte == SEMICOLON) and depth <= 0:
+				return index
+			index += 1
+		return length
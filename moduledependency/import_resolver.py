@@ -4,6 +4,7 @@ import os
 import re
 import platform
 from .parser import ParsedImport
+from .graph import DependencyGraph
 from . import util
 
 class ImportResolver:
@@ -12,13 +13,21 @@ class ImportResolver:
 
 	PRECEDING_DOT_REGEX = re.compile("^(\.+).*$")
 
-	def __init__(self, rootDirectory):
+	# Default maximum number of entries in each of the resolver's caches
+	DEFAULT_CACHE_SIZE = 8192
+
+	def __init__(self, rootDirectory, cacheSize = DEFAULT_CACHE_SIZE):
 		"""Construct instance of ImportResolver.
 
 		Arguments:
 		rootDirectory -- Absolute path to the project's root
 						 directory.
 
+		Keyword arguments:
+		cacheSize -- Maximum number of entries in each of the caches
+					 of module names and resolved imports.
+					 (default: DEFAULT_CACHE_SIZE)
+
 		"""
 		# Make sure to remove drive name from the filename if it's Windows
 		if platform.system() == "windows":
@@ -26,6 +35,13 @@ class ImportResolver:
 		# Sanitise root directory by ensuring only / is used
 		# as a path separator
 		self.rootDirectory = re.sub(r"(\\|/)", "/", rootDirectory)
+		self.rootPackage = util.getProjectRoot(self.rootDirectory)
+		# Full module name of each module path
+		self.moduleNameCache = util.LRUCache(cacheSize)
+		# Package each module path's relative imports are relative to
+		self.importingPackageCache = util.LRUCache(cacheSize)
+		# Absolute name of each (importing package, relative name) pair
+		self.resolvedNameCache = util.LRUCache(cacheSize)
 
 	def getPackageName(self, packagePath):
 		"""Return name of package (relative to project root) given Python.
@@ -60,11 +76,62 @@ class ImportResolver:
 		package -- Package to get the full name of
 
 		"""
-		rootPackage = util.getProjectRoot(self.rootDirectory)
 		if len(package) > 0:
-			return "{}.{}".format(rootPackage, package)
+			return "{}.{}".format(self.rootPackage, package)
 		else:
-			return rootPackage
+			return self.rootPackage
+
+	def getModuleName(self, modulePath):
+		"""Return full name of module, including the project's root package.
+
+		Module names of package __init__.py files are the names of
+		their packages. Names are cached by path.
+
+		Arguments:
+		modulePath -- Absolute path to the module
+
+		"""
+		moduleName = self.moduleNameCache.get(modulePath)
+		if moduleName == None:
+			moduleName = self.getPackageName(modulePath)
+			moduleName = self.addRootToPackage(moduleName)
+			# Ensure that __init__ is removed to make it a PACKAGE
+			if moduleName.endswith("__init__"):
+				moduleName = moduleName[:-8]
+				if moduleName.endswith("."):
+					moduleName = moduleName[:-1]
+			self.moduleNameCache.put(modulePath, moduleName)
+		return moduleName
+
+	def getImportingPackage(self, dependantModulePath):
+		"""Return name of package which a module's relative imports are relative to.
+
+		The name does NOT include the project's root package.
+		Names are cached by path.
+
+		Arguments:
+		dependantModulePath -- Absolute path to the module (.py file)
+							   which made the imports.
+
+		"""
+		dependantModule = self.importingPackageCache.get(dependantModulePath)
+		if dependantModule != None:
+			return dependantModule
+		# Get full package name of dependant module (based on project root)
+		dependantModule = self.getPackageName(dependantModulePath)
+		# If the module is a package __init__.py file, then those filenames are
+		# removed from the final dependant module name
+		if dependantModule.endswith("__init__"):
+			dependantModule = dependantModule[:-8]
+			# Ensure there is no trailing dot
+			if dependantModule.endswith("."):
+				dependantModule = dependantModule[:-1]
+		else:
+			# Remove last component from name (as that's the module that has imported something)
+			packageComponents = dependantModule.split(".")
+			dependantModule = ".".join( packageComponents[:-1] )
+		self.importingPackageCache.put(dependantModulePath, dependantModule)
+		return dependantModule
 
 	def resolveImport(self, dependantModulePath, importedModule):
 		"""Resolve relative import to full package name (relaitve to project root).
@@ -88,22 +155,26 @@ class ImportResolver:
 		if not importedModule.isRelative():
 			raise ValueError("Imported module '{}' should be a relative import".format(importedModule.moduleName))
 
-		# Get full package name of dependant module (based on project root)
-		dependantModule = self.getPackageName(dependantModulePath)
-		# If the module is a package __init__.py file, then those filenames are
-		# removed from the final dependant module name
-		wasInit = False
-		if dependantModule.endswith("__init__"):
-			wasInit = True
-			dependantModule = dependantModule[:-8]
-			# Ensure there is no trailing dot
-			if dependantModule.endswith("."):
-				dependantModule = dependantModule[:-1]
-		else:
-			# Remove last component from name (as that's the module that has imported something)
-			packageComponents = dependantModule.split(".")
-			dependantModule = ".".join( packageComponents[:-1] )
+		dependantModule = self.getImportingPackage(dependantModulePath)
+		# Modules in the same package resolve the same relative names
+		# to the same absolute names, so resolved names are cached
+		key = (dependantModule, importedModule.moduleName)
+		resolvedName = self.resolvedNameCache.get(key)
+		if resolvedName == None:
+			resolvedName = self.resolveRelativeName(dependantModule, importedModule)
+			self.resolvedNameCache.put(key, resolvedName)
+		return resolvedName
+
+	def resolveRelativeName(self, dependantModule, importedModule):
+		"""Return full name of a relative import made from inside a package.
 
+		Arguments:
+		dependantModule -- Name of package the import is relative to,
+						   NOT including the project's root package.
+		importedModule -- Instance of ParsedImport containing the
+						  relative import.
+
+		"""
 		name = importedModule.moduleName
 
 		# Extract preceding dots from module name
@@ -148,7 +219,9 @@ class ImportResolver:
 		By FULL module name, this includes the project's ROOT package
 		(which is the name of the projec's root directory).
 
-		If dependencies is not a dictionary, then a TypeError is raised.
+		If dependencies is not a dictionary or DependencyGraph, then a
+		TypeError is raised. The resolved dependencies of a
+		DependencyGraph are returned as a DependencyGraph.
 
 		Arguments:
 		dependencies -- Dictionary where the keys are the absolute
@@ -158,19 +231,13 @@ class ImportResolver:
 					   pointed to by the associated path.
 
 		"""
-		if not isinstance(dependencies, dict):
+		if not isinstance(dependencies, (dict, DependencyGraph)):
 			raise TypeError("Module dependencies must be a dictionary")
 
 		resolvedDependencies = {}
 		for modulePath, moduleDepenendencies in dependencies.items():
 			# Compute final package name of module.
-			moduleName = self.getPackageName(modulePath)
-			moduleName = self.addRootToPackage(moduleName)
-			# Ensure that __init__ is removed to make it a PACKAGE
-			if moduleName.endswith("__init__"):
-				moduleName = moduleName[:-8]
-				if moduleName.endswith("."):
-					moduleName = moduleName[:-1]
+			moduleName = self.getModuleName(modulePath)
 			# Resolve all absolute and relative dependencies
 			resolved = set()
 			for dep in moduleDepenendencies:
@@ -180,4 +247,6 @@ class ImportResolver:
 					resolved.add( dep.moduleName )
 			# Add resolve module and its dependencies to new dictionary
 			resolvedDependencies[moduleName] = resolved
+		if isinstance(dependencies, DependencyGraph):
+			return DependencyGraph(resolvedDependencies)
 		return resolvedDependencies
\ No newline at end of file
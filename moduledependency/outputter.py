@@ -10,6 +10,10 @@ class ResultOutputter:
 
     """Interface for outputting results of a dependency search."""
 
+    # Extension of files the output is written to when each project
+    # searched in one run is given its own file
+    EXTENSION = "txt"
+
     def createOutput(self, dependencies):
         """Output result of dependency search in some way.
 
@@ -18,12 +22,110 @@ class ResultOutputter:
         Arguments:
         dependencies -- Dictionary where the keys are package/module
                         names and the values are packages/modules that
-                        their respective keys imported.
+                        their respective keys imported, or any other
+                        mapping with the same contents, such as a
+                        DependencyGraph.
                         Both keys and values should be strings.
 
         """
         raise NotImplementedError
 
+    def writeOutput(self, dependencies, stream):
+        """Write result of dependency search to a stream.
+
+        By default, the result of createOutput() is written to
+        the stream followed by a newline, unless it is empty.
+        Outputters which can produce their output incrementally
+        should override this, or subclass StreamingOutputter.
+
+        Arguments:
+        dependencies -- Dictionary where the keys are package/module
+                        names and the values are packages/modules that
+                        their respective keys imported.
+        stream -- Text stream to write the output to, such as
+                  sys.stdout.
+
+        """
+        output = self.createOutput(dependencies)
+        if output:
+            stream.write(str(output))
+            stream.write("\n")
+
+
+class StreamingOutputter(ResultOutputter):
+
+    """Base class for outputters which generate their output in chunks.
+
+    Subclasses implement generateChunks(). The chunks are written
+    straight to the output stream and file, so the whole output
+    never has to be held in memory.
+
+    """
+
+    def __init__(self, filename = None):
+        """Construct instance of StreamingOutputter.
+
+        Keyword arguments:
+        filename -- Name of file to also write the output to.
+                    If None, output is not written to a file.
+                    (default: None)
+
+        """
+        self.filename = filename
+
+    def generateChunks(self, dependencies):
+        """Yield strings which make up the output when concatenated.
+
+        This method must be implemented by subclasses.
+
+        Arguments:
+        dependencies -- Dictionary where the keys are package/module
+                        names and the values are packages/modules that
+                        their respective keys imported.
+
+        """
+        raise NotImplementedError
+
+    def createOutput(self, dependencies):
+        """Return output as a string, writing it to the outputter's file if it has one.
+
+        Arguments:
+        dependencies -- Dictionary where the keys are package/module
+                        names and the values are packages/modules that
+                        their respective keys imported.
+
+        """
+        output = "".join( self.generateChunks(dependencies) )
+        # If a filename is set, be sure to write output to file
+        if self.filename:
+            with open(self.filename, "w") as f:
+                f.write(output)
+        return output
+
+    def writeOutput(self, dependencies, stream):
+        """Write output to a stream and to the outputter's file if it has one.
+
+        The output is followed by a newline in the stream, but not
+        in the file.
+
+        Arguments:
+        dependencies -- Dictionary where the keys are package/module
+                        names and the values are packages/modules that
+                        their respective keys imported.
+        stream -- Text stream to write the output to, such as
+                  sys.stdout.
+
+        """
+        if self.filename:
+            with open(self.filename, "w") as f:
+                for chunk in self.generateChunks(dependencies):
+                    stream.write(chunk)
+                    f.write(chunk)
+        else:
+            for chunk in self.generateChunks(dependencies):
+                stream.write(chunk)
+        stream.write("\n")
+
 
 class OutputterFactory:
 
@@ -1,13 +1,15 @@
 import re
-from moduledependency.outputter import ResultOutputter
+from moduledependency.outputter import StreamingOutputter
 
 # TODO: write docstrings
 # TODO: in docstrings make sure to mention that the generated output
 # can also be used as JSON as well as Python
 
-class Outputter(ResultOutputter):
+class Outputter(StreamingOutputter):
 
-    GRAPH_FORMAT = "digraph dependencies {{\n{}}}"
+    EXTENSION = "dot"
+    GRAPH_START = "digraph dependencies {\n"
+    GRAPH_END = "}"
     NODE_FORMAT = "\t{};\n"
     EDGE_FORMAT = "\t{} -> {};\n"
 
@@ -16,17 +18,6 @@ class Outputter(ResultOutputter):
     DIGIT_REGEX = re.compile( r"\d" )
     REPLACEMENT_CHARACTER = "_"
 
-    def __init__(self, filename=None):
-        self.filename = filename
-
-    def createOutput(self, dependencies):
-        output = self.generateGraph(dependencies)
-        # If a filename is set, be sure to write output to file
-        if self.filename:
-            with open(self.filename, "w") as f:
-                f.write(output)
-        return output
-
     def sanitiseNodeID(self, nodeID):
         # If ID is empty, return placeholder
         if len(nodeID) == 0:
@@ -57,16 +48,19 @@ class Outputter(ResultOutputter):
         node = self.sanitiseNodeID(dependant)
         return self.NODE_FORMAT.format(node)
 
-    def generateGraph(self, dependencies):
-        output = ""
+    def generateChunks(self, dependencies):
+        yield self.GRAPH_START
         dependants = sorted(dependencies.keys()) # sorted so results are consistent
         # Now make each dependency an edge in the graph
         for dependant in dependants:
             currentDependencies = dependencies[dependant]
             # If the module has NO dependencies,  generate a single node for it.
             if len(currentDependencies) == 0:
-                output += self.generateDependant(dependant)
+                yield self.generateDependant(dependant)
             else:
                 for dependency in currentDependencies:
-                    output += self.generateDependency(dependant, dependency)
-        return self.GRAPH_FORMAT.format(output)
+                    yield self.generateDependency(dependant, dependency)
+        yield self.GRAPH_END
+
+    def generateGraph(self, dependencies):
+        return "".join( self.generateChunks(dependencies) )
@@ -1,42 +1,31 @@
-from moduledependency.outputter import ResultOutputter
+from moduledependency.outputter import StreamingOutputter
 
 # TODO: write docstrings
 # TODO: in docstrings make sure to mention that the generated output
 # can also be used as JSON as well as Python
 
-class Outputter(ResultOutputter):
+class Outputter(StreamingOutputter):
 
-    def __init__(self, filename=None):
-        self.filename = filename
-
-    def createOutput(self, dependencies):
-        output = self.generateDictionary(dependencies)
-        # If a filename is set, be sure to write output to file
-        if self.filename:
-            with open(self.filename, "w") as f:
-                f.write(output)
-        return output
+    EXTENSION = "py"
 
     def generateDependencyList(self, dependencyList):
-        output = ""
-        for dep in sorted(dependencyList):
-            output += '"{}", '.format(dep)
-        # Remove trailing comma
-        if len(output) > 0:
-            output = output[:-2]
+        output = ", ".join( '"{}"'.format(dep) for dep in sorted(dependencyList) )
         return "[ {} ]".format(output)
 
     def generateDictionaryEntry(self, dependantModuleName, dependencyList):
         generatedList = self.generateDependencyList(dependencyList)
-        output = '"{}" : {}, '.format(dependantModuleName, generatedList)
-        return output
+        return '"{}" : {}'.format(dependantModuleName, generatedList)
 
-    def generateDictionary(self, dependencies):
-        output = ""
+    def generateChunks(self, dependencies):
+        yield "{ "
         # Sort all the dependant modules to ave consistent output
         dependantModules = sorted(dependencies.keys())
-        for depModName in dependantModules:
-            output += self.generateDictionaryEntry(depModName, dependencies[depModName])
-        if len(output) > 0:
-            output = output[:-2]
-        return "{{ {} }}".format(output)
\ No newline at end of file
+        for i, depModName in enumerate(dependantModules):
+            # Separate entries with commas
+            if i > 0:
+                yield ", "
+            yield self.generateDictionaryEntry(depModName, dependencies[depModName])
+        yield " }"
+
+    def generateDictionary(self, dependencies):
+        return "".join( self.generateChunks(dependencies) )
\ No newline at end of file
@@ -1,24 +1,15 @@
-from moduledependency.outputter import ResultOutputter
+from moduledependency.outputter import StreamingOutputter
 
 # TODO: write docstrings
 
-class Outputter(ResultOutputter):
+class Outputter(StreamingOutputter):
 
-    XML_TEMPLATE = "<xml><dependencies>{}</dependencies></xml>"
+    EXTENSION = "xml"
+    XML_START = "<xml><dependencies>"
+    XML_END = "</dependencies></xml>"
     DEPENDANT_TEMPLATE = '<dependant name="{}">{}</dependant>'
     DEPENDENCY_TEMPLATE = '<dependency>{}</dependency>'
 
-    def __init__(self, filename=None):
-        self.filename = filename
-
-    def createOutput(self, dependencies):
-        output = self.generateXML(dependencies)
-        # If a filename is set, be sure to write output to file
-        if self.filename:
-            with open(self.filename, "w") as f:
-                f.write(output)
-        return output
-
     def generateDependency(self, dependencyName):
         return self.DEPENDENCY_TEMPLATE.format(dependencyName)
 
@@ -27,9 +18,12 @@ class Outputter(ResultOutputter):
         xmlList = "".join( [ self.generateDependency(dep) for dep in sorted(dependencyList) ] )
         return self.DEPENDANT_TEMPLATE.format(dependantModuleName, xmlList)
 
-    def generateXML(self, dependencies):
-        xmlList = ""
+    def generateChunks(self, dependencies):
+        yield self.XML_START
         dependantModules = sorted(dependencies.keys())
         for dependantName in dependantModules:
-            xmlList += self.generateDependant(dependantName, dependencies[dependantName])
-        return self.XML_TEMPLATE.format(xmlList)        
\ No newline at end of file
+            yield self.generateDependant(dependantName, dependencies[dependantName])
+        yield self.XML_END
+
+    def generateXML(self, dependencies):
+        return "".join( self.generateChunks(dependencies) )        
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""Contains functionality for extracting dependencies from many files
+in parallel."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def extractChunk(extractor, filenames):
+    """Extract dependencies from a chunk of files.
+
+    Returns a list of (filename, dependencies) tuples, in the
+    same order as the given filenames. This is a module-level
+    function so it can be sent to worker processes.
+
+    Arguments:
+    extractor -- Extractor used to extract dependencies from
+                 each of the files
+    filenames -- List of paths to the files to extract from
+
+    """
+    return [ (filename, extractor.extract(filename)) for filename in filenames ]
+
+def extractCountedChunk(extractor, filenames):
+    """Extract dependencies from a chunk of files and count the work done.
+
+    Returns a tuple containing the list returned by extractChunk()
+    and the extractor's counters. Used for extractors with counters,
+    since counts made in worker processes are otherwise lost.
+
+    Arguments:
+    extractor -- Extractor used to extract dependencies from
+                 each of the files. Its counters are reset before
+                 the chunk is extracted.
+    filenames -- List of paths to the files to extract from
+
+    """
+    extractor.counters.clear()
+    return extractChunk(extractor, filenames), extractor.counters
+
+
+class ParallelFileProcessor:
+
+    """Extracts data from files using a pool of worker processes.
+
+    Can be used in place of fileprocessor.FileProcessor. Files are
+    split into chunks which are extracted by separate processes,
+    and the results are merged in order of filename so the result
+    is the same regardless of how the work was scheduled.
+
+    """
+
+    # Default number of files each worker process extracts at a time
+    DEFAULT_CHUNK_SIZE = 64
+
+    def __init__(self, searcher, filterers, extractor, jobs, chunkSize = None, cache = None, pool = None):
+        """Construct instance of ParallelFileProcessor.
+
+        Arguments:
+        searcher -- Searcher used to find the files to process
+        filterers -- List of filterers applied to the found files
+        extractor -- Extractor used to extract data from each file.
+                     Must be picklable so it can be sent to worker
+                     processes.
+        jobs -- Number of worker processes to use. Must be a
+                positive integer.
+
+        Keyword arguments:
+        chunkSize -- Number of files sent to a worker process at a
+                     time. If not provided, DEFAULT_CHUNK_SIZE is
+                     used. (default: None)
+        cache -- Instance of ExtractionCache. If provided, only
+                 files without a valid cache entry are sent to
+                 the worker processes. Entries are stored under
+                 the extractor's ENGINE. (default: None)
+        pool -- concurrent.futures.ProcessPoolExecutor which is used
+                instead of starting new worker processes, so a pool
+                can be shared by many runs. It is not shut down when
+                processing finishes. (default: None)
+
+        """
+        if not isinstance(jobs, int):
+            raise TypeError("Number of jobs must be an integer")
+        if jobs < 1:
+            raise ValueError("Number of jobs must be at least one")
+        self.searcher = searcher
+        self.filterers = filterers
+        self.extractor = extractor
+        self.jobs = jobs
+        self.chunkSize = chunkSize or self.DEFAULT_CHUNK_SIZE
+        self.cache = cache
+        self.pool = pool
+
+    def findFiles(self, directory):
+        """Return sorted list of files in directory which pass all filterers.
+
+        Arguments:
+        directory -- Path to the directory to search
+
+        """
+        filenames = self.searcher.search(directory)
+        for filterer in self.filterers:
+            filenames = filterer.filter(filenames)
+        return sorted(filenames)
+
+    def splitIntoChunks(self, filenames):
+        """Return list of lists containing at most chunkSize filenames.
+
+        Arguments:
+        filenames -- List of filenames to split
+
+        """
+        return [ filenames[i:i + self.chunkSize]
+            for i in range(0, len(filenames), self.chunkSize) ]
+
+    def process(self, directory):
+        """Extract data from all of the files in a directory.
+
+        Returns dictionary where the keys are the paths to the
+        processed files and the values are the data extracted
+        from the respective file.
+
+        Arguments:
+        directory -- Path to the directory containing the files
+                     to process
+
+        """
+        filenames = self.findFiles(directory)
+        data = {}
+        # Only extract from files that haven't been cached. Files are
+        # stat'd before they're read, so files which change before
+        # their results are stored aren't cached.
+        stats = {}
+        if self.cache:
+            uncachedFilenames = []
+            for filename in filenames:
+                cached = self.cache.lookup(filename, self.extractor.ENGINE)
+                if cached == None:
+                    uncachedFilenames.append(filename)
+                    stats[filename] = os.stat(filename)
+                else:
+                    data[filename] = cached
+        else:
+            uncachedFilenames = filenames
+        chunks = self.splitIntoChunks(uncachedFilenames)
+        if len(chunks) == 0:
+            return data
+        if self.pool:
+            self.extractChunks(self.pool, chunks, data, stats)
+        else:
+            # Don't start more processes than there are chunks to process
+            with ProcessPoolExecutor(max_workers=min(self.jobs, len(chunks))) as pool:
+                self.extractChunks(pool, chunks, data, stats)
+        # Rebuild dictionary so cached and extracted files are merged
+        # in the same order as the files were found
+        return { filename : data[filename] for filename in filenames }
+
+    def extractChunks(self, pool, chunks, data, stats):
+        """Extract data from chunks of files in a pool of worker processes.
+
+        Arguments:
+        pool -- concurrent.futures.Executor the chunks are extracted in
+        chunks -- List of lists of paths to the files to extract from
+        data -- Dictionary which the data extracted from each file
+                is added to
+        stats -- Dictionary mapping each file to the result of
+                 os.stat() on it before it was read, which is given
+                 to the cache when the file's data is stored. Empty
+                 if there is no cache.
+
+        """
+        # Extractors with counters send their counts back so they
+        # can be added to the counters of the original extractor
+        counters = getattr(self.extractor, "counters", None)
+        # map() returns results in the order chunks were given,
+        # so the merged dictionary is always built in the same order
+        extractors = [ self.extractor ] * len(chunks)
+        if counters != None:
+            chunkResults = []
+            for results, chunkCounters in pool.map(extractCountedChunk, extractors, chunks):
+                counters.update(chunkCounters)
+                chunkResults.append(results)
+        else:
+            chunkResults = pool.map(extractChunk, extractors, chunks)
+        for results in chunkResults:
+            for filename, extracted in results:
+                data[filename] = extracted
+                if self.cache:
+                    self.cache.store(filename, extracted, self.extractor.ENGINE, stats[filename])
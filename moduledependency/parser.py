@@ -1,6 +1,23 @@
 """Contains functionality for parsing tokens to identify module imports and dependencies."""
 
-import hashlib
+import sys
+
+# Contexts an import can be made in. Only the AST engine finds the
+# context of imports, so imports found by the ImportParser have none.
+# Imports made at the top level of a module (including inside class
+# bodies and "if" statements) run when the module is imported.
+CONTEXT_TOP_LEVEL = "top-level"
+# Imports inside a "try" statement or its "except" clauses, which
+# usually guard against optional modules being missing
+CONTEXT_TRY = "try"
+# Imports inside a function, which only run when it's called
+CONTEXT_FUNCTION = "function"
+# Imports inside "if TYPE_CHECKING:", which never run
+CONTEXT_TYPE_CHECKING = "type-checking"
+# Every context, with contexts that take precedence when nested later
+IMPORT_CONTEXTS = ( CONTEXT_TOP_LEVEL, CONTEXT_TRY, CONTEXT_FUNCTION, CONTEXT_TYPE_CHECKING )
+# Contexts of imports which don't run when their module is imported
+DEFERRED_CONTEXTS = ( CONTEXT_FUNCTION, CONTEXT_TYPE_CHECKING )
 
 class ParseError(ValueError):
 
@@ -32,9 +49,23 @@ class ParseError(ValueError):
 
 class ParsedImport:
 
-	"""Class represents a single import made a module."""
+	"""Class represents a single import made a module.
 
-	def __init__(self, moduleName, relative):
+	Instances are immutable, so their hash is computed once on
+	construction. Module names are interned, since the same names
+	are imported by many modules of a project.
+
+	Imports can also store where they were made: the context of
+	the import statement (one of IMPORT_CONTEXTS) and its line and
+	column. These are not compared when checking imports for
+	equality, so the same import made twice in a module is only
+	stored once.
+
+	"""
+
+	__slots__ = ("moduleName", "relative", "hashValue", "context", "line", "column")
+
+	def __init__(self, moduleName, relative, context = None, line = None, column = None):
 		"""Construct instance of ParsedImport.
 
 		Arguments:
@@ -48,14 +79,48 @@ class ParsedImport:
 					to the importing module's location or if it's
 					an absolute import.
 
+		Keyword arguments:
+		context -- Context the import was made in, one of
+				   IMPORT_CONTEXTS. If None, the context is
+				   unknown. (default: None)
+		line -- Line number of the import statement, starting
+				from 1. If None, it is unknown. (default: None)
+		column -- Number of characters into the line the import
+				  statement starts, starting from 1. If None, it
+				  is unknown. (default: None)
+
 		"""
-		self.moduleName = moduleName
-		self.relative = relative
+		if context != None and not context in IMPORT_CONTEXTS:
+			raise ValueError("Invalid import context '{}'".format(context))
+		object.__setattr__(self, "moduleName", sys.intern(moduleName))
+		object.__setattr__(self, "relative", relative)
+		object.__setattr__(self, "hashValue", hash( (self.moduleName, bool(relative)) ))
+		object.__setattr__(self, "context", context)
+		object.__setattr__(self, "line", line)
+		object.__setattr__(self, "column", column)
+
+	def __setattr__(self, name, value):
+		"""Raise AttributeError, since imports cannot be modified."""
+		raise AttributeError("ParsedImport objects are immutable")
+
+	def __reduce__(self):
+		"""Return arguments used to reconstruct object when it is pickled."""
+		return (ParsedImport, (self.moduleName, self.relative, self.context, self.line, self.column))
 
 	def isRelative(self):
 		"""Return True if the import is relative to current module."""
 		return self.relative
 
+	def isDeferred(self):
+		"""Return True if the import doesn't run when the importing module is imported.
+
+		Imports inside functions only run when the function is called,
+		and imports inside "if TYPE_CHECKING:" never run. Imports whose
+		context is unknown are assumed to run at import time.
+
+		"""
+		return self.context in DEFERRED_CONTEXTS
+
 	def __repr__(self):
 		"""Return human-readable representation of object."""
 		return str(self)
@@ -70,6 +135,8 @@ class ParsedImport:
 
 	def __eq__(self, other):
 		"""Overload of equality operator for comparing imports."""
+		if self is other:
+			return True
 		return (self.moduleName == other.moduleName and self.relative == other.relative)
 
 	def __ne__(self, other):
@@ -77,20 +144,10 @@ class ParsedImport:
 		return (self.moduleName != other.moduleName or self.relative != other.relative)
 
 	def __hash__(self):
-		"""Return SHA-1 hash of this object.
+		"""Return hash of this object, computed when it was constructed.
 
 		Done so ParsedImport objects can be stored in sets."""
-		
-		# Convert object to series of bytes (string for name and byte for relative flag)
-		data = bytearray(self.moduleName, encoding="utf-8")
-		if self.relative:
-			data.append(1)
-		else:
-			data.append(0)
-		# Hash the raw byte data
-		hasher = hashlib.sha1()
-		hasher.update(data)
-		return int.from_bytes( hasher.digest(), byteorder="little" )
+		return self.hashValue
 
 
 class ImportParser:
@@ -239,9 +296,18 @@ class ImportParser:
 		importedObjects = []
 		importedObjects.append( self.parseDottedIdentifier() )
 		while self.currentToken() and self.currentToken().type == ",":
-			self.nextToken() # skip comma operator
+			token = self.nextToken() # skip comma operator
+			# A trailing comma may end the list, either at the end of
+			# the tokens or before a closing bracket (e.g. "(a, b,)").
+			# The bracket is skipped so the objects of the next
+			# statement aren't added to this list.
+			if not token:
+				break
+			elif token.value == ")":
+				self.nextToken()
+				break
 			# If the next token is ALSO a comma, skip to the one after that
-			if self.currentToken().type == ",":
+			elif token.type == ",":
 				self.nextToken()
 			# Otherwise, try and get the next dotted identifier in the list.
 			else:		
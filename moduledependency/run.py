@@ -6,11 +6,47 @@ import os
 from .cli import ArgumentProcessor
 from .executor import Executor
 from .outputter import OutputterFactory
+from .stats import PipelineStatistics
 from . import MODULEDEPENDENCY_DIR
 
 # Directory which stores all the outputters
 OUTPUTTER_DIRECTORY = os.path.join(MODULEDEPENDENCY_DIR, "outputters")
 
+def printModules(heading, moduleNames):
+    """Print heading followed by the given module names, one per line, in sorted order."""
+    print(heading)
+    for name in sorted(moduleNames):
+        print("    {}".format(name))
+
+def printQueries(argProcessor, dependencies):
+    """Print the modules found by the transitive queries given as arguments.
+
+    A KeyError is raised if a queried module is not in the dependencies.
+
+    """
+    if argProcessor.dependsOn:
+        printModules("modules which depend on '{}':".format(argProcessor.dependsOn),
+            dependencies.getTransitiveDependants(argProcessor.dependsOn))
+    if argProcessor.requiredBy:
+        printModules("modules required by '{}':".format(argProcessor.requiredBy),
+            dependencies.getTransitiveDependencies(argProcessor.requiredBy))
+
+def printAnalyses(argProcessor, executor):
+    """Print the import cycles and import weights found by the executor, if they were asked for."""
+    if argProcessor.getOption("cycles") != None:
+        cycles = executor.condensation.getCycles()
+        print("{} import cycle(s) found:".format(len(cycles)))
+        for cycle in cycles:
+            print("    {}".format(", ".join(cycle)))
+    if argProcessor.weightCount:
+        print("modules which load the most code when imported:")
+        print(executor.weights.format(argProcessor.weightCount))
+
+def printStatistics(statistics):
+    """Print statistics of a run to standard error, so they don't mix with the output."""
+    print("statistics:", file=sys.stderr)
+    print(statistics.format(), file=sys.stderr)
+
 def run():
     """Main entrypoint into moduledependency program."""
     # Process command line arguments
@@ -37,10 +73,72 @@ def run():
         executor.setMaximumDepth(argProcessor.maxDepth)
     except KeyError:
         pass
+    executor.setJobs(argProcessor.jobs)
+    executor.setIoConcurrency(argProcessor.ioConcurrency)
+    executor.setMemoryMapping(argProcessor.getOption("mmap") != None)
+    if argProcessor.getOption("engine"):
+        try:
+            executor.setEngine(argProcessor.getOption("engine"))
+        except ValueError as e:
+            sys.exit(str(e))
+    executor.setImportTimeOnly(argProcessor.getOption("import-time-only") != None)
+    if argProcessor.getOption("cache-dir"):
+        executor.setCacheDirectory(argProcessor.getOption("cache-dir"),
+            argProcessor.getOption("cache-hash") != None)
+    if argProcessor.getOption("stats") != None:
+        executor.setStatistics(PipelineStatistics())
+
+    # Only print the affected modules, so they can be piped to other tools
+    if argProcessor.changedFiles != None:
+        for name in executor.findAffectedModules(argProcessor.projectDirectory, argProcessor.changedFiles):
+            print(name)
+        if executor.statistics:
+            printStatistics(executor.statistics)
+        return
+
+    reportCycles = argProcessor.getOption("cycles") != None
+    condense = argProcessor.getOption("condense") != None
+    executor.setCycleDetection(reportCycles or condense, condense)
+    executor.setWeightAnalysis(argProcessor.weightCount != None)
 
     if not argProcessor.getOption("quiet"):
         print("starting dependency extraction...")
     # Search for dependencies in the specified directory
-    dependencies = executor.execute(argProcessor.projectDirectory)
+    if argProcessor.watchInterval:
+        try:
+            executor.watch(argProcessor.projectDirectory, argProcessor.watchInterval, print)
+        except KeyboardInterrupt:
+            pass
+    elif argProcessor.projectDirectories != None:
+        outputDirectory = argProcessor.getOption("output-dir")
+        # Output is only written to the directory if there's an outputter
+        writingToDirectory = outputDirectory != None and executor.outputter != None
+        reportsRequested = (argProcessor.dependsOn or argProcessor.requiredBy or reportCycles or
+            argProcessor.weightCount)
+        def reportProject(projectDirectory, dependencies):
+            if not reportsRequested:
+                return
+            # Unless output is written to the directory, the executor
+            # has already written the header before the project's output
+            if writingToDirectory:
+                print(Executor.PROJECT_HEADER.format(projectDirectory))
+            try:
+                printQueries(argProcessor, dependencies)
+            except KeyError as e:
+                # Queried module may only be in some of the projects
+                print("Module {} was not found in the project's dependencies".format(e))
+            printAnalyses(argProcessor, executor)
+        executor.executeProjects(argProcessor.projectDirectories, outputDirectory, reportProject)
+    else:
+        dependencies = executor.execute(argProcessor.projectDirectory)
+        try:
+            printQueries(argProcessor, dependencies)
+        except KeyError as e:
+            sys.exit("Module {} was not found in the project's dependencies".format(e))
+        printAnalyses(argProcessor, executor)
     if not argProcessor.getOption("quiet"):
-        print("...dependency extraction complete!")	
\ No newline at end of file
+        print("...dependency extraction complete!")
+        if executor.cache:
+            print("cache: {} hits, {} misses".format(executor.cache.hits, executor.cache.misses))
+    if executor.statistics:
+        printStatistics(executor.statistics)	
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""Contains functionality for recording how long each stage of a
+dependency search takes and how much work it does."""
+
+import time
+import collections
+import contextlib
+
+
+class PipelineStatistics:
+
+    """Wall and CPU time taken by each stage of a dependency search, and counters of the work done.
+
+    Stages are timed with timeStage(), and the times of a stage
+    which runs more than once are added together. Counters are
+    plain integers stored in a collections.Counter, so counters
+    from other processes can be merged with update().
+
+    Observers are functions called whenever a stage finishes, so the
+    statistics can be sent somewhere else (e.g. a metrics system)
+    while a search is running. Each observer is called with the
+    name of the stage, the wall and CPU time it took in seconds and
+    the PipelineStatistics instance, whose counters are up to date
+    with every stage that has finished.
+
+    """
+
+    # Order stages are reported in. Stages not listed here are
+    # reported after these, in the order they first ran.
+    STAGE_ORDER = ( "walk", "extract", "resolve", "whitelist", "weights", "prune", "cycles", "output" )
+
+    def __init__(self):
+        """Construct instance of PipelineStatistics."""
+        # Maps each stage to a list containing its wall and CPU time
+        self.stages = {}
+        self.counters = collections.Counter()
+        self.observers = []
+
+    def addObserver(self, observer):
+        """Add function called with (stage, wallTime, cpuTime, statistics) whenever a stage finishes."""
+        self.observers.append(observer)
+
+    def removeObserver(self, observer):
+        """Stop calling an observer added with addObserver().
+
+        A ValueError is raised if the observer was not added.
+
+        """
+        self.observers.remove(observer)
+
+    @contextlib.contextmanager
+    def timeStage(self, stage):
+        """Return context manager which records the time taken by the code inside it as a stage.
+
+        The time is recorded even if the code raises an exception.
+
+        Arguments:
+        stage -- Name of the stage
+
+        """
+        wallStart = time.perf_counter()
+        cpuStart = time.process_time()
+        try:
+            yield
+        finally:
+            self.recordStage(stage, time.perf_counter() - wallStart, time.process_time() - cpuStart)
+
+    def recordStage(self, stage, wallTime, cpuTime):
+        """Add time taken by a stage and notify the observers.
+
+        Arguments:
+        stage -- Name of the stage
+        wallTime -- Number of seconds of wall time the stage took
+        cpuTime -- Number of seconds of CPU time the stage took
+
+        """
+        times = self.stages.setdefault(stage, [ 0.0, 0.0 ])
+        times[0] += wallTime
+        times[1] += cpuTime
+        for observer in self.observers:
+            observer(stage, wallTime, cpuTime, self)
+
+    def count(self, counter, amount = 1):
+        """Increase a counter.
+
+        Arguments:
+        counter -- Name of the counter
+
+        Keyword arguments:
+        amount -- Amount to increase the counter by. (default: 1)
+
+        """
+        self.counters[counter] += amount
+
+    def update(self, counters):
+        """Add counters from a dictionary mapping counter names to amounts."""
+        self.counters.update(counters)
+
+    def getStages(self):
+        """Return list of the names of the stages that have run, in the order they are reported."""
+        ordered = [ stage for stage in self.STAGE_ORDER if stage in self.stages ]
+        return ordered + [ stage for stage in self.stages if not stage in self.STAGE_ORDER ]
+
+    def getWallTime(self, stage = None):
+        """Return number of seconds of wall time taken by a stage, or by every stage if None."""
+        if stage == None:
+            return sum( times[0] for times in self.stages.values() )
+        return self.stages[stage][0] if stage in self.stages else 0.0
+
+    def getCpuTime(self, stage = None):
+        """Return number of seconds of CPU time taken by a stage, or by every stage if None."""
+        if stage == None:
+            return sum( times[1] for times in self.stages.values() )
+        return self.stages[stage][1] if stage in self.stages else 0.0
+
+    def toDict(self):
+        """Return statistics as a dictionary which can be written as JSON."""
+        return {
+            "stages" : { stage : { "wall" : times[0], "cpu" : times[1] } for stage, times in self.stages.items() },
+            "counters" : dict(self.counters)
+        }
+
+    def format(self):
+        """Return the times of every stage and every counter as a human readable table."""
+        lines = [ "{:<12}{:>12}{:>12}".format("stage", "wall (s)", "cpu (s)") ]
+        for stage in self.getStages():
+            lines.append( "{:<12}{:>12.4f}{:>12.4f}".format(stage, *self.stages[stage]) )
+        lines.append( "{:<12}{:>12.4f}{:>12.4f}".format("total", self.getWallTime(), self.getCpuTime()) )
+        for counter in sorted(self.counters):
+            lines.append( "{:<24}{:>12}".format(counter, self.counters[counter]) )
+        return "\n".join(lines)
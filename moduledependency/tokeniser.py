@@ -18,7 +18,15 @@ for delimeter in VALID_STRING_DELIMITERS:
 
 class Token:
 
-	"""Represents a single token."""
+	"""Represents a single token.
+
+	Tokens are immutable, which allows tokenisers to share a single
+	instance between every occurrence of the same token in a source.
+	__slots__ is used so each instance is as small as possible.
+
+	"""
+
+	__slots__ = ("type", "value")
 
 	def __init__(self, tokenType, value = None):
 		"""Construct a new instance of Token.
@@ -37,11 +45,15 @@ class Token:
 		if not tokenType in VALID_TOKEN_TYPES:
 			raise ValueError("Invalid token type '{}' given".format(tokenType))
 
-		self.type = tokenType
+		object.__setattr__(self, "type", tokenType)
 		if value:
-			self.value = value
+			object.__setattr__(self, "value", value)
 		else:
-			self.value = self.type
+			object.__setattr__(self, "value", tokenType)
+
+	def __setattr__(self, name, value):
+		"""Raise AttributeError, since tokens cannot be modified."""
+		raise AttributeError("Token objects are immutable")
 
 	def __eq__(self, other):
 		"""Return True if both instances of token have equivalent types and values.
@@ -61,6 +73,10 @@ class Token:
 		"""
 		return (self.type != other.type or self.value != other.value)
 
+	def __hash__(self):
+		"""Return hash of token's type and value."""
+		return hash( (self.type, self.value) )
+
 	def __repr__(self):
 		"""Return human-readable represetation of Token instance."""
 		return str(self)
@@ -70,6 +86,13 @@ class Token:
 		return "({}, {})".format(self.type, self.value)
 
 
+# Tokens whose value is always the same for their type. These are
+# shared by every tokeniser and every source tokenised.
+SHARED_TOKENS = {
+	value : Token(value) for value in ("from", "import", ".", ",", "*")
+}
+
+
 class Tokeniser:
 
 	"""Class used to tokenise textual Python source code.
@@ -91,6 +114,9 @@ class Tokeniser:
 		self.tokens = []
 		self.source = ""
 		self.index = 0
+		# Tokens created for the current source, keyed by value, so
+		# repeated identifiers and characters share a single token
+		self.tokenCache = {}
 
 	def currentChar(self):
 		"""Return current character from source, or None if index is out of bounds."""
@@ -175,7 +201,23 @@ class Tokeniser:
 		value -- Value the newly added token should have
 
 		"""
-		self.tokens.append( Token(tokenType, value) )
+		self.tokens.append( self.getToken(tokenType, value) )
+
+	def getToken(self, tokenType, value):
+		"""Return token with given type and value, reusing existing tokens if possible.
+
+		Arguments:
+		tokenType -- Type the token should have
+		value -- Value the token should have
+
+		"""
+		if value in SHARED_TOKENS:
+			return SHARED_TOKENS[value]
+		# Identifiers and "other" tokens never have the same value,
+		# so the type doesn't need to be part of the key
+		if not value in self.tokenCache:
+			self.tokenCache[value] = Token(tokenType, value)
+		return self.tokenCache[value]
 
 	def addTokenFromBuffer(self, buff):
 		"""Look into contents of buffer and use it to construct a new token.
@@ -194,19 +236,14 @@ class Tokeniser:
 
 		# Get contents of buffer as a string
 		bufferStr = "".join(buff)
-		# Check if buffer is a keyword we care about
-		if bufferStr == "from":
-			self.tokens.append( Token("from") )
-		elif bufferStr == "import":
-			self.tokens.append( Token("import") )
+		# Check if buffer is a valid identifier. Keywords we care
+		# about are handled by getToken().
+		if self.IDENTIFIER_REGEX.search(bufferStr):
+			tokenType = "identifier"
 		else:
-			# Check if buffer is a valid identifier.
-			if self.IDENTIFIER_REGEX.search(bufferStr):
-				tokenType = "identifier"
-			else:
-				tokenType = "other"
-			# Add token with the found type and make sure to clear the buffer
-			self.tokens.append( Token(tokenType, bufferStr) )
+			tokenType = "other"
+		# Add token with the found type and make sure to clear the buffer
+		self.tokens.append( self.getToken(tokenType, bufferStr) )
 		# Clear buffer
 		del buff[:]
 
@@ -251,6 +288,111 @@ class Tokeniser:
 			match = END_OF_STRING_REGEXES[startingChar].search(remainingString)
 			if match:
 				self.index += match.end()
-			# If an occurrence was not found, we've reached the end of the string	
+			# If an occurrence was not found, we've reached the end of the string
 			else:
-				self.index = len(self.source)
\ No newline at end of file
+				self.index = len(self.source)
+
+
+class RegexTokeniser:
+
+	"""Faster alternative to Tokeniser built on a single compiled regex.
+
+	Produces exactly the same token stream as Tokeniser, but scans
+	whole runs of whitespace, comments and word characters with one
+	regex match each instead of stepping through the source one
+	character at a time.
+
+	"""
+
+	# Master regex which matches the next lexical unit of the source.
+	# The name of the group which matched determines how the unit is
+	# turned into tokens. Word characters are matched with \w, which
+	# accepts exactly the characters Tokeniser accepts with
+	# str.isalnum() or "_".
+	TOKEN_REGEX = re.compile(r"""
+		(?P<whitespace>[ \n\t\r]+)
+		|(?P<comment>\#[^\n]*)
+		|(?P<quote>['"])
+		|(?P<operator>[.,*])
+		|(?P<word>\w+)
+		|(?P<other>.)
+	""", re.VERBOSE | re.DOTALL)
+
+	def tokenise(self, source):
+		"""Return list of Token objects by tokensing Python source code.
+
+		Arguments:
+		source -- Python source code to tokenise
+
+		"""
+		if not isinstance(source, str):
+			raise TypeError("Source to tokenise must be a string")
+
+		tokens = []
+		# Tokens created for this source, keyed by value, so repeated
+		# identifiers and characters share a single token
+		tokenCache = {}
+		match = self.TOKEN_REGEX.match
+		length = len(source)
+		index = 0
+		while index < length:
+			unit = match(source, index)
+			kind = unit.lastgroup
+			index = unit.end()
+			if kind == "word":
+				word = unit.group()
+				if not word in tokenCache:
+					tokenCache[word] = self.createWordToken(word)
+				tokens.append( tokenCache[word] )
+			elif kind == "operator":
+				tokens.append( SHARED_TOKENS[unit.group()] )
+			elif kind == "quote":
+				index = self.findEndOfString(source, unit.start())
+			elif kind == "other":
+				value = unit.group()
+				if not value in tokenCache:
+					tokenCache[value] = Token("other", value)
+				tokens.append( tokenCache[value] )
+			# Whitespace and comments do not produce any tokens
+
+		return tokens
+
+	def createWordToken(self, word):
+		"""Return token for a run of word characters.
+
+		Arguments:
+		word -- String containing the characters scanned
+
+		"""
+		if word in SHARED_TOKENS:
+			return SHARED_TOKENS[word]
+		elif Tokeniser.IDENTIFIER_REGEX.search(word):
+			return Token("identifier", word)
+		else:
+			return Token("other", word)
+
+	def findEndOfString(self, source, start):
+		"""Return index of the first character after a string literal.
+
+		Mirrors Tokeniser.skipString() so that both tokenisers
+		agree on where string literals end, even for unterminated
+		or unusually escaped literals.
+
+		Arguments:
+		source -- Python source code being tokenised
+		start -- Index of the first quote character of the literal
+
+		"""
+		# Check if the literal is started by a triple quote
+		delimiter = source[start:start + 3]
+		if not delimiter in VALID_STRING_DELIMITERS:
+			delimiter = source[start]
+		# Immediately closed literals (empty strings)
+		if len(delimiter) == 1 and source[start + 1:start + 2] == delimiter:
+			return start + 2
+		match = END_OF_STRING_REGEXES[delimiter].search(source, start + 1)
+		if match:
+			return match.end()
+		# If no end was found, the literal runs to the end of the source
+		else:
+			return len(source)
\ No newline at end of file
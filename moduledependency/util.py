@@ -1,6 +1,12 @@
 """Contains miscellaneous functionality used by more than one module."""
 
 import os
+import codecs
+import collections
+
+# Maps names of encodings to whether they are ASCII compatible, so
+# each encoding is only checked once
+asciiCompatibleEncodings = {}
 
 def getProjectRoot(projectDirectory):
 	"""Return name of root project package using the project's directory.
@@ -20,3 +26,103 @@ def getProjectRoot(projectDirectory):
 	# If not root, just return last path component
 	else:
 		return components[-1]
+
+def isAsciiCompatible(encoding):
+	"""Return True if text in an encoding can be searched for ASCII characters without decoding it.
+
+	This is the case if every ASCII character is encoded as its own
+	byte and no other character's encoding contains an ASCII byte,
+	as in UTF-8 and single-byte encodings such as Latin-1. Multi-byte
+	encodings like Shift_JIS, whose characters may contain the byte
+	of a backslash or quote, are not ASCII compatible.
+
+	A LookupError is raised if the encoding is unknown.
+
+	Arguments:
+	encoding -- Name of the encoding
+
+	"""
+	name = codecs.lookup(encoding).name
+	if name in ("utf-8", "utf-8-sig"):
+		return True
+	if not name in asciiCompatibleEncodings:
+		asciiBytes = bytes(range(128))
+		try:
+			compatible = (asciiBytes.decode(name) == asciiBytes.decode("ascii"))
+		except UnicodeDecodeError:
+			compatible = False
+		# Decoders of single-byte encodings decode every byte on its
+		# own, instead of waiting for the rest of a multi-byte character
+		if compatible:
+			decoder = codecs.getincrementaldecoder(name)(errors="replace")
+			compatible = all( len(decoder.decode(bytes([byte]))) > 0 for byte in range(128, 256) )
+		asciiCompatibleEncodings[name] = compatible
+	return asciiCompatibleEncodings[name]
+
+
+class LRUCache:
+
+	"""Dictionary-like cache which holds a bounded number of entries.
+
+	When the cache is full, storing a new entry discards the
+	least recently used one.
+
+	"""
+
+	def __init__(self, maxSize):
+		"""Construct instance of LRUCache.
+
+		Arguments:
+		maxSize -- Maximum number of entries to hold. Must be a
+				   positive integer.
+
+		"""
+		if not isinstance(maxSize, int):
+			raise TypeError("Maximum size of cache must be an integer")
+		if maxSize < 1:
+			raise ValueError("Maximum size of cache must be at least one")
+		self.maxSize = maxSize
+		self.entries = collections.OrderedDict()
+
+	def get(self, key, default = None):
+		"""Return value stored for key, or default if the key is not cached.
+
+		Arguments:
+		key -- Key of the entry to get
+
+		Keyword arguments:
+		default -- Value to return if the key is not cached.
+				   (default: None)
+
+		"""
+		try:
+			value = self.entries[key]
+		except KeyError:
+			return default
+		self.entries.move_to_end(key)
+		return value
+
+	def put(self, key, value):
+		"""Store value for key, discarding the least recently used entry if full.
+
+		Arguments:
+		key -- Key of the entry to store
+		value -- Value to store
+
+		"""
+		self.entries[key] = value
+		self.entries.move_to_end(key)
+		if len(self.entries) > self.maxSize:
+			self.entries.popitem(last=False)
+
+	def clear(self):
+		"""Remove all entries from the cache."""
+		self.entries.clear()
+
+	def __contains__(self, key):
+		"""Return True if the key is cached, without marking it as used."""
+		return key in self.entries
+
+	def __len__(self):
+		"""Return number of entries in the cache."""
+		return len(self.entries)
@@ -0,0 +1,135 @@
+"""Contains functionality for walking a project's directory tree once and
+finding both its modules and the names of its packages/modules."""
+
+import os
+
+from . import util
+
+
+class ProjectWalker:
+
+    """Walks a project's directory tree with os.scandir().
+
+    A single walk finds the paths of the project's Python files and
+    the names of all of its packages and modules, so the same walk
+    can feed both the extractor and the whitelist. Names are computed
+    from the names of the enclosing directories as the walk descends,
+    using the same rules as WhitelistGenerator.getPackageName().
+
+    Instances can also be used as the searcher of a FileProcessor.
+
+    """
+
+    def __init__(self):
+        """Construct instance of ProjectWalker."""
+        self.projectDirectory = None
+        self.modulePaths = []
+        self.packageNames = []
+
+    def walk(self, projectDirectory):
+        """Yield every entry in a project along with its package/module name.
+
+        Yields (entry, name) tuples, where entry is the os.DirEntry of
+        a file or directory. name is the full name of the package or
+        module the entry represents, or None if the entry cannot be a
+        package or module (e.g. a file with an extension other than
+        ".py"). Entries of each directory are yielded in sorted order.
+
+        Arguments:
+        projectDirectory -- *Absolute* path to the project to walk
+
+        """
+        if not os.path.isdir(projectDirectory):
+            raise IOError("Directory '{}' does not exist".format(projectDirectory))
+        rootPackage = util.getProjectRoot(projectDirectory)
+
+        # Stack of directories still to scan, along with the name
+        # their contents are prefixed with ("" for the project root)
+        directories = [ (projectDirectory, "") ]
+        while len(directories) > 0:
+            directory, prefix = directories.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            # Directory may have been deleted or be unreadable
+            except OSError:
+                continue
+
+            subdirectories = []
+            for entry in entries:
+                isDirectory = entry.is_dir(follow_symlinks=False)
+                if isDirectory:
+                    # Contents are named after the directory's full name,
+                    # even if the directory itself is not a valid package
+                    subdirectories.append( (entry.path, self.joinName(prefix, entry.name)) )
+                yield entry, self.getName(rootPackage, prefix, entry.name)
+            # Push in reverse so directories are scanned in sorted order
+            directories.extend(reversed(subdirectories))
+
+    def joinName(self, prefix, name):
+        """Return name relative to the project root with another component appended."""
+        if len(prefix) > 0:
+            return "{}.{}".format(prefix, name)
+        else:
+            return name
+
+    def getName(self, rootPackage, prefix, filename):
+        """Return full package/module name of a file or directory, or None if it has none.
+
+        Arguments:
+        rootPackage -- Name of the project's root package
+        prefix -- Name of the enclosing directory relative to the
+                  project root ("" for the project root)
+        filename -- Name of the file or directory
+
+        """
+        stem, extension = os.path.splitext(filename)
+        if len(extension) > 0 and extension != ".py":
+            return None
+        # __init__ is not added since that is the root of a package
+        if filename == "__init__.py":
+            relativeName = prefix
+        else:
+            relativeName = self.joinName(prefix, stem)
+        if len(relativeName) > 0:
+            return "{}.{}".format(rootPackage, relativeName)
+        else:
+            return rootPackage
+
+    def scan(self, projectDirectory):
+        """Walk a project and store the paths of its modules and the names of its packages/modules.
+
+        After scanning, modulePaths contains the absolute paths to
+        every Python file in the project and packageNames contains
+        the names of all of its packages and modules.
+
+        Arguments:
+        projectDirectory -- *Absolute* path to the project to scan
+
+        """
+        modulePaths = []
+        packageNames = []
+        for entry, name in self.walk(projectDirectory):
+            if name == None:
+                continue
+            packageNames.append(name)
+            if entry.name.endswith(".py") and entry.is_file():
+                modulePaths.append( os.path.abspath(entry.path) )
+        self.projectDirectory = projectDirectory
+        self.modulePaths = modulePaths
+        self.packageNames = packageNames
+
+    def search(self, directory):
+        """Return list of paths to the Python files in a directory.
+
+        The directory is only walked if it isn't the directory
+        scanned last, so a walker can be used as a FileProcessor's
+        searcher after the project has already been scanned.
+
+        Arguments:
+        directory -- *Absolute* path to the directory to search
+
+        """
+        if directory != self.projectDirectory:
+            self.scan(directory)
+        return list(self.modulePaths)
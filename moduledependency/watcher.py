@@ -0,0 +1,342 @@
+"""Contains functionality for keeping a project's dependencies up to date
+as its files change."""
+
+import os
+
+from .dependency_extractor import ModuleDependencyExtractor
+from .import_resolver import ImportResolver
+from .whitelist import Whitelist, WhitelistApplier
+from .walker import ProjectWalker
+from .depth_pruner import DepthPruner
+
+
+class DependencyDiff:
+
+    """Describes how a project's dependencies changed between two points in time."""
+
+    def __init__(self, addedModules, removedModules, addedEdges, removedEdges, errors = None):
+        """Construct instance of DependencyDiff.
+
+        Arguments:
+        addedModules -- Collection of names of modules which were added
+        removedModules -- Collection of names of modules which were removed
+        addedEdges -- Collection of (dependant, dependency) tuples
+                      for dependencies which were added
+        removedEdges -- Collection of (dependant, dependency) tuples
+                        for dependencies which were removed
+
+        Keyword arguments:
+        errors -- Collection of (path, message) tuples for files which
+                  couldn't be extracted (default: None)
+
+        """
+        self.addedModules = sorted(addedModules)
+        self.removedModules = sorted(removedModules)
+        self.addedEdges = sorted(addedEdges)
+        self.removedEdges = sorted(removedEdges)
+        self.errors = sorted(errors or [])
+
+    def isEmpty(self):
+        """Return True if nothing changed and no errors occurred, and False otherwise."""
+        return not (self.addedModules or self.removedModules or
+            self.addedEdges or self.removedEdges or self.errors)
+
+    def __repr__(self):
+        """Return human-readable representation of object."""
+        return str(self)
+
+    def __str__(self):
+        """Return diff as lines prefixed with "+" for additions and "-" for removals."""
+        lines = [ "- {}".format(name) for name in self.removedModules ]
+        lines += [ "+ {}".format(name) for name in self.addedModules ]
+        lines += [ "- {} -> {}".format(*edge) for edge in self.removedEdges ]
+        lines += [ "+ {} -> {}".format(*edge) for edge in self.addedEdges ]
+        lines += [ "! {}: {}".format(*error) for error in self.errors ]
+        return "\n".join(lines)
+
+
+class DependencyWatcher:
+
+    """Keeps the dependencies of a project in memory and updates them as files change.
+
+    Polls the project directory for Python files that were added,
+    changed or deleted. Only those files are extracted again, and
+    only the modules they affect are resolved, whitelisted and
+    pruned again.
+
+    """
+
+    def __init__(self, projectDirectory, maximumDepth = None, extractor = None):
+        """Construct instance of DependencyWatcher.
+
+        Arguments:
+        projectDirectory -- Path to the root directory of the
+                            project to watch
+
+        Keyword arguments:
+        maximumDepth -- Depth to prune dependencies to. If None,
+                        dependencies are not pruned. (default: None)
+        extractor -- Extractor used to extract dependencies from
+                     files. If not provided, a ModuleDependencyExtractor
+                     is used. (default: None)
+
+        """
+        if not os.path.isdir(projectDirectory):
+            raise IOError("'{}' is not a valid directory".format(projectDirectory))
+        self.projectDirectory = os.path.abspath(projectDirectory)
+        self.maximumDepth = maximumDepth
+        self.extractor = extractor or ModuleDependencyExtractor()
+        self.resolver = ImportResolver(self.projectDirectory)
+        self.walker = ProjectWalker()
+        self.whitelistApplier = WhitelistApplier()
+        self.pruner = DepthPruner()
+
+        # Modification time and size of each file when last scanned
+        self.fileStates = {}
+        # Names of all packages/modules found by the last scan
+        self.scannedNames = []
+        # Full module name of each file
+        self.moduleNames = {}
+        # Dependencies of each stage of the pipeline
+        self.extracted = {}
+        self.resolved = {}
+        self.whitelist = Whitelist()
+        self.filtered = {}
+        self.pruned = {}
+        # Names of the modules which are merged into each pruned module
+        self.prunedSources = {}
+        # State and error message of each file which couldn't be
+        # extracted, so each error is only reported once
+        self.errors = {}
+
+    def scan(self):
+        """Return dictionary mapping path of every Python file in project to its state.
+
+        The state of a file is a tuple containing its modification
+        time and size. The names of the project's packages/modules
+        found by the same walk are stored in scannedNames.
+
+        """
+        states = {}
+        names = []
+        for entry, name in self.walker.walk(self.projectDirectory):
+            if name == None:
+                continue
+            names.append(name)
+            if entry.name.endswith(".py") and entry.is_file():
+                try:
+                    stat = entry.stat()
+                # File may have been deleted since it was listed
+                except OSError:
+                    continue
+                states[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        self.scannedNames = names
+        return states
+
+    def getDependencies(self):
+        """Return current dependencies of the project.
+
+        Returns dictionary where the keys are the packages/modules
+        in the project and the values are packages/modules that
+        the respective key imported.
+
+        """
+        if self.maximumDepth != None:
+            return self.pruned
+        else:
+            return self.filtered
+
+    def start(self, extracted = None):
+        """Compute the dependencies of the whole project and return them.
+
+        Keyword arguments:
+        extracted -- Dictionary mapping absolute paths of the project's
+                     modules to the ParsedImport objects found in them.
+                     If not provided, every file is extracted.
+                     (default: None)
+
+        """
+        self.fileStates = self.scan()
+        if extracted == None:
+            extracted = { path : self.extractor.extract(path) for path in self.fileStates }
+        self.extracted = dict(extracted)
+        self.moduleNames = {}
+        self.resolved = {}
+        self.prunedSources = {}
+        self.pruned = {}
+        self.errors = {}
+        self.whitelist = Whitelist(self.scannedNames)
+        self.updateModules(self.extracted.keys(), [])
+        self.filtered = self.whitelistApplier.applyWhitelist(self.resolved, self.whitelist)
+        self.updatePruned(self.filtered.keys())
+        return self.getDependencies()
+
+    def poll(self):
+        """Update dependencies of files that changed since last scan.
+
+        Returns instance of DependencyDiff describing how the
+        dependencies returned by getDependencies() changed. Files
+        which can't be extracted are listed in the diff's errors and
+        keep the dependencies they had before, until they can be
+        extracted on a later poll.
+
+        """
+        newStates = self.scan()
+        added = [ path for path in newStates if not path in self.fileStates ]
+        deleted = [ path for path in self.fileStates if not path in newStates ]
+        changed = [ path for path, state in newStates.items()
+            if path in self.fileStates and self.fileStates[path] != state ]
+        self.fileStates = newStates
+        if not (added or deleted or changed):
+            return DependencyDiff([], [], [], [])
+
+        # Sets are replaced rather than modified when updated, so
+        # a shallow copy is enough to keep the old dependencies
+        before = dict(self.getDependencies())
+        # Extract dependencies of the new and changed files again
+        errors = []
+        for path in added + changed:
+            try:
+                self.extracted[path] = self.extractor.extract(path)
+                self.errors.pop(path, None)
+            # File may have been deleted since it was scanned
+            except IOError:
+                self.extracted.pop(path, None)
+                deleted.append(path)
+            # File may be half-written by an editor. ParseError and
+            # UnicodeDecodeError are both ValueErrors. The file's old
+            # dependencies are kept, and its state is forgotten so it
+            # is extracted again on the next poll, in case it's
+            # finished without its modification time changing.
+            except ValueError as e:
+                error = (newStates[path], str(e))
+                if self.errors.get(path) != error:
+                    errors.append( (path, str(e)) )
+                self.errors[path] = error
+                self.fileStates[path] = None
+        for path in deleted:
+            self.extracted.pop(path, None)
+            self.errors.pop(path, None)
+        affected = self.updateModules(added + changed, deleted)
+
+        # Adding or deleting files changes which modules are in the
+        # project, so every module must be filtered again
+        if added or deleted:
+            newWhitelist = Whitelist(self.scannedNames)
+            if newWhitelist != self.whitelist:
+                self.whitelist = newWhitelist
+                affected = affected.union(self.filtered.keys(), self.resolved.keys())
+        affectedFiltered = self.updateFiltered(affected)
+        if self.maximumDepth != None:
+            affectedOutput = self.updatePruned(affectedFiltered)
+        else:
+            affectedOutput = affectedFiltered
+
+        return self.computeDiff(before, self.getDependencies(), affectedOutput, errors)
+
+    def updateModules(self, updatedPaths, deletedPaths):
+        """Resolve dependencies of the given modules again.
+
+        Returns set containing names of modules whose resolved
+        dependencies may have changed.
+
+        Arguments:
+        updatedPaths -- Paths of files which were added or changed
+        deletedPaths -- Paths of files which were deleted
+
+        """
+        affected = set()
+        for path in deletedPaths:
+            name = self.moduleNames.pop(path, None)
+            if name != None:
+                self.resolved.pop(name, None)
+                affected.add(name)
+        for path in sorted(updatedPaths):
+            if not path in self.extracted:
+                continue
+            resolved = self.resolver.resolveImports( { path : self.extracted[path] } )
+            for name, dependencies in resolved.items():
+                self.moduleNames[path] = name
+                self.resolved[name] = dependencies
+                affected.add(name)
+        return affected
+
+    def updateFiltered(self, names):
+        """Apply whitelist to the given modules again.
+
+        Returns set containing names of modules whose filtered
+        dependencies may have changed.
+
+        Arguments:
+        names -- Names of the modules to filter again
+
+        """
+        affected = set()
+        for name in names:
+            self.filtered.pop(name, None)
+            affected.add(name)
+            if name in self.resolved:
+                self.filtered.update( self.whitelistApplier.applyWhitelist(
+                    { name : self.resolved[name] }, self.whitelist) )
+        return affected
+
+    def updatePruned(self, names):
+        """Prune the given modules again, merging them with modules that prune to the same name.
+
+        Returns set containing the pruned names of the given modules.
+
+        Arguments:
+        names -- Names of the modules to prune again
+
+        """
+        if self.maximumDepth == None:
+            return set()
+        affected = set()
+        for name in names:
+            prunedName = self.pruner.prunePackageName(name, self.maximumDepth)
+            sources = self.prunedSources.setdefault(prunedName, set())
+            if name in self.filtered:
+                sources.add(name)
+            else:
+                sources.discard(name)
+            affected.add(prunedName)
+        # Merge the dependencies of all modules which prune to the same name
+        for prunedName in affected:
+            sources = self.prunedSources[prunedName]
+            if len(sources) == 0:
+                del self.prunedSources[prunedName]
+                self.pruned.pop(prunedName, None)
+                continue
+            merged = set()
+            for name in sources:
+                merged.update( self.pruner.pruneDependencyList(
+                    name, self.filtered[name], self.maximumDepth)[1] )
+            merged.discard(prunedName)
+            self.pruned[prunedName] = merged
+        return affected
+
+    def computeDiff(self, before, after, names, errors = None):
+        """Return DependencyDiff describing how the given modules changed.
+
+        Arguments:
+        before -- Dependencies before the update
+        after -- Dependencies after the update
+        names -- Names of the modules which may have changed
+
+        Keyword arguments:
+        errors -- Collection of (path, message) tuples for files which
+                  couldn't be extracted (default: None)
+
+        """
+        addedModules, removedModules = [], []
+        addedEdges, removedEdges = [], []
+        for name in names:
+            if name in before and not name in after:
+                removedModules.append(name)
+            elif name in after and not name in before:
+                addedModules.append(name)
+            oldDependencies = before.get(name, set())
+            newDependencies = after.get(name, set())
+            addedEdges += [ (name, dep) for dep in newDependencies - oldDependencies ]
+            removedEdges += [ (name, dep) for dep in oldDependencies - newDependencies ]
+        return DependencyDiff(addedModules, removedModules, addedEdges, removedEdges, errors)
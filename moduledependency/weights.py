@@ -0,0 +1,243 @@
+"""Contains functionality for estimating how much code is loaded when
+each package/module is imported."""
+
+from .graph import DependencyGraph
+from .cycles import CycleDetector
+
+# Return number of bits set in an integer. int.bit_count() is much
+# faster, but only exists from Python 3.10.
+if hasattr(int, "bit_count"):
+    countBits = int.bit_count
+else:
+    countBits = lambda value: bin(value).count("1")
+
+
+def measureFile(filename):
+    """Return tuple containing the number of bytes and lines in a file.
+
+    Arguments:
+    filename -- Path to the file to measure
+
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    lines = data.count(b"\n")
+    # Last line may not end with a newline
+    if len(data) > 0 and not data.endswith(b"\n"):
+        lines += 1
+    return len(data), lines
+
+def measureModules(dependencies, resolver):
+    """Return dictionary mapping the name of every module to its size.
+
+    Each size is a tuple containing the number of bytes, lines and
+    imports in the module. Imports are counted from the extracted
+    dependencies, so the imports of modules found in a cache are
+    counted without extracting them again.
+
+    Arguments:
+    dependencies -- Dictionary where the keys are absolute paths to
+                    modules and the values are the sets of ParsedImport
+                    objects extracted from them
+    resolver -- ImportResolver of the project, used to find the
+                name of each module
+
+    """
+    sizes = {}
+    for path, parsedImports in dependencies.items():
+        numBytes, numLines = measureFile(path)
+        sizes[resolver.getModuleName(path)] = (numBytes, numLines, len(parsedImports))
+    return sizes
+
+
+class ImportWeights:
+
+    """Size of every package/module, and the total size of everything loaded when it is imported.
+
+    Sizes are tuples containing a count for each metric in METRICS.
+    The "modules" metric of a package/module's own size is 1, so its
+    total is the number of packages/modules loaded when it is imported.
+    Names which aren't modules, such as functions imported from a
+    module, have a size of zero.
+
+    """
+
+    # Metrics of each size, in the order they are stored
+    METRICS = ( "modules", "bytes", "lines", "imports" )
+    # Size of names which aren't modules
+    EMPTY_SIZE = ( 0, 0, 0, 0 )
+
+    def __init__(self, sizes, totals):
+        """Construct instance of ImportWeights.
+
+        Arguments:
+        sizes -- Dictionary mapping the name of every module to
+                 its own size
+        totals -- Dictionary mapping every name to the total size
+                  of itself and everything loaded when it is imported
+
+        """
+        self.sizes = sizes
+        self.totals = totals
+
+    def getSize(self, name):
+        """Return own size of a package/module.
+
+        A KeyError is raised if the name is unknown.
+
+        """
+        if not name in self.totals:
+            raise KeyError(name)
+        return self.sizes.get(name, self.EMPTY_SIZE)
+
+    def getTotal(self, name):
+        """Return total size of a package/module and everything it loads.
+
+        A KeyError is raised if the name is unknown.
+
+        """
+        return self.totals[name]
+
+    def getHeaviest(self, count = None, metric = "bytes"):
+        """Return list of the names of the modules with the largest totals, largest first.
+
+        Modules with the same total are sorted by name.
+
+        Keyword arguments:
+        count -- Number of names to return. If None, every module
+                 is returned. (default: None)
+        metric -- Metric the totals are compared by. A ValueError is
+                  raised if it isn't in METRICS. (default: "bytes")
+
+        """
+        if not metric in self.METRICS:
+            raise ValueError("Unknown metric '{}'".format(metric))
+        index = self.METRICS.index(metric)
+        names = sorted(self.sizes, key=lambda name: (-self.totals[name][index], name))
+        return names if count == None else names[:count]
+
+    def format(self, count = None, metric = "bytes"):
+        """Return the totals of the heaviest modules as a human readable table.
+
+        Takes the same arguments as getHeaviest().
+
+        """
+        lines = [ "{:<40}".format("module") + "".join( "{:>12}".format(m) for m in self.METRICS ) ]
+        for name in self.getHeaviest(count, metric):
+            lines.append( "{:<40}".format(name) + "".join( "{:>12}".format(value)
+                for value in self.totals[name] ) )
+        return "\n".join(lines)
+
+
+class WeightAnalyser:
+
+    """Finds the total size of the code loaded when each package/module is imported.
+
+    Importing a module runs every module it imports, as well as the
+    package it belongs to, so the total of a module is the sum of the
+    sizes of every package/module reachable from it. Reachable sets
+    overlap, so totals can't be found by adding up the totals of a
+    module's dependencies. Instead, import cycles are collapsed with
+    CycleDetector, and the set of components reachable from each
+    component is stored as a bitset, built from the bitsets of its
+    dependencies. Components are visited with dependencies first, so
+    each bitset is built once, and is discarded as soon as every
+    component depending on it has been built.
+
+    """
+
+    def analyse(self, dependencies, sizes):
+        """Return ImportWeights of dependencies.
+
+        Arguments:
+        dependencies -- Dictionary where the keys are the packages/modules
+                        in the project and the values are packages/modules
+                        that the respective key imported, or a DependencyGraph.
+        sizes -- Dictionary mapping the name of every module to a
+                 tuple containing its number of bytes, lines and
+                 imports, as returned by measureModules()
+
+        """
+        graph = dependencies if isinstance(dependencies, DependencyGraph) else DependencyGraph(dependencies)
+        ownSizes = { name : (1,) + tuple(size) for name, size in sizes.items() }
+        # Importing a name imports the packages containing it, so each
+        # name depends on the closest of them which is known
+        names = set(graph.names) | set(ownSizes)
+        edges = {}
+        for name in names:
+            targets = set(graph[name]) if name in graph else set()
+            parent = name.rpartition(".")[0]
+            while len(parent) > 0 and not parent in names:
+                parent = parent.rpartition(".")[0]
+            if len(parent) > 0:
+                targets.add(parent)
+            edges[name] = targets
+        condensation = CycleDetector().condense(edges)
+
+        numMetrics = len(ImportWeights.METRICS)
+        numComponents = len(condensation.components)
+        componentSizes = []
+        for members in condensation.components:
+            totals = [ 0 ] * numMetrics
+            for name in members:
+                for i, value in enumerate( ownSizes.get(name, ImportWeights.EMPTY_SIZE) ):
+                    totals[i] += value
+            componentSizes.append(totals)
+        masks = self.createMasks(componentSizes, numComponents)
+
+        # Number of components which depend on each component and
+        # haven't been visited yet, so bitsets can be discarded early
+        remainingDependants = [ 0 ] * numComponents
+        for dependencyIds in condensation.componentDependencies:
+            for dependencyId in dependencyIds:
+                remainingDependants[dependencyId] += 1
+        reachable = {}
+        componentTotals = []
+        for componentId, dependencyIds in enumerate(condensation.componentDependencies):
+            bits = 1 << componentId
+            for dependencyId in dependencyIds:
+                bits |= reachable[dependencyId]
+                remainingDependants[dependencyId] -= 1
+                if remainingDependants[dependencyId] == 0:
+                    del reachable[dependencyId]
+            if remainingDependants[componentId] > 0:
+                reachable[componentId] = bits
+            componentTotals.append( tuple( sum( weight * countBits(bits & mask)
+                for weight, mask in metricMasks ) for metricMasks in masks ) )
+
+        totals = { name : componentTotals[componentId]
+            for name, componentId in condensation.componentIds.items() }
+        return ImportWeights(ownSizes, totals)
+
+    def createMasks(self, componentSizes, numComponents):
+        """Return list containing the bit masks of each metric.
+
+        The sizes of a metric are split into their binary digits, and
+        each digit has a mask with the bits of the components whose
+        size has that digit set. The sum of the sizes of a bitset of
+        components is the sum of each digit's value multiplied by the
+        number of bits set in both the bitset and the digit's mask, so
+        sizes are summed without visiting each component in the bitset.
+
+        Arguments:
+        componentSizes -- List containing the size of every component
+        numComponents -- Number of components
+
+        """
+        masks = []
+        for metric in range(len(ImportWeights.METRICS)):
+            # Built as bytes, as setting bits of an integer copies it
+            digitMasks = {}
+            for componentId, size in enumerate(componentSizes):
+                value = size[metric]
+                digit = 0
+                while value > 0:
+                    if value & 1:
+                        if not digit in digitMasks:
+                            digitMasks[digit] = bytearray((numComponents + 7) // 8)
+                        digitMasks[digit][componentId >> 3] |= 1 << (componentId & 7)
+                    value >>= 1
+                    digit += 1
+            masks.append([ (1 << digit, int.from_bytes(mask, "little"))
+                for digit, mask in sorted(digitMasks.items()) ])
+        return masks
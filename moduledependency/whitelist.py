@@ -3,7 +3,178 @@ module dependencies."""
 
 import os
 import re
-from . import util
+from .walker import ProjectWalker
+from .graph import DependencyGraph
+
+
+class Whitelist:
+
+	"""Collection of the names of allowed packages and modules.
+
+	Names are stored in a set for constant time membership tests,
+	and in a trie of their components for prefix queries, such as
+	finding every whitelisted module contained in a package. The
+	components of every name are also indexed. Build a Whitelist
+	once and reuse it for every lookup in a run.
+
+	"""
+
+	def __init__(self, names = ()):
+		"""Construct instance of Whitelist.
+
+		Keyword arguments:
+		names -- Iterable containing names of all allowed packages
+				 and modules. (default: empty)
+
+		"""
+		self.names = set()
+		# Each node maps the next component of a name to its child
+		# node. Nodes of whitelisted names contain the key None.
+		self.trie = {}
+		# Every component of every whitelisted name
+		self.components = set()
+		for name in names:
+			self.add(name)
+
+	def add(self, name):
+		"""Add package or module to the whitelist.
+
+		Arguments:
+		name -- Full name of the package or module
+
+		"""
+		if not isinstance(name, str):
+			raise TypeError("Whitelisted names must be strings")
+		self.names.add(name)
+		node = self.trie
+		for component in name.split("."):
+			node = node.setdefault(component, {})
+			self.components.add(component)
+		node[None] = True
+
+	def allows(self, name):
+		"""Return True if the package or module is allowed by the whitelist.
+
+		This is the case if the name itself is whitelisted, or if it
+		is directly contained in a whitelisted package. See
+		WhitelistApplier.inWhitelist() for details.
+
+		Arguments:
+		name -- Full name of the package or module
+
+		"""
+		if name in self.names:
+			return True
+		parent, separator, lastComponent = name.rpartition(".")
+		return (len(separator) > 0 and parent in self.names)
+
+	def containsPackageOf(self, name):
+		"""Return True if the package or module, or any package containing it, is whitelisted.
+
+		Unlike allows(), packages at any level count. If the empty
+		name is whitelisted, True is always returned. Takes time
+		proportional to the number of components in the name.
+
+		Arguments:
+		name -- Full name of the package or module
+
+		"""
+		if "" in self.names:
+			return True
+		if len(name) == 0:
+			return False
+		node = self.trie
+		for component in name.split("."):
+			node = node.get(component)
+			if node == None:
+				return False
+			if None in node:
+				return True
+		return False
+
+	def hasComponent(self, component):
+		"""Return True if any whitelisted name has the given component.
+
+		Arguments:
+		component -- Single component of a name, which contains no "."
+
+		"""
+		if len(component) == 0:
+			return "" in self.names
+		return component in self.components
+
+	def findNode(self, package):
+		"""Return trie node of a package, or None if no whitelisted name starts with it.
+
+		Arguments:
+		package -- Full name of the package
+
+		"""
+		node = self.trie
+		for component in package.split("."):
+			node = node.get(component)
+			if node == None:
+				return None
+		return node
+
+	def hasPrefix(self, package):
+		"""Return True if the package or anything contained in it is whitelisted.
+
+		Arguments:
+		package -- Full name of the package
+
+		"""
+		return self.findNode(package) != None
+
+	def getContained(self, package):
+		"""Return sorted list of whitelisted names which are the package or are contained in it.
+
+		Arguments:
+		package -- Full name of the package
+
+		"""
+		node = self.findNode(package)
+		if node == None:
+			return []
+		contained = []
+		# Walk the package's subtree, rebuilding the name of every node
+		stack = [ (package, node) ]
+		while len(stack) > 0:
+			name, node = stack.pop()
+			for component, child in node.items():
+				if component == None:
+					contained.append(name)
+				else:
+					stack.append( ("{}.{}".format(name, component), child) )
+		return sorted(contained)
+
+	def __contains__(self, name):
+		"""Return True if the name is whitelisted exactly."""
+		return name in self.names
+
+	def __iter__(self):
+		"""Return iterator over the whitelisted names."""
+		return iter(self.names)
+
+	def __len__(self):
+		"""Return number of whitelisted names."""
+		return len(self.names)
+
+	def __eq__(self, other):
+		"""Return True if both whitelists contain the same names."""
+		if isinstance(other, Whitelist):
+			return self.names == other.names
+		return NotImplemented
+
+	def __ne__(self, other):
+		"""Return True if the whitelists do NOT contain the same names."""
+		if isinstance(other, Whitelist):
+			return self.names != other.names
+		return NotImplemented
+
+	def __repr__(self):
+		"""Return human-readable representation of object."""
+		return "Whitelist({})".format(sorted(self.names))
 
 
 class WhitelistGenerator:
@@ -48,39 +219,22 @@ class WhitelistGenerator:
 		if not os.path.isdir(projectDirectory):
 			raise IOError("Directory '{}' does not exist".format(projectDirectory))
 
-		# Pre-compute root package using project directory
-		rootPackage = util.getProjectRoot(projectDirectory)
-
-		whitelist = []
-		for root, directories, filenames in os.walk(projectDirectory):
-			for name in (directories + filenames):
-				# Make sure that the root directory (of current directories/files)
-				# and the project directory use the same path separator
-				sanitisedRoot = re.sub(r"(\\|/)", os.sep.replace("\\", "\\\\"), root)
-				partToRemove = re.sub(r"(\\|/)", os.sep.replace("\\", "\\\\"), projectDirectory)
-				# Remove project directory from the root directory, as we only care
-				# aobut the file's RELATIVE position in the project
-				trimmedRoot = sanitisedRoot[len(partToRemove) + 1:]
-				# Create the full RELATIVE path to the directory/file by combining
-				# the directory the current file is contained with the name
-				# of it the file itself
-				name = os.path.join(trimmedRoot, name)
-				# Get package name for the file being processed
-				packageName = None
-				try:
-					packageName = self.getPackageName(name)
-				# If invalid package name, we just ignore that module
-				except ValueError:
-					continue
-				# Add root package to the name and add it to the whitelist
-				if len(packageName) > 0:
-					packageName = "{}.{}".format(rootPackage, packageName)
-				else:
-					packageName = rootPackage
-				whitelist.append(packageName)
-
+		# Names are computed while walking the project, using the same
+		# rules as getPackageName()
+		walker = ProjectWalker()
+		walker.scan(projectDirectory)
+		whitelist = walker.packageNames
 		return whitelist
 
+	def generateWhitelist(self, projectDirectory):
+		"""Generate a Whitelist of all packages/modules in a project.
+
+		projectDirectory -- *Absolute* path to the project whose
+							whitelist we need to generate.
+
+		"""
+		return Whitelist( self.generate(projectDirectory) )
+
 
 class WhitelistApplier:
 
@@ -110,10 +264,12 @@ class WhitelistApplier:
 
 		Arguments:
 		dependency -- String containing package name of dependency. 
-		whitelist -- List containing names of all allowed packages
-					 and modules
+		whitelist -- Whitelist, or other collection containing names
+					 of all allowed packages and modules
 
 		"""
+		if isinstance(whitelist, Whitelist):
+			return whitelist.allows(dependency)
 		# If there's a direct match in the whitelist, return True
 		# straight away
 		if dependency in whitelist:
@@ -147,16 +303,38 @@ class WhitelistApplier:
 		"""
 		# Generate whitelist for the desired project
 		generator = WhitelistGenerator()
-		allowedPackages = generator.generate(projectRoot)
-		# Apply the whitelist to the project's dependencies
-		projectDependencies = {} 
+		allowedPackages = generator.generateWhitelist(projectRoot)
+		return self.applyWhitelist(dependencies, allowedPackages)
+
+	def applyWhitelist(self, dependencies, whitelist):
+		"""Filter modules and dependencies that aren't in a whitelist.
+
+		A dictionary, where the keys are whitelisted packages/modules
+		and values are sets of dependencies also in the whitelist,
+		is returned.
+
+		Arguments:
+		dependencies -- Dependencies found in project, given
+						as a dictionary where the keys are
+						strings containing the full names, or
+						as a DependencyGraph. Whitelisted
+						dependencies of a DependencyGraph are
+						returned as a DependencyGraph, and each
+						distinct name is only checked once.
+		whitelist -- Whitelist, or other collection containing names
+					 of all allowed packages and modules. Other
+					 collections are converted to a Whitelist first.
+
+		"""
+		if not isinstance(whitelist, Whitelist):
+			whitelist = Whitelist(whitelist)
+		allows = whitelist.allows
+		if isinstance(dependencies, DependencyGraph):
+			return dependencies.filter(allows)
+		projectDependencies = {}
 		for key, value in dependencies.items():
 			# Only add if the module name is in the whitelist
-			if self.inWhitelist(key, allowedPackages):
+			if allows(key):
 				# Use whitelist to filter any of the module's dependencies too
-				filteredSet = set()
-				for dep in value:
-					if self.inWhitelist(dep, allowedPackages):
-						filteredSet.add(dep)
-				projectDependencies[key] = filteredSet
+				projectDependencies[key] = set( dep for dep in value if allows(dep) )
 		return projectDependencies
\ No newline at end of file
@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+import collections
+import tempfile
+import shutil
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from moduledependency.ast_extractor import AstDependencyExtractor, ImportTimeExtractor
+from moduledependency.dependency_extractor import ModuleDependencyExtractor
+from moduledependency.parser import (ParsedImport, CONTEXT_TOP_LEVEL, CONTEXT_TRY,
+	CONTEXT_FUNCTION, CONTEXT_TYPE_CHECKING)
+
+
+class TestAstDependencyExtractor(unittest.TestCase):
+
+	SOURCE = """import a, b.c as d
+from . import e
+from .f import g
+from ..h import i
+from .. import j
+from ... import *
+from k import *
+try:
+	import l
+except ImportError:
+	m = None
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	import n
+def function():
+	import o
+	try:
+		import p
+	except ImportError:
+		pass
+	if typing.TYPE_CHECKING:
+		import q
+class Class:
+	import r
+	def method(self):
+		import a
+callback = lambda: __import__("s")
+x.import_ = "import t"
+"""
+
+	def setUp(self):
+		self.extractor = AstDependencyExtractor()
+
+	def tearDown(self):
+		self.extractor = None
+
+	def getLocations(self, dependencies):
+		return { (dep.moduleName, dep.relative) : (dep.context, dep.line, dep.column) for dep in dependencies }
+
+	def test_extractFromString(self):
+		self.assertEqual(self.extractor.extractFromString(""), set())
+		self.assertEqual(self.getLocations(self.extractor.extractFromString(self.SOURCE)), {
+			("a", False) : (CONTEXT_TOP_LEVEL, 1, 1),
+			("b.c", False) : (CONTEXT_TOP_LEVEL, 1, 1),
+			(".e", True) : (CONTEXT_TOP_LEVEL, 2, 1),
+			("f.g", True) : (CONTEXT_TOP_LEVEL, 3, 1),
+			("..h.i", True) : (CONTEXT_TOP_LEVEL, 4, 1),
+			("..j", True) : (CONTEXT_TOP_LEVEL, 5, 1),
+			("...", True) : (CONTEXT_TOP_LEVEL, 6, 1),
+			("k", False) : (CONTEXT_TOP_LEVEL, 7, 1),
+			("l", False) : (CONTEXT_TRY, 9, 2),
+			("typing.TYPE_CHECKING", False) : (CONTEXT_TOP_LEVEL, 12, 1),
+			("n", False) : (CONTEXT_TYPE_CHECKING, 14, 2),
+			("o", False) : (CONTEXT_FUNCTION, 16, 2),
+			("p", False) : (CONTEXT_FUNCTION, 18, 3),
+			("q", False) : (CONTEXT_TYPE_CHECKING, 22, 3),
+			("r", False) : (CONTEXT_TOP_LEVEL, 24, 2)
+		})
+		# Test import made more than once keeps the one which runs soonest
+		dependencies = self.extractor.extractFromString("def f():\n\timport a\nimport a\n")
+		self.assertEqual(self.getLocations(dependencies), { ("a", False) : (CONTEXT_TOP_LEVEL, 3, 1) })
+
+	def test_sameAsTokenEngine(self):
+		tokenExtractor = ModuleDependencyExtractor()
+		for filename in [ "files/no_dependencies.py", "files/blocked_dependencies.py", "files/some_dependencies.py" ]:
+			self.assertEqual(self.extractor.extract(filename), tokenExtractor.extract(filename))
+		# Test whitelist is applied
+		whitelist = [ "a", "d" ]
+		self.assertEqual(AstDependencyExtractor(whitelist).extract("files/some_dependencies.py"),
+			ModuleDependencyExtractor(whitelist).extract("files/some_dependencies.py"))
+
+	def test_extract(self):
+		with self.assertRaises(TypeError):
+			self.extractor.extract(5353)
+		with self.assertRaises(IOError):
+			self.extractor.extract("non-existent")
+		# Test invalid code falls back to the token engine
+		counters = collections.Counter()
+		extractor = AstDependencyExtractor(counters=counters)
+		dependencies = extractor.extractFromString(b"# coding: latin-1\nprint 'caf\xe9'\nimport a\n")
+		self.assertEqual(dependencies, set([ ParsedImport("a", False) ]))
+		self.assertEqual(list(dependencies)[0].context, None)
+		self.assertEqual(counters["syntax_errors"], 1)
+		extractor.extract("files/some_dependencies.py")
+		self.assertEqual(counters["files"], 1)
+		self.assertEqual(counters["imports"], 16)
+
+
+class TestImportTimeExtractor(unittest.TestCase):
+
+	def test_extract(self):
+		counters = collections.Counter()
+		extractor = ImportTimeExtractor(AstDependencyExtractor(counters=counters))
+		self.assertEqual(extractor.ENGINE, "ast:import-time")
+		self.assertIs(extractor.counters, counters)
+		directory = tempfile.mkdtemp()
+		try:
+			filename = os.path.join(directory, "module.py")
+			with open(filename, "w") as f:
+				f.write(TestAstDependencyExtractor.SOURCE)
+			dependencies = extractor.extract(filename)
+		finally:
+			shutil.rmtree(directory)
+		# Imports inside functions and "if TYPE_CHECKING:" are discarded
+		self.assertEqual(set( dep.moduleName for dep in dependencies ),
+			set([ "a", "b.c", ".e", "f.g", "..h.i", "..j", "...", "k", "l", "typing.TYPE_CHECKING", "r" ]))
+		self.assertEqual(counters["files"], 1)
@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+import collections
+import asyncio
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from fileprocessor.searchers import FileSearcher
+from fileprocessor.filterers import ExtensionFilterer
+from fileprocessor import FileProcessor
+from moduledependency.dependency_extractor import ModuleDependencyExtractor
+from moduledependency.ast_extractor import AstDependencyExtractor
+from moduledependency.async_processor import AsyncFileProcessor, readFile
+from moduledependency.cache import ExtractionCache
+
+
+class TestAsyncFileProcessor(unittest.TestCase):
+
+	def createProcessor(self, concurrency, queueSize = None, extractor = None, cache = None):
+		return AsyncFileProcessor(FileSearcher(True), [ ExtensionFilterer(["py"]) ],
+			extractor or ModuleDependencyExtractor(), concurrency, queueSize, cache)
+
+	def test_construction(self):
+		# Test invalid concurrency limits
+		with self.assertRaises(TypeError):
+			self.createProcessor("2")
+		with self.assertRaises(ValueError):
+			self.createProcessor(0)
+		# Test default and custom queue sizes
+		self.assertEqual(self.createProcessor(2).queueSize, AsyncFileProcessor.DEFAULT_QUEUE_SIZE)
+		self.assertEqual(self.createProcessor(2, 3).queueSize, 3)
+
+	def test_readFile(self):
+		with open("files/some_dependencies.py", "rb") as f:
+			self.assertEqual(readFile("files/some_dependencies.py"), f.read())
+		with self.assertRaises(IOError):
+			readFile("non-existent")
+
+	def test_process(self):
+		for extractorClass in [ ModuleDependencyExtractor, AstDependencyExtractor ]:
+			serialProcessor = FileProcessor(FileSearcher(True), [ ExtensionFilterer(["py"]) ],
+				extractorClass())
+			expected = serialProcessor.process(os.path.abspath("project"))
+			# Test with more readers than files and with a queue which is always full
+			for concurrency, queueSize in [ (32, None), (1, 1), (4, 1) ]:
+				result = self.createProcessor(concurrency, queueSize, extractorClass()).process(
+					os.path.abspath("project"))
+				self.assertEqual(result, expected)
+				# Ensure results are always merged in the same order
+				self.assertEqual(list(result.keys()), sorted(expected.keys()))
+		# Test a pool shared between runs isn't shut down
+		with ThreadPoolExecutor(max_workers=2) as pool:
+			processor = AsyncFileProcessor(FileSearcher(True), [ ExtensionFilterer(["py"]) ],
+				ModuleDependencyExtractor(), 4, pool=pool)
+			expected = FileProcessor(FileSearcher(True), [ ExtensionFilterer(["py"]) ],
+				ModuleDependencyExtractor()).process(os.path.abspath("project"))
+			self.assertEqual(processor.process(os.path.abspath("project")), expected)
+			self.assertEqual(processor.process(os.path.abspath("project")), expected)
+		# Test directory without any files
+		directory = tempfile.mkdtemp()
+		try:
+			self.assertEqual(self.createProcessor(2).process(directory), {})
+		finally:
+			shutil.rmtree(directory)
+
+	def test_processFiles(self):
+		filenames = [ os.path.abspath("project/a.py"), os.path.abspath("project/pack2/e.py") ]
+		extractor = ModuleDependencyExtractor()
+		self.assertEqual(asyncio.run( self.createProcessor(2).processFiles(filenames) ),
+			{ filename : extractor.extract(filename) for filename in filenames })
+		# Test errors reading files are raised
+		with self.assertRaises(IOError):
+			asyncio.run( self.createProcessor(2, 1).processFiles(filenames + [ "non-existent" ]) )
+
+	def test_extractionThread(self):
+		# Test every file is extracted in the same thread, which isn't the event loop's
+		threadIds = []
+		class RecordingExtractor(ModuleDependencyExtractor):
+			def extractFromBytes(self, data):
+				threadIds.append(threading.get_ident())
+				return super().extractFromBytes(data)
+		result = self.createProcessor(4, extractor=RecordingExtractor()).process(os.path.abspath("project"))
+		self.assertEqual(len(threadIds), len(result))
+		self.assertEqual(len(set(threadIds)), 1)
+		self.assertNotEqual(threadIds[0], threading.get_ident())
+
+	def test_counters(self):
+		counters = collections.Counter()
+		result = self.createProcessor(4, extractor=ModuleDependencyExtractor(counters=counters)).process(
+			os.path.abspath("project"))
+		self.assertEqual(counters["files"], len(result))
+		self.assertEqual(counters["bytes"], sum( os.path.getsize(filename) for filename in result ))
+		self.assertEqual(counters["imports"], sum( len(dependencies) for dependencies in result.values() ))
+
+	def test_cache(self):
+		cache = ExtractionCache(".test_async_processor_cache")
+		try:
+			processor = self.createProcessor(4, cache=cache)
+			expected = processor.process(os.path.abspath("project"))
+			self.assertEqual(cache.hits, 0)
+			self.assertEqual(processor.process(os.path.abspath("project")), expected)
+			self.assertEqual(cache.hits, len(expected))
+		finally:
+			cache.close()
+			shutil.rmtree(".test_async_processor_cache")
+
+	def test_cache_changed(self):
+		directory = tempfile.mkdtemp()
+		cache = ExtractionCache(os.path.join(directory, "cache"))
+		try:
+			filename = os.path.join(directory, "a.py")
+			with open(filename, "wb") as f:
+				f.write(b"import a\n")
+			# Extractor which changes the file while it's being extracted
+			class ChangingExtractor(ModuleDependencyExtractor):
+				def extractFromBytes(self, data):
+					with open(filename, "ab") as f:
+						f.write(b"import b\n")
+					return super().extractFromBytes(data)
+			self.createProcessor(2, extractor=ChangingExtractor(), cache=cache).process(directory)
+			# Test the out of date dependencies weren't stored
+			self.assertEqual(cache.lookup(filename, ChangingExtractor.ENGINE), None)
+		finally:
+			cache.close()
+			shutil.rmtree(directory)
@@ -0,0 +1,212 @@
+import unittest
+import sys
+import os
+import shutil
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from moduledependency.cache import ExtractionCache, CachingExtractor
+from moduledependency.dependency_extractor import ModuleDependencyExtractor
+from moduledependency.parser import ParsedImport
+from moduledependency.graph import DependencyGraph
+
+
+class TestExtractionCache(unittest.TestCase):
+
+	CACHE_DIRECTORY = ".test_cache"
+	SOURCE_FILENAME = os.path.abspath(".test_cache_source.py")
+	DEPENDENCIES = set([ ParsedImport("a.b", False), ParsedImport(".c", True) ])
+
+	def setUp(self):
+		with open(self.SOURCE_FILENAME, "w") as f:
+			f.write("import a.b\nfrom . import c\n")
+
+	def tearDown(self):
+		if os.path.isdir(self.CACHE_DIRECTORY):
+			shutil.rmtree(self.CACHE_DIRECTORY)
+		if os.path.isfile(self.SOURCE_FILENAME):
+			os.remove(self.SOURCE_FILENAME)
+
+	def touch(self, filename):
+		"""Change modification time of file without changing its contents."""
+		stat = os.stat(filename)
+		os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+	def test_construction(self):
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			self.assertTrue( os.path.isfile(os.path.join(self.CACHE_DIRECTORY, ExtractionCache.DATABASE_FILENAME)) )
+			self.assertEqual(cache.hits, 0)
+			self.assertEqual(cache.misses, 0)
+		finally:
+			cache.close()
+
+	def test_serialise(self):
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			self.assertEqual(cache.deserialise(cache.serialise(set())), set())
+			self.assertEqual(cache.deserialise(cache.serialise(self.DEPENDENCIES)), self.DEPENDENCIES)
+			# Test context and location of imports are kept
+			located = cache.deserialise(cache.serialise(set([ ParsedImport("a", False, "function", 2, 5) ])))
+			self.assertEqual([ (dep.context, dep.line, dep.column) for dep in located ], [ ("function", 2, 5) ])
+		finally:
+			cache.close()
+
+	def test_lookup(self):
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			# Test file that isn't cached
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME), None)
+			# Test file that is cached and unchanged
+			cache.store(self.SOURCE_FILENAME, self.DEPENDENCIES)
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME), self.DEPENDENCIES)
+			# Test file whose modification time changed
+			self.touch(self.SOURCE_FILENAME)
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME), None)
+			self.assertEqual(cache.hits, 1)
+			self.assertEqual(cache.misses, 2)
+		finally:
+			cache.close()
+		# Test entries persist after the cache is closed
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			cache.store(self.SOURCE_FILENAME, self.DEPENDENCIES)
+		finally:
+			cache.close()
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME), self.DEPENDENCIES)
+		finally:
+			cache.close()
+
+	def test_store_changed(self):
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			# Test file that changed after it was read isn't stored
+			stat = os.stat(self.SOURCE_FILENAME)
+			self.touch(self.SOURCE_FILENAME)
+			cache.store(self.SOURCE_FILENAME, self.DEPENDENCIES, "tokens", stat)
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME), None)
+			# Test unchanged file is stored
+			cache.store(self.SOURCE_FILENAME, self.DEPENDENCIES, "tokens", os.stat(self.SOURCE_FILENAME))
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME), self.DEPENDENCIES)
+		finally:
+			cache.close()
+
+	def test_lookup_engines(self):
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			cache.store(self.SOURCE_FILENAME, self.DEPENDENCIES)
+			# Test results of each engine are kept apart
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME, "ast"), None)
+			cache.store(self.SOURCE_FILENAME, set(), "ast")
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME, "ast"), set())
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME, "tokens"), self.DEPENDENCIES)
+		finally:
+			cache.close()
+
+	def test_lookup_hashes(self):
+		cache = ExtractionCache(self.CACHE_DIRECTORY, useHashes=True)
+		try:
+			cache.store(self.SOURCE_FILENAME, self.DEPENDENCIES)
+			# Test file that was touched but has the same contents
+			self.touch(self.SOURCE_FILENAME)
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME), self.DEPENDENCIES)
+			# Test file whose contents changed
+			with open(self.SOURCE_FILENAME, "w") as f:
+				f.write("import a.c\nfrom . import c\n")
+			self.touch(self.SOURCE_FILENAME)
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME), None)
+		finally:
+			cache.close()
+
+	def test_checkVersion(self):
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			cache.store(self.SOURCE_FILENAME, self.DEPENDENCIES)
+			# Pretend the cache was written by a different version
+			cache.connection.execute("UPDATE metadata SET value = 'old' WHERE key = 'version'")
+			cache.checkVersion()
+			self.assertEqual(cache.lookup(self.SOURCE_FILENAME), None)
+		finally:
+			cache.close()
+
+	def test_getFingerprint(self):
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			fingerprint = cache.getFingerprint([ self.SOURCE_FILENAME ])
+			self.assertEqual(cache.getFingerprint([ self.SOURCE_FILENAME ]), fingerprint)
+			self.assertNotEqual(cache.getFingerprint([]), fingerprint)
+			# Test fingerprint changes when a file is modified
+			self.touch(self.SOURCE_FILENAME)
+			self.assertNotEqual(cache.getFingerprint([ self.SOURCE_FILENAME ]), fingerprint)
+		finally:
+			cache.close()
+
+	def test_lookupGraph(self):
+		graph = DependencyGraph({ "project" : set(["project.a"]), "project.a" : set(["sys"]) })
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			self.assertEqual(cache.lookupGraph("/project", "fingerprint"), None)
+			cache.storeGraph("/project", "fingerprint", graph)
+			# Test graph with a different fingerprint isn't used
+			self.assertEqual(cache.lookupGraph("/project", "other"), None)
+			self.assertEqual(cache.lookupGraph("/other_project", "fingerprint"), None)
+		finally:
+			cache.close()
+		# Test graph persists, along with its reverse arrays
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			cachedGraph = cache.lookupGraph("/project", "fingerprint")
+			self.assertEqual(cachedGraph, graph)
+			self.assertEqual(cachedGraph.names, graph.names)
+			self.assertNotEqual(cachedGraph.reverseOffsets, None)
+			self.assertEqual(cachedGraph.getTransitiveDependants("sys"), set(["project", "project.a"]))
+			# Test graphs are discarded along with files when the version changes
+			cache.connection.execute("UPDATE metadata SET value = 'old' WHERE key = 'version'")
+			cache.checkVersion()
+			self.assertEqual(cache.lookupGraph("/project", "fingerprint"), None)
+		finally:
+			cache.close()
+
+
+class TestCachingExtractor(unittest.TestCase):
+
+	CACHE_DIRECTORY = ".test_caching_extractor"
+
+	def tearDown(self):
+		if os.path.isdir(self.CACHE_DIRECTORY):
+			shutil.rmtree(self.CACHE_DIRECTORY)
+
+	def test_extract(self):
+		filename = os.path.abspath("project/pack2/e.py")
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			extractor = CachingExtractor(ModuleDependencyExtractor(), cache)
+			# First extraction is a miss and second is a hit
+			for i in range(2):
+				self.assertEqual(extractor.extract(filename), set([ ParsedImport("subpack.f", True) ]))
+			self.assertEqual(cache.hits, 1)
+			self.assertEqual(cache.misses, 1)
+		finally:
+			cache.close()
+
+	def test_extract_changed(self):
+		filename = os.path.abspath(".test_caching_extractor_source.py")
+		with open(filename, "w") as f:
+			f.write("import a\n")
+		# Extractor which changes the file while it's being extracted
+		class ChangingExtractor(ModuleDependencyExtractor):
+			def extract(self, filename):
+				dependencies = super().extract(filename)
+				with open(filename, "a") as f:
+					f.write("import b\n")
+				return dependencies
+		cache = ExtractionCache(self.CACHE_DIRECTORY)
+		try:
+			extractor = CachingExtractor(ChangingExtractor(), cache)
+			self.assertEqual(extractor.extract(filename), set([ ParsedImport("a", False) ]))
+			# Test the out of date dependencies weren't stored
+			self.assertEqual(cache.lookup(filename), None)
+		finally:
+			cache.close()
+			os.remove(filename)
@@ -1,6 +1,7 @@
 import unittest
 import sys
 import os
+import io
 
 sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
 from moduledependency.cli import ArgumentProcessor
@@ -62,6 +63,18 @@ class TestArgumentProcessor(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             self.processor.parseOptions(["-d=3", "--max-boxes=10", "--name=donald", "--invalid="])
 
+    def test_parseChangedFiles(self):
+        self.assertEqual(self.processor.parseChangedFiles("a.py"), [ "a.py" ])
+        self.assertEqual(self.processor.parseChangedFiles("a.py, b.py,,"), [ "a.py", "b.py" ])
+        # Test reading paths from a stream
+        stream = io.StringIO("a.py\n\npack/b.py\n")
+        self.assertEqual(self.processor.parseChangedFiles("-", stream), [ "a.py", "pack/b.py" ])
+
+    def test_parseProjectDirectories(self):
+        self.assertEqual(self.processor.parseProjectDirectories("a, b,,"), [ "a", "b" ])
+        stream = io.StringIO("a\n\nb/c\n")
+        self.assertEqual(self.processor.parseProjectDirectories("-", stream), [ "a", "b/c" ])
+
     def test_help(self):
         for args in [ [], ["-h"], ["--help"], ["test.py", "o=dot", "-h"], ["test.py" "o=dot", "--help"] ]:
             with self.assertRaises(RuntimeError) as cm:
@@ -72,6 +85,24 @@ class TestArgumentProcessor(unittest.TestCase):
         # Test invalid depth values
         self.checkForErrors([ ["-d=haha"], ["--depth=haha"] ], "Invalid depth 'haha' provided", ValueError) # not integer
         self.checkForErrors([ ["-d=-1"], ["--depth=-441"] ], "Maximum depth cannot be negative", ValueError) # negative integers
+        # Test invalid numbers of jobs
+        self.checkForErrors([ ["--jobs=haha"] ], "Invalid number of jobs 'haha' provided", ValueError) # not integer
+        self.checkForErrors([ ["--jobs=0"], ["--jobs=-2"] ], "Number of jobs must be at least one", ValueError)
+        # Test invalid concurrency limits
+        self.checkForErrors([ ["--io-concurrency=many"] ], "Invalid concurrency limit 'many' provided", ValueError)
+        self.checkForErrors([ ["--io-concurrency=0"] ], "Concurrency limit must be at least one", ValueError)
+        # Test invalid numbers of modules to print the weights of
+        self.checkForErrors([ ["--weights=all"] ], "Invalid number of modules 'all' provided", ValueError)
+        self.checkForErrors([ ["--weights=0"] ], "Number of modules must be at least one", ValueError)
+        # Test invalid watch intervals
+        self.checkForErrors([ ["--watch=haha"] ], "Invalid interval 'haha' provided", ValueError) # not a number
+        # Test invalid project directories, and options which need a single project
+        self.checkForErrors([ ["--projects=.,non-existent"] ], "Directory 'non-existent' does not exist", IOError)
+        self.checkForErrors([ ["--projects=.", "--watch=1"], ["--projects=.", "--changed=a.py"] ],
+            "Many projects cannot be watched or checked for changed files")
+        self.checkForErrors([ ["--projects=.", "--output-dir=out"] ],
+            "An outputter must be given to write output to a directory")
+        self.checkForErrors([ ["--watch=0"], ["--watch=-1.5"] ], "Interval must be greater than zero", ValueError)
         # Test absence of mandatory parameters
         with self.assertRaises(RuntimeError) as cm:
             self.processor.process(["test.py", "-o=dot" ])
@@ -88,6 +119,43 @@ class TestArgumentProcessor(unittest.TestCase):
         self.assertEqual(self.processor.maxDepth, 1)
         self.processor.process(["test.py", "-p=.", "-d=29483"])
         self.assertEqual(self.processor.maxDepth, 29483)
+        # Test default and valid numbers of jobs
+        self.assertEqual(self.processor.jobs, 1)
+        self.processor.process(["test.py", "-p=.", "--jobs=4"])
+        self.assertEqual(self.processor.jobs, 4)
+        # Test default and valid concurrency limits
+        self.assertEqual(self.processor.ioConcurrency, None)
+        self.processor.process(["test.py", "-p=.", "--io-concurrency=16"])
+        self.assertEqual(self.processor.ioConcurrency, 16)
+        # Test default and valid watch intervals
+        self.assertEqual(self.processor.watchInterval, None)
+        self.processor.process(["test.py", "-p=.", "--watch=0.5"])
+        self.assertEqual(self.processor.watchInterval, 0.5)
+        # Test default and valid transitive queries
+        self.assertEqual(self.processor.dependsOn, None)
+        self.assertEqual(self.processor.requiredBy, None)
+        self.processor.process(["test.py", "-p=.", "--depends-on=project.a", "--required-by=project.b",
+            "--cycles=yes", "--condense=yes"])
+        self.assertEqual(self.processor.dependsOn, "project.a")
+        self.assertEqual(self.processor.requiredBy, "project.b")
+        self.assertEqual(self.processor.getOutputterArguments(), {})
+        # Test default and valid numbers of modules to print the weights of
+        self.assertEqual(self.processor.weightCount, None)
+        self.processor.process(["test.py", "-p=.", "--weights=5"])
+        self.assertEqual(self.processor.weightCount, 5)
+        # Test default and valid project directories
+        self.assertEqual(self.processor.projectDirectories, None)
+        self.processor.process(["test.py", "--projects=project,files"])
+        self.assertEqual(self.processor.projectDirectories, [ "project", "files" ])
+        self.assertEqual(self.processor.projectDirectory, None)
+        self.processor.process(["test.py", "-p=.", "--projects=project", "--output-dir=out", "-o=dot"])
+        self.assertEqual(self.processor.projectDirectories, [ ".", "project" ])
+        self.assertEqual(self.processor.getOption("output-dir"), "out")
+        self.assertEqual(self.processor.getOutputterArguments(), {})
+        # Test default and valid changed files
+        self.assertEqual(self.processor.changedFiles, None)
+        self.processor.process(["test.py", "-p=.", "--changed=a.py,pack/b.py"])
+        self.assertEqual(self.processor.changedFiles, [ "a.py", "pack/b.py" ])
         # Test valid outputter name
         self.processor.process(["test.py", "-p=.", "-o=dot"])
         self.assertEqual(self.processor.outputterName, "dot")
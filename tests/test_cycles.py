@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+import random
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from moduledependency.cycles import CycleDetector, Condensation
+from moduledependency.graph import DependencyGraph
+
+
+class TestCycleDetector(unittest.TestCase):
+
+	DEPENDENCIES = {
+		"project" : set(["project.pack", "project.pack2"]),
+		"project.a" : set(["project.a", "project.pack"]),
+		"project.pack" : set(["project.pack.b"]),
+		"project.pack.b" : set(["project.pack.c"]),
+		"project.pack.c" : set(["project.pack", "project.pack2"]),
+		"project.pack2" : set(["project.pack2.d"]),
+		"project.pack2.d" : set(["project.pack2"])
+	}
+
+	def setUp(self):
+		self.detector = CycleDetector()
+
+	def tearDown(self):
+		self.detector = None
+
+	def test_findComponentIds(self):
+		graph = DependencyGraph(self.DEPENDENCIES)
+		componentIds, numComponents = self.detector.findComponentIds(graph)
+		self.assertEqual(len(componentIds), graph.numNodes)
+		self.assertEqual(numComponents, 4)
+		componentOf = lambda name: componentIds[graph.getId(name)]
+		self.assertEqual(componentOf("project.pack"), componentOf("project.pack.c"))
+		self.assertEqual(componentOf("project.pack2"), componentOf("project.pack2.d"))
+		self.assertNotEqual(componentOf("project.pack"), componentOf("project.pack2"))
+		# Test components are in reverse topological order
+		self.assertTrue(componentOf("project.pack2") < componentOf("project.pack") < componentOf("project"))
+		# Test empty graph
+		self.assertEqual(self.detector.findComponentIds(DependencyGraph())[1], 0)
+
+	def test_findCycles(self):
+		self.assertEqual(self.detector.findCycles({}), [])
+		self.assertEqual(self.detector.findCycles({ "a" : set(["b"]), "b" : set() }), [])
+		self.assertEqual(self.detector.findCycles(self.DEPENDENCIES), [
+			[ "project.a" ],
+			[ "project.pack", "project.pack.b", "project.pack.c" ],
+			[ "project.pack2", "project.pack2.d" ]
+		])
+		self.assertEqual(self.detector.findCycles(DependencyGraph(self.DEPENDENCIES)),
+			self.detector.findCycles(self.DEPENDENCIES))
+
+	def test_deepGraph(self):
+		# Test chain far deeper than the recursion limit, closed into one cycle
+		numModules = sys.getrecursionlimit() * 10
+		dependencies = { "m{}".format(i) : set(["m{}".format(i + 1)]) for i in range(numModules) }
+		condensation = self.detector.condense(dependencies)
+		self.assertEqual(len(condensation.components), numModules + 1)
+		self.assertEqual(condensation.getCycles(), [])
+		dependencies["m{}".format(numModules)] = set(["m0"])
+		cycles = self.detector.findCycles(dependencies)
+		self.assertEqual(len(cycles), 1)
+		self.assertEqual(len(cycles[0]), numModules + 1)
+
+	def test_randomGraphs(self):
+		# Compare components with the modules which reach each other
+		randomGenerator = random.Random(0)
+		for i in range(50):
+			names = [ "m{}".format(j) for j in range(12) ]
+			dependencies = { name : set( randomGenerator.sample(names, randomGenerator.randint(0, 2)) )
+				for name in names }
+			graph = DependencyGraph(dependencies)
+			condensation = self.detector.condense(graph)
+			for name in names:
+				expected = set([ name ]) | set( other for other in graph.getTransitiveDependencies(name)
+					if name in graph.getTransitiveDependencies(other) )
+				component = condensation.components[ condensation.componentIds[name] ]
+				self.assertEqual(set(component), expected)
+
+
+class TestCondensation(unittest.TestCase):
+
+	def setUp(self):
+		self.condensation = CycleDetector().condense(TestCycleDetector.DEPENDENCIES)
+
+	def tearDown(self):
+		self.condensation = None
+
+	def test_getComponentName(self):
+		componentIds = self.condensation.componentIds
+		self.assertEqual(self.condensation.getComponentName(componentIds["project"]), "project")
+		self.assertEqual(self.condensation.getComponentName(componentIds["project.pack.b"]),
+			"(project.pack, project.pack.b, project.pack.c)")
+
+	def test_getGraph(self):
+		graph = self.condensation.getGraph()
+		self.assertIsInstance(graph, DependencyGraph)
+		self.assertEqual(graph, {
+			"project" : set(["(project.pack, project.pack.b, project.pack.c)", "(project.pack2, project.pack2.d)"]),
+			"project.a" : set(["(project.pack, project.pack.b, project.pack.c)"]),
+			"(project.pack, project.pack.b, project.pack.c)" : set(["(project.pack2, project.pack2.d)"]),
+			"(project.pack2, project.pack2.d)" : set()
+		})
+		self.assertIs(self.condensation.getGraph(), graph)
+		# Test condensation has no cycles left
+		self.assertEqual(CycleDetector().findCycles(graph), [])
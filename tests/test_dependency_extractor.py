@@ -3,10 +3,12 @@ import sys
 import os
 import platform
 import shutil
+import tempfile
 
 sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
 from moduledependency.dependency_extractor import ModuleDependencyExtractor
 from moduledependency.parser import ParsedImport
+from moduledependency.tokeniser import Tokeniser, RegexTokeniser
 
 
 class TestModuleDependencyExtractor(unittest.TestCase):
@@ -28,6 +30,10 @@ class TestModuleDependencyExtractor(unittest.TestCase):
 		# Test objects were constructed successfully
 		self.assertEqual(self.extractorNoWhitelist.whitelist, None)
 		self.assertEqual(self.extractorWithWhitelist.whitelist, self.whitelist)
+		# Test tokeniser used by default and a custom tokeniser
+		self.assertTrue( isinstance(self.extractorNoWhitelist.tokeniser, Tokeniser) )
+		regexTokeniser = RegexTokeniser()
+		self.assertIs(ModuleDependencyExtractor(tokeniser=regexTokeniser).tokeniser, regexTokeniser)
 
 	def test_usingWhitelist(self):
 		self.assertFalse( self.extractorNoWhitelist.usingWhitelist() )
@@ -88,6 +94,21 @@ class TestModuleDependencyExtractor(unittest.TestCase):
 		# Ensuring partial matches at module NAME level are not allowed
 		self.assertFalse( testExtractor.inWhitelist( ParsedImport(".some", True) ) ) # "from . import something"
 
+	def test_inWhitelist_index(self):
+		# Test the whitelist index gives the same answers as checking every name
+		whitelist = [ "a", "b.c", "b.c.d", "e.f.g", "h" ]
+		extractor = ModuleDependencyExtractor(whitelist)
+		names = [ "a", "a.x", "b", "b.c", "b.c.x", "c", "d", "e.f", "e.f.g.h", "f", "g", "x", "x.a", ".a", ".c", ".x" ]
+		for name in names:
+			for relative in (False, True):
+				moduleName = name
+				if relative and moduleName[0] == ".":
+					moduleName = moduleName[1:]
+				expected = any( extractor.belongsTo(package, moduleName) or
+					(relative and extractor.packageHasComponent(package, moduleName))
+					for package in whitelist )
+				self.assertEqual(extractor.inWhitelist( ParsedImport(name, relative) ), expected)
+
 	def test_applyWhitelist(self):
 		DISALLOWED_DEPDENDENCIES = set([
 			ParsedImport("aha", False),
@@ -143,4 +164,58 @@ class TestModuleDependencyExtractor(unittest.TestCase):
 		self.assertEqual(self.extractorNoWhitelist.extract("files/some_dependencies.py"),
 			set(EXPECTED_WITHOUT_WHITELIST)) # should have blocked modules in too!!!
 		self.assertEqual(self.extractorWithWhitelist.extract("files/some_dependencies.py"),
-			set(EXPECTED_WITH_WHITELIST))
\ No newline at end of file
+			set(EXPECTED_WITH_WHITELIST))
+		# Test same file with the regex-based tokeniser
+		regexExtractor = ModuleDependencyExtractor(self.whitelist, RegexTokeniser())
+		self.assertEqual(regexExtractor.extract("files/some_dependencies.py"),
+			set(EXPECTED_WITH_WHITELIST))
+		# Test tokenising whole files instead of only their import statements
+		fullExtractor = ModuleDependencyExtractor(prefilter=False)
+		self.assertEqual(fullExtractor.extract("files/some_dependencies.py"),
+			set(EXPECTED_WITHOUT_WHITELIST))
+		self.assertEqual(fullExtractor.extract("files/no_dependencies.py"), set())
+
+	def test_extractFromMappedFile(self):
+		# Test memory mapping requires import statements to be prefiltered
+		with self.assertRaises(ValueError):
+			ModuleDependencyExtractor(prefilter=False, memoryMap=True)
+		# Test the same dependencies are found as when files are read as text
+		mappedExtractor = ModuleDependencyExtractor(memoryMap=True)
+		mappedWhitelistExtractor = ModuleDependencyExtractor(self.whitelist, memoryMap=True)
+		for filename in [ "files/no_dependencies.py", "files/blocked_dependencies.py", "files/some_dependencies.py" ]:
+			self.assertEqual(mappedExtractor.extract(filename), self.extractorNoWhitelist.extract(filename))
+			self.assertEqual(mappedWhitelistExtractor.extract(filename), self.extractorWithWhitelist.extract(filename))
+
+		directory = tempfile.mkdtemp()
+		try:
+			sources = {
+				"empty.py" : b"",
+				"bom.py" : b"\xef\xbb\xbfimport a\r\n",
+				# Identifiers decoded using the PEP 263 declaration
+				"latin1.py" : "# -*- coding: latin-1 -*-\nx = '\u00e9'\nimport caf\u00e9\n".encode("latin-1"),
+				# Second byte of the first character is a backslash, so the
+				# file is decoded in full instead of being searched as bytes
+				"shift_jis.py" : "# coding=shift_jis\nx = '\u8868'; import a\n".encode("shift_jis"),
+				# Invalid declarations are ignored
+				"invalid.py" : b"# coding: not-an-encoding\nimport a\n",
+				# Trailing comma in the last statement of the file
+				"trailing_comma.py" : b"import a\nfrom b import (\n    c,\n    d,\n)\n"
+			}
+			for name, source in sources.items():
+				with open(os.path.join(directory, name), "wb") as f:
+					f.write(source)
+			extract = lambda name: mappedExtractor.extract(os.path.join(directory, name))
+			self.assertEqual(extract("empty.py"), set())
+			self.assertEqual(extract("bom.py"), set([ ParsedImport("a", False) ]))
+			self.assertEqual(extract("latin1.py"), set([ ParsedImport("caf\u00e9", False) ]))
+			self.assertEqual(extract("shift_jis.py"), set([ ParsedImport("a", False) ]))
+			self.assertEqual(extract("invalid.py"), set([ ParsedImport("a", False) ]))
+			self.assertEqual(extract("trailing_comma.py"), set([ ParsedImport("a", False),
+				ParsedImport("b.c", False), ParsedImport("b.d", False) ]))
+			# Test bytes give the same dependencies, with and without prefiltering
+			unfilteredExtractor = ModuleDependencyExtractor(prefilter=False)
+			for name, source in sources.items():
+				self.assertEqual(mappedExtractor.extractFromBytes(source), extract(name))
+				self.assertEqual(unfilteredExtractor.extractFromBytes(source), extract(name))
+		finally:
+			shutil.rmtree(directory)
\ No newline at end of file
@@ -3,7 +3,8 @@ import sys
 import os
 sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
 
-from moduledependency.depth_pruner import DepthPruner
+from moduledependency.depth_pruner import DepthPruner, PruningIndex
+from moduledependency.graph import DependencyGraph
 
 
 
@@ -96,4 +97,57 @@ class TestDepthPruner(unittest.TestCase):
         # Test with depth 1 (this will MERGE many of the dependency lists together)
         self.assertEqual( self.pruner.prune(DEPENDENCIES, 1), DEPTH1_DEPENDENCIES )
         # Test with depth 2
-        self.assertEqual( self.pruner.prune(DEPENDENCIES, 2), DEPTH2_DEPENDENCIES)
\ No newline at end of file
+        self.assertEqual( self.pruner.prune(DEPENDENCIES, 2), DEPTH2_DEPENDENCIES)
+        # Test with dependencies given as a DependencyGraph
+        pruned = self.pruner.prune(DependencyGraph(DEPENDENCIES), 1)
+        self.assertIsInstance(pruned, DependencyGraph)
+        self.assertEqual(pruned, DEPTH1_DEPENDENCIES)
+
+    def test_pruneAll(self):
+        DEPENDENCIES = {
+            "project.a" : set(["project.a", "project.pack.b"]),
+            "project.pack.b" : set(["project.pack.subpack.c", "sys.path"]),
+            "project.pack.subpack.c" : set()
+        }
+        # Test with negative maximum depth
+        with self.assertRaises(ValueError):
+            self.pruner.pruneAll(DEPENDENCIES, -1)
+        # Test every depth up to the deepest name is included by default
+        allDepths = self.pruner.pruneAll(DEPENDENCIES)
+        self.assertEqual(sorted(allDepths.keys()), [ 0, 1, 2, 3 ])
+        for depth, prunedDependencies in allDepths.items():
+            self.assertEqual(prunedDependencies, self.pruner.prune(DEPENDENCIES, depth))
+        self.assertEqual(allDepths[1], {
+            "project.a" : set(["project.pack"]),
+            "project.pack" : set(["sys.path"])
+        })
+        # Test with a maximum depth
+        self.assertEqual(sorted(self.pruner.pruneAll(DEPENDENCIES, 1).keys()), [ 0, 1 ])
+        self.assertEqual(self.pruner.pruneAll({}), { 0 : {} })
+
+
+class TestPruningIndex(unittest.TestCase):
+
+    def test_construction(self):
+        index = PruningIndex({ "a.b" : set(["a.c", "d"]), "d" : set() })
+        # Test names are interned
+        self.assertEqual(sorted(index.names), [ "a.b", "a.c", "d" ])
+        self.assertEqual(index.names[index.ids["a.c"]], "a.c")
+        self.assertEqual(list(index.dependantIds), [ index.ids["a.b"], index.ids["d"] ])
+        self.assertEqual(list(index.edgeOffsets), [ 0, 2, 2 ])
+        self.assertEqual(index.maximumLevels, 2)
+        self.assertEqual([ index.levels[index.ids[name]] for name in ("a.b", "a.c", "d") ], [ 2, 2, 1 ])
+
+    def test_getAncestorTable(self):
+        index = PruningIndex({ "a.b" : set(["a.c", "d"]) })
+        with self.assertRaises(ValueError):
+            index.getAncestorTable(-1)
+        table = index.getAncestorTable(0)
+        # Test pruned names are interned when the table is built
+        self.assertEqual(index.names[table[index.ids["a.b"]]], "a")
+        self.assertEqual(table[index.ids["a.c"]], index.ids["a"])
+        self.assertEqual(index.names[table[index.ids["d"]]], "d")
+        table = index.getAncestorTable(1)
+        self.assertEqual(index.names[table[index.ids["a.b"]]], "a.b")
+        # Test tables past the deepest name are shared
+        self.assertIs(index.getAncestorTable(5), table)
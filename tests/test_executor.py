@@ -1,10 +1,16 @@
 import unittest
 import sys
 import os
+import shutil
+import io
+import contextlib
+import ast
 sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
 
 from moduledependency.executor import Executor
 from moduledependency.outputter import ResultOutputter
+from moduledependency.stats import PipelineStatistics
+from moduledependency.outputters.python import Outputter as PythonOutputter
 
 
 
@@ -25,6 +31,16 @@ class MockResultOutputter(ResultOutputter):
 				f.write("]\n")
 
 
+class MockStreamOutputter(ResultOutputter):
+
+	EXTENSION = "out"
+
+	def createOutput(self, dependencies):
+		# Same format as MockResultOutputter, written to the stream
+		return "\n".join( "{} = [ {}]".format(key, "".join( dep + " " for dep in sorted(dependencies[key]) ))
+			for key in sorted(dependencies.keys()) )
+
+
 class TestExecutor(unittest.TestCase):
 
 	EXPECTED_DEPENDENCIES = {
@@ -98,13 +114,256 @@ project.pack2 = [ ]
 		self.executor.setMaximumDepth(None)
 		self.assertEqual(self.executor.maximumDepth, None)
 
+	def test_setIoConcurrency(self):
+		# Test default concurrency limit
+		self.assertEqual(self.executor.ioConcurrency, None)
+		# Test invalid concurrency limits
+		with self.assertRaises(TypeError):
+			self.executor.setIoConcurrency("2")
+		with self.assertRaises(ValueError):
+			self.executor.setIoConcurrency(0)
+		# Test valid concurrency limits
+		self.executor.setIoConcurrency(16)
+		self.assertEqual(self.executor.ioConcurrency, 16)
+		self.executor.setIoConcurrency(None)
+		self.assertEqual(self.executor.ioConcurrency, None)
+
+	def test_setJobs(self):
+		# Test default number of jobs
+		self.assertEqual(self.executor.jobs, 1)
+		# Test invalid numbers of jobs
+		with self.assertRaises(TypeError):
+			self.executor.setJobs("2")
+		with self.assertRaises(ValueError):
+			self.executor.setJobs(0)
+		with self.assertRaises(ValueError):
+			self.executor.setJobs(-3)
+		# Test valid numbers of jobs
+		self.executor.setJobs(4)
+		self.assertEqual(self.executor.jobs, 4)
+		self.executor.setJobs(1)
+		self.assertEqual(self.executor.jobs, 1)
+
 	def test_searchForDependencies(self):
 		# Test non-existent project directory
 		with self.assertRaises(IOError):
 			self.executor.searchForDependencies("non_existent_dir")
 		# Test valid project directory
 		self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
+		# Test same project directory using multiple processes
+		self.executor.setJobs(2)
+		self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
+		# Test reading files concurrently
+		self.executor.setIoConcurrency(4)
+		self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
+		self.executor.setIoConcurrency(None)
+		# Test memory mapping files
+		self.executor.setMemoryMapping(True)
+		self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
+		# Test AST engine
+		with self.assertRaises(ValueError):
+			self.executor.setEngine("unknown")
+		self.executor.setEngine("ast")
+		self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
+		self.executor.setJobs(1)
+		self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
+		# Test only import-time imports, which the test project only has
+		self.executor.setImportTimeOnly(True)
+		self.assertEqual(self.executor.createExtractor().ENGINE, "ast:import-time")
+		self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
+		self.executor.setJobs(2)
+		self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
 		
+	def test_setCacheDirectory(self):
+		try:
+			self.executor.setCacheDirectory(".test_executor_cache")
+			self.assertTrue( os.path.isdir(".test_executor_cache") )
+			# Test first search fills the cache and second search uses it
+			self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
+			self.assertEqual(self.executor.cache.hits, 0)
+			numFiles = self.executor.cache.misses
+			self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
+			self.assertEqual(self.executor.cache.hits, numFiles)
+			# Test cache is also used when using multiple processes
+			self.executor.setJobs(2)
+			self.assertEqual(self.executor.searchForDependencies("project"), self.EXPECTED_DEPENDENCIES)
+			self.assertEqual(self.executor.cache.hits, numFiles * 2)
+			# Test clearing the cache
+			self.executor.setCacheDirectory(None)
+			self.assertEqual(self.executor.cache, None)
+		finally:
+			self.executor.setCacheDirectory(None)
+			if os.path.isdir(".test_executor_cache"):
+				shutil.rmtree(".test_executor_cache")
+
+	def test_getDependencyGraph(self):
+		with self.assertRaises(IOError):
+			self.executor.getDependencyGraph("non_existent_dir")
+		self.assertEqual(self.executor.getDependencyGraph("project"), self.EXPECTED_DEPENDENCIES)
+		try:
+			# Test graph is cached and reused while no file changes
+			self.executor.setCacheDirectory(".test_executor_cache")
+			self.assertEqual(self.executor.getDependencyGraph("project"), self.EXPECTED_DEPENDENCIES)
+			numMisses = self.executor.cache.misses
+			self.assertEqual(self.executor.getDependencyGraph("project"), self.EXPECTED_DEPENDENCIES)
+			self.assertEqual(self.executor.cache.misses, numMisses)
+			self.assertEqual(self.executor.cache.hits, 0)
+		finally:
+			self.executor.setCacheDirectory(None)
+			if os.path.isdir(".test_executor_cache"):
+				shutil.rmtree(".test_executor_cache")
+
+	def test_findAffectedModules(self):
+		# Test files which aren't modules of the project
+		self.assertEqual(self.executor.findAffectedModules("project", []), [])
+		self.assertEqual(self.executor.findAffectedModules("project", [ "project/b.txt", "test_executor.py" ]), [])
+		# Test module which nothing imports
+		self.assertEqual(self.executor.findAffectedModules("project", [ "project/__main__.py" ]),
+			[ "project.__main__" ])
+		# Test module in a cycle, which is imported through other modules
+		self.assertEqual(self.executor.findAffectedModules("project", [ os.path.abspath("project/pack2/e.py") ]), [
+			"project.__main__", "project.pack.subpack2", "project.pack.subpack2.d",
+			"project.pack2.e", "project.pack2.subpack.f" ])
+		# Test changing a package affects modules importing anything inside it
+		self.assertEqual(self.executor.findAffectedModules("project", [ "project/pack2/__init__.py" ]),
+			self.executor.findAffectedModules("project", [ "project/pack2/__init__.py", "project/pack2/e.py" ]))
+
+	def test_setWeightAnalysis(self):
+		self.assertEqual(self.executor.weights, None)
+		self.executor.setWeightAnalysis(True)
+		self.executor.setMaximumDepth(1)
+		self.assertEqual(self.executor.execute("project"), self.EXPECTED_DEPENDENCIES_WITH_DEPTH_LIMIT)
+		# Test weights are found before pruning, so every module loaded is counted
+		weights = self.executor.weights
+		self.assertEqual(weights.getTotal("project.__main__")[0], 8)
+		# Importing c runs the __init__.py of subpack2, which imports d
+		self.assertEqual(weights.getTotal("project.pack.subpack2.subsubpack.c")[0], 6)
+		with open(os.path.join("project", "pack2", "e.py"), "rb") as f:
+			self.assertEqual(weights.getSize("project.pack2.e")[1], len(f.read()))
+		self.assertEqual(weights.getHeaviest(1), [ "project.__main__" ])
+		# Test imports of cached modules are counted
+		try:
+			self.executor.setJobs(2)
+			self.executor.setCacheDirectory(".test_executor_cache")
+			self.executor.searchForDependencies("project")
+			self.executor.searchForDependencies("project")
+			self.assertEqual(self.executor.weights.totals, weights.totals)
+		finally:
+			self.executor.cache.close()
+			shutil.rmtree(".test_executor_cache")
+
+	def test_setStatistics(self):
+		self.assertEqual(self.executor.statistics, None)
+		with self.assertRaises(TypeError):
+			self.executor.setStatistics({})
+		statistics = PipelineStatistics()
+		stages = []
+		statistics.addObserver(lambda stage, wallTime, cpuTime, statistics: stages.append(stage))
+		self.executor.setStatistics(statistics)
+		self.executor.setMaximumDepth(1)
+		self.executor.setCycleDetection(True)
+		self.assertEqual(self.executor.execute("project"), self.EXPECTED_DEPENDENCIES_WITH_DEPTH_LIMIT)
+		self.assertEqual(stages, [ "walk", "extract", "resolve", "whitelist", "prune", "cycles" ])
+		numModules = statistics.counters["modules"]
+		self.assertGreater(numModules, 0)
+		self.assertEqual(statistics.counters["files"], numModules)
+		self.assertGreater(statistics.counters["bytes"], 0)
+		self.assertGreater(statistics.counters["tokens"], 0)
+		self.assertGreater(statistics.counters["imports"], 0)
+		self.assertEqual(statistics.counters["dependencies"],
+			sum( len(dependencies) for dependencies in self.EXPECTED_DEPENDENCIES.values() ))
+		# Test counts made in worker processes are recorded
+		statistics = PipelineStatistics()
+		self.executor.setStatistics(statistics)
+		self.executor.setJobs(2)
+		self.executor.searchForDependencies("project")
+		self.assertEqual(statistics.counters["files"], numModules)
+		self.assertGreater(statistics.counters["tokens"], 0)
+		# Test cache hits are counted
+		try:
+			self.executor.setJobs(1)
+			self.executor.setCacheDirectory(".test_executor_cache")
+			self.executor.getDependencyGraph("project")
+			self.executor.getDependencyGraph("project")
+			self.executor.searchForDependencies("project")
+			self.assertEqual(statistics.counters["graph_cache_hits"], 1)
+			self.assertEqual(statistics.counters["cache_misses"], numModules)
+			self.assertEqual(statistics.counters["cache_hits"], numModules)
+		finally:
+			self.executor.setCacheDirectory(None)
+			if os.path.isdir(".test_executor_cache"):
+				shutil.rmtree(".test_executor_cache")
+		# Test nothing is recorded once statistics are cleared
+		self.executor.setStatistics(None)
+		self.executor.searchForDependencies("project")
+		self.assertEqual(statistics.counters["files"], numModules * 2)
+
+	def test_watch(self):
+		diffs = []
+		# Test non-existent project directory
+		with self.assertRaises(IOError):
+			self.executor.watch("non_existent_dir", 0.01, diffs.append, 1)
+		# Test project which doesn't change while being watched
+		self.assertEqual(self.executor.watch("project", 0.01, diffs.append, 2), self.EXPECTED_DEPENDENCIES)
+		self.assertEqual(diffs, [])
+		# Test watched dependencies are pruned the same as execute()
+		for depth in (0, 1, None):
+			self.executor.setMaximumDepth(depth)
+			self.assertEqual(self.executor.watch("project", 0.01, diffs.append, 0),
+				self.executor.execute("project", stream=io.StringIO()))
+		self.assertEqual(diffs, [])
+
+	def test_executeProjects(self):
+		projects = [ "project", os.path.join("project", "pack2") ]
+		# Test non-existent project directory, before any project is searched
+		with self.assertRaises(IOError):
+			self.executor.executeProjects(projects + [ "non_existent_dir" ])
+		# Test results are returned and reported in order, with workers shared between projects
+		reported = []
+		self.executor.setJobs(2)
+		results = self.executor.executeProjects(projects,
+			callback=lambda projectDirectory, dependencies: reported.append(projectDirectory))
+		self.assertEqual(list(results.keys()), [ os.path.abspath(project) for project in projects ])
+		self.assertEqual(reported, list(results.keys()))
+		self.assertEqual(results[os.path.abspath("project")], self.EXPECTED_DEPENDENCIES)
+		self.assertEqual(results[os.path.abspath(projects[1])], {
+			"pack2.e" : set(["pack2.subpack.f"]),
+			"pack2.subpack.f" : set(["pack2.e"])
+		})
+		self.assertEqual(self.executor.pool, None)
+		self.executor.setJobs(1)
+		self.executor.setIoConcurrency(4)
+		self.assertEqual(self.executor.executeProjects(projects), results)
+		self.executor.setIoConcurrency(None)
+
+		# Test outputs are combined in standard output, each after a header naming its project
+		self.executor.setOutputter( MockStreamOutputter() )
+		stream = io.StringIO()
+		with contextlib.redirect_stdout(stream):
+			self.executor.executeProjects([ "project", "project" ])
+		header = Executor.PROJECT_HEADER.format(os.path.abspath("project")) + "\n"
+		self.assertEqual(stream.getvalue(), (header + self.EXPECTED_FILE_CONTENTS) * 2)
+		# Test each output is written to its own file, numbered if projects have the same name
+		try:
+			self.executor.executeProjects([ "project", "project" ], ".test_executor_output")
+			self.assertEqual(sorted(os.listdir(".test_executor_output")), [ "project-2.out", "project.out" ])
+			for filename in [ "project.out", "project-2.out" ]:
+				with open(os.path.join(".test_executor_output", filename), "r") as f:
+					self.assertEqual(f.read(), self.EXPECTED_FILE_CONTENTS)
+		finally:
+			shutil.rmtree(".test_executor_output")
+		# Test each project's part of the combined output can be parsed on its own
+		self.executor.setOutputter( PythonOutputter() )
+		stream = io.StringIO()
+		with contextlib.redirect_stdout(stream):
+			self.executor.executeProjects(projects)
+		lines = stream.getvalue().splitlines()
+		self.assertEqual(lines[0::2], [ Executor.PROJECT_HEADER.format(os.path.abspath(project))
+			for project in projects ])
+		for project, output in zip(projects, lines[1::2]):
+			self.assertEqual({ name : set(dependencies) for name, dependencies in ast.literal_eval(output).items() },
+				dict(results[os.path.abspath(project)]))
+
 	def test_execute(self):
 		try:
 			# Test non-existent project directory
@@ -130,6 +389,15 @@ project.pack2 = [ ]
 			# Also test that the output was correct
 			with open(MockResultOutputter.OUTPUT_FILE, "r") as f:
 				self.assertEqual(f.read(), self.EXPECTED_FILE_CONTENTS_WITH_DEPTH_LIMIT)	
+
+			# Test detecting cycles and outputting the condensation DAG
+			self.executor.setMaximumDepth(None)
+			self.executor.setCycleDetection(True, True)
+			self.assertEqual(self.executor.execute("project"), self.EXPECTED_DEPENDENCIES)
+			self.assertEqual(self.executor.condensation.getCycles(),
+				[ [ "project.a" ], [ "project.pack2.e", "project.pack2.subpack.f" ] ])
+			with open(MockResultOutputter.OUTPUT_FILE, "r") as f:
+				self.assertIn("(project.pack2.e, project.pack2.subpack.f) = [ ]", f.read())
 		finally: # cleanup
 			if os.path.isfile(MockResultOutputter.OUTPUT_FILE):
 				os.remove(MockResultOutputter.OUTPUT_FILE)
\ No newline at end of file
@@ -0,0 +1,175 @@
+import unittest
+import sys
+import os
+import pickle
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from moduledependency.graph import DependencyGraph
+
+
+class TestDependencyGraph(unittest.TestCase):
+
+	DEPENDENCIES = {
+		"project" : set(["project.a", "sys"]),
+		"project.a" : set(["project.pack.b", "project"]),
+		"project.pack.b" : set()
+	}
+
+	def setUp(self):
+		self.graph = DependencyGraph(self.DEPENDENCIES)
+
+	def tearDown(self):
+		self.graph = None
+
+	def test_construction(self):
+		# Test empty graph
+		emptyGraph = DependencyGraph()
+		self.assertEqual(len(emptyGraph), 0)
+		self.assertEqual(emptyGraph.numNodes, 0)
+		self.assertEqual(list(emptyGraph.edgeOffsets), [ 0 ])
+		self.assertEqual(DependencyGraph({}), {})
+		# Test dependants have the lowest IDs
+		self.assertEqual(len(self.graph), 3)
+		self.assertEqual(self.graph.numNodes, 4)
+		self.assertEqual(self.graph.numEdges, 4)
+		self.assertEqual(sorted(self.graph.names[:3]), [ "project", "project.a", "project.pack.b" ])
+		self.assertEqual(self.graph.getId("sys"), 3)
+		self.assertEqual(self.graph.getId("os"), None)
+		self.assertEqual(self.graph.getName(self.graph.getId("project.a")), "project.a")
+		# Test duplicate dependencies are removed
+		self.assertEqual(DependencyGraph({ "a" : [ "b", "b" ] }).numEdges, 1)
+		# Test copying a graph
+		copiedGraph = DependencyGraph(self.graph)
+		self.assertEqual(copiedGraph, self.graph)
+		self.assertIsNot(copiedGraph.ids, self.graph.ids)
+
+	def test_internedNames(self):
+		dependencies = { "".join(["project", ".a"]) : set([ "".join(["project", ".pack"]) ]),
+			"".join(["project", ".b"]) : set([ "".join(["project", ".pack"]) ]) }
+		graph = DependencyGraph(dependencies)
+		names = [ name for dependencyList in graph.values() for name in dependencyList ]
+		self.assertIs(names[0], names[1])
+		self.assertIs(names[0], sys.intern("project.pack"))
+
+	def test_mapping(self):
+		self.assertEqual(self.graph["project"], frozenset(["project.a", "sys"]))
+		self.assertEqual(self.graph["project.pack.b"], frozenset())
+		# Test names which are only dependencies aren't keys
+		with self.assertRaises(KeyError):
+			self.graph["sys"]
+		with self.assertRaises(KeyError):
+			self.graph["os"]
+		self.assertTrue("project.a" in self.graph)
+		self.assertFalse("sys" in self.graph)
+		self.assertEqual(sorted(self.graph), sorted(self.DEPENDENCIES.keys()))
+		self.assertEqual(self.graph.get("sys", "default"), "default")
+		# Test graphs compare equal to dictionaries with the same contents
+		self.assertEqual(self.graph, self.DEPENDENCIES)
+		self.assertEqual(self.DEPENDENCIES, self.graph)
+		self.assertNotEqual(self.graph, { "project" : set() })
+
+	def test_toDict(self):
+		self.assertEqual(DependencyGraph().toDict(), {})
+		dependencies = self.graph.toDict()
+		self.assertIsInstance(dependencies, dict)
+		self.assertIsInstance(dependencies["project"], set)
+		self.assertEqual(dependencies, self.DEPENDENCIES)
+		self.assertEqual(DependencyGraph.fromDict(dependencies).toDict(), self.DEPENDENCIES)
+
+	def test_getDependencyIds(self):
+		projectId = self.graph.getId("project")
+		dependencyIds = self.graph.getDependencyIds(projectId)
+		self.assertEqual(sorted(self.graph.getName(i) for i in dependencyIds), [ "project.a", "sys" ])
+		# Test nodes which aren't dependants have no dependencies
+		self.assertEqual(len(self.graph.getDependencyIds(self.graph.getId("sys"))), 0)
+
+	def test_iterEdges(self):
+		self.assertEqual(sorted(self.graph.iterEdges()), [
+			("project", "project.a"), ("project", "sys"),
+			("project.a", "project"), ("project.a", "project.pack.b") ])
+
+	def test_filter(self):
+		filtered = self.graph.filter(lambda name: name.startswith("project"))
+		self.assertIsInstance(filtered, DependencyGraph)
+		self.assertEqual(filtered, {
+			"project" : set(["project.a"]),
+			"project.a" : set(["project.pack.b", "project"]),
+			"project.pack.b" : set()
+		})
+		self.assertEqual(filtered.numNodes, 3)
+		# Test predicate is called once per name
+		calls = []
+		self.graph.filter(lambda name: calls.append(name) or name != "project.a")
+		self.assertEqual(sorted(calls), sorted(self.graph.names))
+		self.assertEqual(self.graph.filter(lambda name: name != "project.a"), {
+			"project" : set(["sys"]),
+			"project.pack.b" : set()
+		})
+
+	def test_pickle(self):
+		self.assertEqual(pickle.loads(pickle.dumps(self.graph)), self.DEPENDENCIES)
+
+	def test_getReverseArrays(self):
+		offsets, targets = self.graph.getReverseArrays()
+		self.assertEqual(len(offsets), self.graph.numNodes + 1)
+		dependants = {}
+		for nodeId, name in enumerate(self.graph.names):
+			dependants[name] = sorted( self.graph.getName(i) for i in targets[offsets[nodeId]:offsets[nodeId + 1]] )
+		self.assertEqual(dependants, {
+			"project" : [ "project.a" ],
+			"project.a" : [ "project" ],
+			"project.pack.b" : [ "project.a" ],
+			"sys" : [ "project" ]
+		})
+		# Test arrays are only built once
+		self.assertIs(self.graph.getReverseArrays()[1], targets)
+
+	def test_transitiveQueries(self):
+		# Test names which aren't in the graph
+		with self.assertRaises(KeyError):
+			self.graph.getTransitiveDependencies("os")
+		with self.assertRaises(KeyError):
+			self.graph.getTransitiveDependants("os")
+		# Test modules in a cycle include themselves
+		self.assertEqual(self.graph.getTransitiveDependencies("project"),
+			set(["project", "project.a", "project.pack.b", "sys"]))
+		self.assertEqual(self.graph.getTransitiveDependants("project.pack.b"), set(["project", "project.a"]))
+		self.assertEqual(self.graph.getTransitiveDependants("project.a"), set(["project", "project.a"]))
+		# Test names which have no dependencies or dependants
+		self.assertEqual(self.graph.getTransitiveDependencies("sys"), set())
+		self.assertEqual(DependencyGraph({ "a" : set(["b"]) }).getTransitiveDependants("a"), set())
+
+	def test_memoisedClosures(self):
+		chain = DependencyGraph({ "m{}".format(i) : set(["m{}".format(i + 1)]) for i in range(100) })
+		middleId = chain.getId("m50")
+		self.assertEqual(len(chain.getReachableIds(middleId)), 50)
+		# Test memoised closure is returned by later queries
+		self.assertIs(chain.getReachableIds(middleId), chain.getReachableIds(middleId))
+		chain.closureCaches[0].put(middleId, frozenset())
+		self.assertEqual(chain.getTransitiveDependencies("m50"), set())
+		# Test closures can be discarded
+		chain.clearClosures()
+		self.assertEqual(len(chain.getTransitiveDependencies("m0")), 100)
+		self.assertEqual(len(chain.getTransitiveDependants("m100")), 100)
+
+	def test_fromArrays(self):
+		graph = DependencyGraph.fromArrays(self.graph.names, self.graph.numDependants,
+			self.graph.edgeOffsets, self.graph.edgeTargets)
+		self.assertEqual(graph, self.DEPENDENCIES)
+		self.assertEqual(graph.getId("sys"), self.graph.getId("sys"))
+		self.assertEqual(graph.reverseOffsets, None)
+		# Test reverse arrays are reused
+		offsets, targets = self.graph.getReverseArrays()
+		graph = DependencyGraph.fromArrays(self.graph.names, self.graph.numDependants,
+			self.graph.edgeOffsets, self.graph.edgeTargets, offsets, targets)
+		self.assertIs(graph.getReverseArrays()[1], targets)
+
+	def test_getReachableFromIds(self):
+		ids = [ self.graph.getId("sys"), self.graph.getId("project.pack.b") ]
+		self.assertEqual(self.graph.getReachableFromIds([]), frozenset())
+		self.assertEqual(self.graph.getReachableFromIds(ids), frozenset())
+		self.assertEqual(set( self.graph.getName(i) for i in self.graph.getReachableFromIds(ids, True) ),
+			set(["project", "project.a"]))
+		# Test results aren't memoised
+		self.graph.getReachableFromIds(ids, True)
+		self.assertEqual(len(self.graph.closureCaches[1]), 0)
@@ -0,0 +1,113 @@
+import unittest
+import sys
+import os
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from moduledependency.import_finder import ImportStatementFinder
+
+
+class TestImportStatementFinder(unittest.TestCase):
+
+	def setUp(self):
+		self.finder = ImportStatementFinder()
+
+	def tearDown(self):
+		self.finder = None
+
+	def test_findStatements(self):
+		# Test with invalid type
+		with self.assertRaises(TypeError):
+			self.finder.findStatements(3636)
+		# Test sources with no imports
+		self.assertEqual(self.finder.findStatements(""), [])
+		self.assertEqual(self.finder.findStatements("x = [1, 2, 3]\nprint(x)"), [])
+		# Test simple statements, including indented ones
+		self.assertEqual(self.finder.findStatements("import a\nfrom b import c\n"),
+			[ "import a", "from b import c" ])
+		self.assertEqual(self.finder.findStatements("def f():\n\timport a\n\treturn a"),
+			[ "import a" ])
+		# Test statements following ";" and ":"
+		self.assertEqual(self.finder.findStatements("x = 1; import a; y = 2"),
+			[ "import a" ])
+		self.assertEqual(self.finder.findStatements("try: import a\nexcept ImportError: from b import c"),
+			[ "import a", "from b import c" ])
+		# Test Windows line endings
+		self.assertEqual(self.finder.findStatements("import a\r\nimport b\r\n"),
+			[ "import a\r", "import b\r" ])
+
+	def test_findStatements_multiline(self):
+		# Test parenthesised statement containing a comment
+		source = "from a import (b, # comment with )\n\tc)\nx = 1"
+		self.assertEqual(self.finder.findStatements(source),
+			[ "from a import (b, # comment with )\n\tc)" ])
+		# Test backslash-continued statements
+		source = "from a \\\nimport b, \\\r\n\tc\nx = 1"
+		self.assertEqual(self.finder.findStatements(source),
+			[ "from a \\\nimport b, \\\r\n\tc" ])
+		# Test statement at the very end of the source
+		self.assertEqual(self.finder.findStatements("import a.b"), [ "import a.b" ])
+
+	def test_findStatements_ignored(self):
+		# Test keywords inside strings and comments
+		source = '''"""Docstring
+import a
+"""
+x = 'from b import c'
+y = "import d" # import e
+z = \'\'\'
+from f import g\'\'\'
+'''
+		self.assertEqual(self.finder.findStatements(source), [])
+		# Test keywords which don't start a statement
+		source = "def gen():\n\tyield from other()\nraise ValueError() from error\nimported = important"
+		self.assertEqual(self.finder.findStatements(source), [])
+
+	def test_getScanEnd(self):
+		source = "import a\nimportlib.reload(a)\nx = 1"
+		self.assertEqual(self.finder.getScanEnd(source, source.rfind("import"), "\n"), 28)
+		self.assertEqual(self.finder.getScanEnd(source.encode(), 0, b"\n"), 8)
+		self.assertEqual(self.finder.getScanEnd("x; import a", 3, "\n"), 11)
+		# Test only the line of the last "import" is scanned beyond it
+		self.assertEqual(self.finder.findStatements("import a\nimportlib.reload(a)"), [ "import a" ])
+		self.assertEqual(self.finder.findStatements("import a\n\'\'\'\nimport b\n\'\'\'\nx = 1"), [ "import a" ])
+
+	def test_findStatementEnd(self):
+		self.assertEqual(self.finder.findStatementEnd("import a\nx", 0), 8)
+		self.assertEqual(self.finder.findStatementEnd("import a; x", 0), 8)
+		self.assertEqual(self.finder.findStatementEnd("from a import (b,\nc)\n", 0), 20)
+		self.assertEqual(self.finder.findStatementEnd("import a # comment", 0), 18)
+		# Test unterminated brackets run to the end of the source
+		self.assertEqual(self.finder.findStatementEnd("from a import (b,\nc", 0), 19)
+
+	def test_findStatementsInBytes(self):
+		# Test with invalid type
+		with self.assertRaises(TypeError):
+			self.finder.findStatementsInBytes("import a")
+		self.assertEqual(self.finder.findStatementsInBytes(b""), [])
+		# Test the same statements are found as in decoded source
+		source = '''"""Docstring
+import a
+"""
+import b.c
+from d import (e, # comment with )
+\tf)
+x = 'from g import h'; import \u00e9
+try: from .i import j
+except ImportError: from k \\
+\timport l
+'''
+		self.assertEqual(self.finder.findStatementsInBytes(source.encode("utf-8")),
+			self.finder.findStatements(source))
+		self.assertEqual(self.finder.findStatementsInBytes(source.encode("latin-1"), "latin-1"),
+			self.finder.findStatements(source))
+		# Test statement following a UTF-8 byte order mark
+		self.assertEqual(self.finder.findStatementsInBytes(b"\xef\xbb\xbfimport a\r\nimport b"),
+			[ "import a\r", "import b" ])
+
+	def test_findStatementEndInBytes(self):
+		self.assertEqual(self.finder.findStatementEndInBytes(b"import a\nx", 0), 8)
+		self.assertEqual(self.finder.findStatementEndInBytes(b"import a; x", 0), 8)
+		self.assertEqual(self.finder.findStatementEndInBytes(b"from a import (b,\nc)\n", 0), 20)
+		self.assertEqual(self.finder.findStatementEndInBytes(b"import a # comment", 0), 18)
+		self.assertEqual(self.finder.findStatementEndInBytes(b"import a \\\r\n.b\n", 0), 14)
+		self.assertEqual(self.finder.findStatementEndInBytes(b"from a import (b,\nc", 0), 19)
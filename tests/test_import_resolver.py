@@ -5,6 +5,7 @@ sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
 
 from moduledependency.import_resolver import ImportResolver
 from moduledependency.parser import ParsedImport
+from moduledependency.graph import DependencyGraph
 
 
 class TestImportResolver(unittest.TestCase):
@@ -83,6 +84,31 @@ class TestImportResolver(unittest.TestCase):
 		self.assertEqual(self.importResolver.resolveImport("/some/root/dir/package/test/test2/test3/nested.py",
 			ParsedImport("....fromnested.foobar", True)), "dir.package.fromnested.foobar")
 
+	def test_getModuleName(self):
+		self.assertEqual(self.importResolver.getModuleName("/some/root/dir/__init__.py"), "dir")
+		self.assertEqual(self.importResolver.getModuleName("/some/root/dir/package/__init__.py"), "dir.package")
+		self.assertEqual(self.importResolver.getModuleName("/some/root/dir/package/module.py"), "dir.package.module")
+		with self.assertRaises(ValueError):
+			self.importResolver.getModuleName("/not/in/assigned/root.py")
+
+	def test_caches(self):
+		resolver = ImportResolver("/some/root/dir", cacheSize=2)
+		path = "/some/root/dir/package/module.py"
+		self.assertEqual(resolver.resolveImport(path, ParsedImport(".a", True)), "dir.package.a")
+		self.assertEqual(resolver.getImportingPackage(path), "package")
+		self.assertEqual(resolver.resolvedNameCache.get( ("package", ".a") ), "dir.package.a")
+		# Test modules in the same package share resolved names
+		self.assertEqual(resolver.resolveImport("/some/root/dir/package/other.py", ParsedImport(".a", True)), "dir.package.a")
+		# Test caches are bounded
+		for name in ("b", "c", "d"):
+			resolver.resolveImport(path, ParsedImport(name, True))
+		self.assertEqual(len(resolver.resolvedNameCache), 2)
+		self.assertEqual(resolver.resolveImport(path, ParsedImport(".a", True)), "dir.package.a")
+		# Test failed resolutions are not cached
+		for i in range(2):
+			with self.assertRaises(ValueError):
+				resolver.resolveImport(path, ParsedImport("...a", True))
+
 	def test_resolveImports(self):
 		INVALID_INPUT_DEPENDENCIES = {
 			"/some/root/dir/package" : set(),
@@ -132,3 +158,7 @@ class TestImportResolver(unittest.TestCase):
 			self.importResolver.resolveImports(INVALID_INPUT_DEPENDENCIES)
 		# Test with filled dependency dicitonary
 		self.assertEqual(self.importResolver.resolveImports(INPUT_DEPENDENCIES), RESOLVED_DEPENDENCIES)
+		# Test with dependencies given as a DependencyGraph
+		resolved = self.importResolver.resolveImports(DependencyGraph(INPUT_DEPENDENCIES))
+		self.assertIsInstance(resolved, DependencyGraph)
+		self.assertEqual(resolved, RESOLVED_DEPENDENCIES)
@@ -2,6 +2,7 @@ import unittest
 from types import ModuleType
 import sys
 import os
+import io
 sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
 
 from moduledependency.outputter import OutputterFactory
@@ -70,3 +71,10 @@ class TestOutputterFactory(unittest.TestCase):
         self.assertTrue( isinstance(outputter, outputterModule.Outputter) )
         # ...and that it behaves correctly
         self.assertEqual( outputter.createOutput("TEST"), "TEST" )
+        # Test default implementation of writeOutput() uses createOutput()
+        stream = io.StringIO()
+        outputter.writeOutput("TEST", stream)
+        self.assertEqual(stream.getvalue(), "TEST\n")
+        stream = io.StringIO()
+        outputter.writeOutput("", stream)
+        self.assertEqual(stream.getvalue(), "")
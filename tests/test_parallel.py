@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import collections
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from fileprocessor.searchers import FileSearcher
+from fileprocessor.filterers import ExtensionFilterer
+from fileprocessor import FileProcessor
+from moduledependency.dependency_extractor import ModuleDependencyExtractor
+from moduledependency.parallel import ParallelFileProcessor, extractChunk, extractCountedChunk
+from moduledependency.parser import ParsedImport
+from moduledependency.cache import ExtractionCache
+
+
+class ChangingExtractor(ModuleDependencyExtractor):
+
+	"""Extractor which changes each file while it's being extracted."""
+
+	def extract(self, filename):
+		dependencies = super().extract(filename)
+		with open(filename, "a") as f:
+			f.write("import b\n")
+		return dependencies
+
+
+class TestParallelFileProcessor(unittest.TestCase):
+
+	def createProcessor(self, jobs, chunkSize = None):
+		return ParallelFileProcessor(FileSearcher(True), [ ExtensionFilterer(["py"]) ],
+			ModuleDependencyExtractor(), jobs, chunkSize)
+
+	def test_construction(self):
+		# Test invalid numbers of jobs
+		with self.assertRaises(TypeError):
+			self.createProcessor("2")
+		with self.assertRaises(ValueError):
+			self.createProcessor(0)
+		# Test default and custom chunk sizes
+		self.assertEqual(self.createProcessor(2).chunkSize, ParallelFileProcessor.DEFAULT_CHUNK_SIZE)
+		self.assertEqual(self.createProcessor(2, 3).chunkSize, 3)
+
+	def test_splitIntoChunks(self):
+		processor = self.createProcessor(2, 2)
+		self.assertEqual(processor.splitIntoChunks([]), [])
+		self.assertEqual(processor.splitIntoChunks(["a", "b"]), [ ["a", "b"] ])
+		self.assertEqual(processor.splitIntoChunks(["a", "b", "c", "d", "e"]),
+			[ ["a", "b"], ["c", "d"], ["e"] ])
+
+	def test_extractChunk(self):
+		filename = os.path.abspath("project/pack2/e.py")
+		self.assertEqual(extractChunk(ModuleDependencyExtractor(), [ filename ]),
+			[ (filename, set([ ParsedImport("subpack.f", True) ])) ])
+
+	def test_extractCountedChunk(self):
+		filename = os.path.abspath("project/pack2/e.py")
+		extractor = ModuleDependencyExtractor(counters=collections.Counter({ "files" : 5 }))
+		results, counters = extractCountedChunk(extractor, [ filename ])
+		self.assertEqual(results, extractChunk(ModuleDependencyExtractor(), [ filename ]))
+		# Test counts made before the chunk are discarded
+		self.assertEqual(counters["files"], 1)
+		self.assertEqual(counters["bytes"], os.path.getsize(filename))
+		self.assertEqual(counters["imports"], 1)
+
+	def test_process(self):
+		serialProcessor = FileProcessor(FileSearcher(True), [ ExtensionFilterer(["py"]) ],
+			ModuleDependencyExtractor())
+		expected = serialProcessor.process(os.path.abspath("project"))
+		# Test with more jobs than there are chunks and with small chunks
+		for jobs, chunkSize in [ (4, None), (2, 1), (3, 2) ]:
+			processor = self.createProcessor(jobs, chunkSize)
+			result = processor.process(os.path.abspath("project"))
+			self.assertEqual(result, expected)
+			# Ensure results are always merged in the same order
+			self.assertEqual(list(result.keys()), sorted(expected.keys()))
+		# Test a pool shared between runs isn't shut down
+		with ProcessPoolExecutor(max_workers=2) as pool:
+			processor = ParallelFileProcessor(FileSearcher(True), [ ExtensionFilterer(["py"]) ],
+				ModuleDependencyExtractor(), 2, 1, pool=pool)
+			self.assertEqual(processor.process(os.path.abspath("project")), expected)
+			self.assertEqual(processor.process(os.path.abspath("project")), expected)
+
+	def test_cache_changed(self):
+		directory = tempfile.mkdtemp()
+		cache = ExtractionCache(os.path.join(directory, "cache"))
+		try:
+			filename = os.path.join(directory, "a.py")
+			with open(filename, "w") as f:
+				f.write("import a\n")
+			processor = ParallelFileProcessor(FileSearcher(True), [ ExtensionFilterer(["py"]) ],
+				ChangingExtractor(), 2, cache=cache)
+			self.assertEqual(processor.process(directory), { filename : set([ ParsedImport("a", False) ]) })
+			# Test the out of date dependencies weren't stored
+			self.assertEqual(cache.lookup(filename, ChangingExtractor.ENGINE), None)
+		finally:
+			cache.close()
+			shutil.rmtree(directory)
@@ -1,10 +1,12 @@
 import unittest
 import sys
 import os
+import pickle
 sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
 
 from moduledependency.tokeniser import Token
-from moduledependency.parser import ImportParser, ParsedImport, ParseError
+from moduledependency.parser import (ImportParser, ParsedImport, ParseError, CONTEXT_TOP_LEVEL,
+	CONTEXT_TRY, CONTEXT_FUNCTION, CONTEXT_TYPE_CHECKING)
 
 
 class TestImport(unittest.TestCase):
@@ -19,6 +21,41 @@ class TestImport(unittest.TestCase):
 		self.assertEqual(importObj.moduleName, "byebye")
 		self.assertFalse( importObj.isRelative() )
 
+	def test_valueType(self):
+		importObj = ParsedImport("a.b", True)
+		with self.assertRaises(AttributeError):
+			importObj.moduleName = "c"
+		# Test equal imports have the same hash and share the same name
+		other = ParsedImport("".join(["a", ".b"]), True)
+		self.assertEqual(importObj, other)
+		self.assertEqual(hash(importObj), hash(other))
+		self.assertIs(importObj.moduleName, other.moduleName)
+		self.assertNotEqual(importObj, ParsedImport("a.b", False))
+		self.assertEqual(len(set([ importObj, other, ParsedImport("a.b", False) ])), 2)
+		# Test imports survive being pickled
+		self.assertEqual(pickle.loads(pickle.dumps(importObj)), importObj)
+
+	def test_location(self):
+		importObj = ParsedImport("a", False)
+		self.assertEqual( (importObj.context, importObj.line, importObj.column), (None, None, None) )
+		with self.assertRaises(ValueError):
+			ParsedImport("a", False, "nowhere")
+		located = ParsedImport("a", False, CONTEXT_FUNCTION, 3, 5)
+		self.assertEqual( (located.context, located.line, located.column), (CONTEXT_FUNCTION, 3, 5) )
+		# Test location isn't compared
+		self.assertEqual(located, importObj)
+		self.assertEqual(hash(located), hash(importObj))
+		unpickled = pickle.loads(pickle.dumps(located))
+		self.assertEqual( (unpickled.context, unpickled.line, unpickled.column), (CONTEXT_FUNCTION, 3, 5) )
+
+	def test_isDeferred(self):
+		# Test imports with unknown context are assumed to run at import time
+		self.assertFalse(ParsedImport("a", False).isDeferred())
+		self.assertFalse(ParsedImport("a", False, CONTEXT_TOP_LEVEL).isDeferred())
+		self.assertFalse(ParsedImport("a", False, CONTEXT_TRY).isDeferred())
+		self.assertTrue(ParsedImport("a", False, CONTEXT_FUNCTION).isDeferred())
+		self.assertTrue(ParsedImport("a", False, CONTEXT_TYPE_CHECKING).isDeferred())
+
 
 class TestImportParser(unittest.TestCase):
 
@@ -231,6 +268,18 @@ class TestImportParser(unittest.TestCase):
 		self.assertEqual( self.parser.parseImportedObjects(), ["test", "test2"] )
 		self.assertEqual( self.parser.index, 5)
 		self.parser.clear()
+		# Test with a trailing comma before a closing bracket, followed
+		# by another statement which shouldn't be consumed
+		self.parser.tokens = [ Token("other", "("), Token("identifier", "test"), Token(","), Token("identifier", "test2"),
+			Token(","), Token("other", ")"), Token("import"), Token("identifier", "other") ]
+		self.assertEqual( self.parser.parseImportedObjects(), ["test", "test2"] )
+		self.assertEqual( self.parser.index, 6)
+		self.parser.clear()
+		# Test with a trailing comma before a closing bracket at the end of the tokens
+		self.parser.tokens = [ Token("other", "("), Token("identifier", "test"), Token(","), Token("other", ")") ]
+		self.assertEqual( self.parser.parseImportedObjects(), ["test"] )
+		self.assertEqual( self.parser.index, 4)
+		self.parser.clear()
 
 		# Test with a single identifier
 		self.parser.tokens = [ Token("identifier", "one") ]
@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import json
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from moduledependency.stats import PipelineStatistics
+
+
+class TestPipelineStatistics(unittest.TestCase):
+
+	def setUp(self):
+		self.statistics = PipelineStatistics()
+
+	def tearDown(self):
+		self.statistics = None
+
+	def test_timeStage(self):
+		with self.statistics.timeStage("extract"):
+			sum(range(1000))
+		self.assertGreater(self.statistics.getWallTime("extract"), 0.0)
+		self.assertGreaterEqual(self.statistics.getCpuTime("extract"), 0.0)
+		# Test time is recorded when the stage raises an exception
+		with self.assertRaises(ValueError):
+			with self.statistics.timeStage("resolve"):
+				raise ValueError()
+		self.assertIn("resolve", self.statistics.stages)
+		# Test stages which haven't run
+		self.assertEqual(self.statistics.getWallTime("prune"), 0.0)
+		self.assertEqual(self.statistics.getCpuTime("prune"), 0.0)
+
+	def test_recordStage(self):
+		self.statistics.recordStage("extract", 2.0, 1.0)
+		self.statistics.recordStage("extract", 0.5, 0.25)
+		self.statistics.recordStage("walk", 1.0, 0.5)
+		self.assertEqual(self.statistics.getWallTime("extract"), 2.5)
+		self.assertEqual(self.statistics.getCpuTime("extract"), 1.25)
+		self.assertEqual(self.statistics.getWallTime(), 3.5)
+		self.assertEqual(self.statistics.getCpuTime(), 1.75)
+		# Test stages are ordered by the pipeline, then by when they ran
+		self.statistics.recordStage("custom", 0.0, 0.0)
+		self.assertEqual(self.statistics.getStages(), [ "walk", "extract", "custom" ])
+
+	def test_observers(self):
+		calls = []
+		observer = lambda stage, wallTime, cpuTime, statistics: calls.append( (stage, wallTime, cpuTime, statistics) )
+		self.statistics.addObserver(observer)
+		self.statistics.recordStage("walk", 1.0, 0.5)
+		self.assertEqual(calls, [ ("walk", 1.0, 0.5, self.statistics) ])
+		self.statistics.removeObserver(observer)
+		self.statistics.recordStage("walk", 1.0, 0.5)
+		self.assertEqual(len(calls), 1)
+		with self.assertRaises(ValueError):
+			self.statistics.removeObserver(observer)
+
+	def test_counters(self):
+		self.statistics.count("files")
+		self.statistics.count("bytes", 100)
+		self.statistics.update({ "files" : 2, "tokens" : 30 })
+		self.assertEqual(self.statistics.counters, { "files" : 3, "bytes" : 100, "tokens" : 30 })
+		self.assertEqual(self.statistics.counters["imports"], 0)
+
+	def test_toDict(self):
+		self.statistics.recordStage("walk", 1.0, 0.5)
+		self.statistics.count("files", 2)
+		data = self.statistics.toDict()
+		self.assertEqual(data, {
+			"stages" : { "walk" : { "wall" : 1.0, "cpu" : 0.5 } },
+			"counters" : { "files" : 2 }
+		})
+		self.assertEqual(json.loads(json.dumps(data)), data)
+
+	def test_format(self):
+		self.statistics.recordStage("extract", 2.0, 1.0)
+		self.statistics.count("files", 2)
+		lines = self.statistics.format().split("\n")
+		self.assertEqual(len(lines), 4)
+		self.assertTrue(lines[1].startswith("extract"))
+		self.assertIn("2.0000", lines[2])
+		self.assertTrue(lines[3].startswith("files"))
+		self.assertTrue(lines[3].endswith("2"))
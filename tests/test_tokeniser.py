@@ -3,7 +3,7 @@ import sys
 import os
 sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
 
-from moduledependency.tokeniser import Token, Tokeniser
+from moduledependency.tokeniser import Token, Tokeniser, RegexTokeniser
 
 
 class TestToken(unittest.TestCase):
@@ -20,6 +20,14 @@ class TestToken(unittest.TestCase):
 		self.assertEqual(token.type, "from")
 		self.assertEqual(token.value, "from")
 
+	def test_immutable(self):
+		token = Token("identifier", "testVariable")
+		with self.assertRaises(AttributeError):
+			token.value = "otherVariable"
+		with self.assertRaises(AttributeError):
+			token.line = 1
+		self.assertEqual(hash(token), hash(Token("identifier", "testVariable")))
+
 
 class TestTokeniser(unittest.TestCase):
 
@@ -115,6 +123,12 @@ class TestTokeniser(unittest.TestCase):
 		self.assertEqual(self.tokeniser.tokenise("from . import pack"),
 			[ Token("from"), Token("."), Token("import"), Token("identifier", "pack") ])
 
+	def test_sharedTokens(self):
+		tokens = self.tokeniser.tokenise("from a import b, a\nfrom a import b")
+		self.assertEqual(len(tokens), 10)
+		# Every occurrence of the same token is the same object
+		self.assertEqual(len(set( id(token) for token in tokens )), 5)
+
 	def test_skipComment(self):
 		# First element of tuple is the index to start skipping from
 		# and the second element is the desired end element
@@ -156,4 +170,57 @@ class TestTokeniser(unittest.TestCase):
 			self.tokeniser.source = TEST_SOURCE
 			self.tokeniser.index = test[0]
 			self.tokeniser.skipString(test[2])
-			self.assertEqual(self.tokeniser.index, test[0] + test[1])
\ No newline at end of file
+			self.assertEqual(self.tokeniser.index, test[0] + test[1])
+
+
+class TestRegexTokeniser(unittest.TestCase):
+
+	# Sources where the exact behaviour of string and comment skipping
+	# matters, so both tokenisers must agree on where tokens start
+	TRICKY_SOURCES = [
+		"",
+		"x = '' + \"\" + ''' ''' + \"\"\"\"\"\"",
+		"a = 'unterminated string\nimport x",
+		"a = \"escaped \\\" quote\" # import y\nfrom z import w",
+		"b = 'double \\\\' ; import c",
+		"'''multi\nline ' \" import q'''\nimport r",
+		"from.a import(b,\\\n c)",
+		"x = 1e5 + 2 ** 3 // 0x1F;\x0cimport café",
+		"# comment without trailing newline",
+		"import a.b.c as d, e"
+	]
+
+	def setUp(self):
+		self.tokeniser = Tokeniser()
+		self.regexTokeniser = RegexTokeniser()
+
+	def tearDown(self):
+		self.tokeniser = None
+		self.regexTokeniser = None
+
+	def test_tokenise(self):
+		# Test with invalid type
+		with self.assertRaises(TypeError):
+			self.regexTokeniser.tokenise(3636)
+		# Test with empty Python source code
+		self.assertEqual(self.regexTokeniser.tokenise(""), [])
+		# Test with source that ends STRAIGHT after import
+		self.assertEqual(self.regexTokeniser.tokenise("from . import pack"),
+			[ Token("from"), Token("."), Token("import"), Token("identifier", "pack") ])
+
+	def test_sharedTokens(self):
+		tokens = self.regexTokeniser.tokenise("from a import b, a\nfrom a import b")
+		self.assertEqual(len(tokens), 10)
+		# Every occurrence of the same token is the same object
+		self.assertEqual(len(set( id(token) for token in tokens )), 5)
+
+	def test_parity(self):
+		# Test tricky sources
+		for source in self.TRICKY_SOURCES:
+			self.assertEqual(self.regexTokeniser.tokenise(source), self.tokeniser.tokenise(source))
+		# Test real Python modules
+		testDirectory = os.path.dirname(os.path.abspath(__file__))
+		for filename in ("files/some_dependencies.py", "files/blocked_dependencies.py", "test_tokeniser.py"):
+			with open(os.path.join(testDirectory, filename), "r") as f:
+				source = f.read()
+			self.assertEqual(self.regexTokeniser.tokenise(source), self.tokeniser.tokenise(source))
\ No newline at end of file
@@ -24,3 +24,37 @@ class TestUtil(unittest.TestCase):
 		elif platform.system() == "Unix" or platform.system() == "Linux":
 			self.assertEqual(getProjectRoot("/opt/python"), "python")
 			self.assertEqual(getProjectRoot("/opt"), "opt")
+
+	def test_isAsciiCompatible(self):
+		with self.assertRaises(LookupError):
+			isAsciiCompatible("not-an-encoding")
+		for encoding in [ "utf-8", "UTF8", "utf-8-sig", "ascii", "latin-1", "cp1252", "koi8-r" ]:
+			self.assertTrue(isAsciiCompatible(encoding))
+		for encoding in [ "utf-16", "shift_jis", "gbk", "utf-7" ]:
+			self.assertFalse(isAsciiCompatible(encoding))
+
+
+class TestLRUCache(unittest.TestCase):
+
+	def test_construction(self):
+		with self.assertRaises(TypeError):
+			LRUCache("2")
+		with self.assertRaises(ValueError):
+			LRUCache(0)
+		self.assertEqual(len(LRUCache(2)), 0)
+
+	def test_getAndPut(self):
+		cache = LRUCache(2)
+		self.assertEqual(cache.get("a"), None)
+		self.assertEqual(cache.get("a", 5), 5)
+		cache.put("a", 1)
+		cache.put("b", 2)
+		self.assertEqual(cache.get("a"), 1)
+		# Test least recently used entry is discarded when full
+		cache.put("c", 3)
+		self.assertEqual(len(cache), 2)
+		self.assertFalse( "b" in cache )
+		self.assertEqual(cache.get("a"), 1)
+		self.assertEqual(cache.get("c"), 3)
+		cache.clear()
+		self.assertEqual(len(cache), 0)
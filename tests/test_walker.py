@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from moduledependency.walker import ProjectWalker
+
+
+class TestProjectWalker(unittest.TestCase):
+
+	PROJECT_DIRECTORY = os.path.abspath("project")
+
+	def setUp(self):
+		self.walker = ProjectWalker()
+
+	def tearDown(self):
+		self.walker = None
+
+	def test_getName(self):
+		# Test files which aren't packages or modules
+		self.assertEqual(self.walker.getName("project", "", "b.txt"), None)
+		self.assertEqual(self.walker.getName("project", "pack2.subpack", "g.test"), None)
+		# Test files and directories in the project root
+		self.assertEqual(self.walker.getName("project", "", "__init__.py"), "project")
+		self.assertEqual(self.walker.getName("project", "", "a.py"), "project.a")
+		self.assertEqual(self.walker.getName("project", "", "pack"), "project.pack")
+		# Test nested files
+		self.assertEqual(self.walker.getName("project", "pack.subpack2", "__init__.py"), "project.pack.subpack2")
+		self.assertEqual(self.walker.getName("project", "pack.subpack2", "d.py"), "project.pack.subpack2.d")
+
+	def test_walk(self):
+		with self.assertRaises(IOError):
+			list(self.walker.walk("__DIRECTORY_THAT_DOES_NOT_EXIST__"))
+		entries = list(self.walker.walk(self.PROJECT_DIRECTORY))
+		names = dict( (os.path.relpath(entry.path, self.PROJECT_DIRECTORY), name) for entry, name in entries )
+		self.assertEqual(names["b.txt"], None)
+		self.assertEqual(names[os.path.join("pack2", "subpack")], "project.pack2.subpack")
+		self.assertEqual(names[os.path.join("pack", "subpack2", "subsubpack", "c.py")], "project.pack.subpack2.subsubpack.c")
+		# Test every entry is walked exactly once
+		self.assertEqual(len(entries), len(names))
+		self.assertEqual(len(entries), sum( len(dirs) + len(files) for root, dirs, files in os.walk(self.PROJECT_DIRECTORY) ))
+
+	def test_scan(self):
+		self.walker.scan(self.PROJECT_DIRECTORY)
+		# __pycache__ directories only exist once the project's modules
+		# have been compiled, so they're ignored. Packages are named
+		# once for their directory and once for their __init__.py.
+		self.assertEqual(sorted( name for name in self.walker.packageNames if not "__pycache__" in name ), [
+			"project", "project.__main__", "project.a", "project.pack",
+			"project.pack.subpack2", "project.pack.subpack2",
+			"project.pack.subpack2.d", "project.pack.subpack2.subsubpack",
+			"project.pack.subpack2.subsubpack.c", "project.pack2", "project.pack2.e",
+			"project.pack2.subpack", "project.pack2.subpack.f"
+		])
+		expectedPaths = []
+		for root, directories, filenames in os.walk(self.PROJECT_DIRECTORY):
+			expectedPaths += [ os.path.join(root, filename) for filename in filenames if filename.endswith(".py") ]
+		self.assertEqual(sorted(self.walker.modulePaths), sorted(expectedPaths))
+
+	def test_search(self):
+		modulePaths = self.walker.search(self.PROJECT_DIRECTORY)
+		self.assertEqual(len(modulePaths), 8)
+		self.assertEqual(self.walker.projectDirectory, self.PROJECT_DIRECTORY)
+		# Test searching the scanned directory again doesn't walk it again
+		self.walker.modulePaths = [ "cached.py" ]
+		self.assertEqual(self.walker.search(self.PROJECT_DIRECTORY), [ "cached.py" ])
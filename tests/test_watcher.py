@@ -0,0 +1,140 @@
+import unittest
+import sys
+import os
+import shutil
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from moduledependency.watcher import DependencyWatcher, DependencyDiff
+from moduledependency.executor import Executor
+from moduledependency.depth_pruner import DepthPruner
+
+
+class TestDependencyDiff(unittest.TestCase):
+
+	def test_isEmpty(self):
+		self.assertTrue( DependencyDiff([], [], [], []).isEmpty() )
+		self.assertFalse( DependencyDiff(["a"], [], [], []).isEmpty() )
+		self.assertFalse( DependencyDiff([], [], [], [("a", "b")]).isEmpty() )
+		self.assertFalse( DependencyDiff([], [], [], [], [("a.py", "error")]).isEmpty() )
+
+	def test_str(self):
+		self.assertEqual(str(DependencyDiff([], [], [], [])), "")
+		diff = DependencyDiff(["p.c"], ["p.d"], [("p.c", "p.a"), ("p.a", "p.b")], [("p.b", "p.a")])
+		self.assertEqual(str(diff), "- p.d\n+ p.c\n- p.b -> p.a\n+ p.a -> p.b\n+ p.c -> p.a")
+		diff = DependencyDiff([], [], [], [("p.b", "p.a")], [("b.py", "bad")])
+		self.assertEqual(str(diff), "- p.b -> p.a\n! b.py: bad")
+
+
+class TestDependencyWatcher(unittest.TestCase):
+
+	WATCHED_DIRECTORY = ".test_watcher"
+	PROJECT_DIRECTORY = os.path.join(WATCHED_DIRECTORY, "project")
+
+	def setUp(self):
+		if os.path.isdir(self.WATCHED_DIRECTORY):
+			shutil.rmtree(self.WATCHED_DIRECTORY)
+		shutil.copytree("project", self.PROJECT_DIRECTORY)
+
+	def tearDown(self):
+		if os.path.isdir(self.WATCHED_DIRECTORY):
+			shutil.rmtree(self.WATCHED_DIRECTORY)
+
+	def writeFile(self, relativePath, contents):
+		"""Write file in the watched project and ensure its modification time changes."""
+		path = os.path.join(self.PROJECT_DIRECTORY, relativePath)
+		with open(path, "w") as f:
+			f.write(contents)
+		stat = os.stat(path)
+		os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+	def expectedDependencies(self, depth = None):
+		"""Return dependencies of the watched project computed from scratch."""
+		dependencies = Executor().searchForDependencies(self.PROJECT_DIRECTORY)
+		if depth != None:
+			dependencies = DepthPruner().prune(dependencies, depth)
+		return dependencies
+
+	def test_construction(self):
+		with self.assertRaises(IOError):
+			DependencyWatcher("non_existent_dir")
+
+	def test_start(self):
+		watcher = DependencyWatcher(self.PROJECT_DIRECTORY)
+		self.assertEqual(watcher.start(), self.expectedDependencies())
+		# Test with dependencies extracted beforehand and with pruning
+		extracted = Executor().extractDependencies(os.path.abspath(self.PROJECT_DIRECTORY))
+		watcher = DependencyWatcher(self.PROJECT_DIRECTORY, 1)
+		self.assertEqual(watcher.start(extracted), self.expectedDependencies(1))
+
+	def test_poll(self):
+		watcher = DependencyWatcher(self.PROJECT_DIRECTORY)
+		watcher.start()
+		# Test nothing changed
+		self.assertTrue( watcher.poll().isEmpty() )
+		# Test changed file
+		self.writeFile("pack2/e.py", "from .subpack import f\nfrom .. import a")
+		diff = watcher.poll()
+		self.assertEqual(diff.addedEdges, [ ("project.pack2.e", "project.a") ])
+		self.assertEqual(diff.removedEdges, [])
+		self.assertEqual(watcher.getDependencies(), self.expectedDependencies())
+		# Test added file
+		self.writeFile("pack2/h.py", "from . import e")
+		diff = watcher.poll()
+		self.assertEqual(diff.addedModules, [ "project.pack2.h" ])
+		self.assertEqual(diff.addedEdges, [ ("project.pack2.h", "project.pack2.e") ])
+		self.assertEqual(watcher.getDependencies(), self.expectedDependencies())
+		# Test deleted file
+		os.remove(os.path.join(self.PROJECT_DIRECTORY, "pack2/subpack/f.py"))
+		diff = watcher.poll()
+		self.assertEqual(diff.removedModules, [ "project.pack2.subpack.f" ])
+		# NOTE: "project.pack2.e -> project.pack2.subpack.f" is kept because
+		# the dependency is still contained in whitelisted "project.pack2.subpack"
+		self.assertEqual(diff.removedEdges, [ ("project.pack2.subpack.f", "project.pack2.e") ])
+		self.assertEqual(watcher.getDependencies(), self.expectedDependencies())
+
+	def test_poll_unparsable(self):
+		watcher = DependencyWatcher(self.PROJECT_DIRECTORY)
+		expected = watcher.start()
+		# Test half-written files are reported, and the old dependencies kept
+		self.writeFile("pack2/e.py", "from . import\n")
+		self.writeFile("pack2/h.py", "import\n")
+		paths = [ os.path.abspath(os.path.join(self.PROJECT_DIRECTORY, path)) for path in [ "pack2/e.py", "pack2/h.py" ] ]
+		diff = watcher.poll()
+		self.assertEqual([ path for path, message in diff.errors ], paths)
+		self.assertEqual((diff.addedModules, diff.removedModules, diff.addedEdges, diff.removedEdges),
+			([], [], [], []))
+		self.assertEqual(watcher.getDependencies(), expected)
+		# Test the files are extracted again on the next poll, but the
+		# same errors aren't reported again
+		extracted = []
+		extract = watcher.extractor.extract
+		watcher.extractor.extract = lambda path: (extracted.append(path), extract(path))[1]
+		self.assertTrue( watcher.poll().isEmpty() )
+		self.assertEqual(sorted(extracted), paths)
+		self.assertEqual(watcher.getDependencies(), expected)
+		# Test the files are extracted once they're finished
+		self.writeFile("pack2/e.py", "from .subpack import f\nfrom .. import a")
+		self.writeFile("pack2/h.py", "from . import e")
+		diff = watcher.poll()
+		self.assertEqual(diff.errors, [])
+		self.assertEqual(diff.addedEdges, [ ("project.pack2.e", "project.a"), ("project.pack2.h", "project.pack2.e") ])
+		self.assertEqual(watcher.getDependencies(), self.expectedDependencies())
+		self.assertTrue( watcher.poll().isEmpty() )
+
+	def test_poll_pruned(self):
+		watcher = DependencyWatcher(self.PROJECT_DIRECTORY, 1)
+		watcher.start()
+		# Test change which adds a dependency between pruned modules
+		self.writeFile("pack2/e.py", "from .subpack import f\nfrom .. import a")
+		diff = watcher.poll()
+		self.assertEqual(diff.addedEdges, [ ("project.pack2", "project.a") ])
+		self.assertEqual(watcher.getDependencies(), self.expectedDependencies(1))
+		# Test change which doesn't affect the pruned dependencies
+		self.writeFile("pack/subpack2/d.py", "from .subsubpack import c\nfrom ... import pack2")
+		self.assertTrue( watcher.poll().isEmpty() )
+		self.assertEqual(watcher.getDependencies(), self.expectedDependencies(1))
+		# Test removing the only module which prunes to a name
+		os.remove(os.path.join(self.PROJECT_DIRECTORY, "a.py"))
+		diff = watcher.poll()
+		self.assertEqual(diff.removedModules, [ "project.a" ])
+		self.assertEqual(watcher.getDependencies(), self.expectedDependencies(1))
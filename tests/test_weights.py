@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+import random
+sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
+
+from moduledependency.weights import WeightAnalyser, ImportWeights, measureFile
+from moduledependency.graph import DependencyGraph
+
+
+class TestWeightAnalyser(unittest.TestCase):
+
+	DEPENDENCIES = {
+		"project" : set(["project.pack"]),
+		"project.a" : set(["project.pack.b", "project.c.function"]),
+		"project.pack.b" : set(["project.pack.d"]),
+		"project.pack.d" : set(["project.pack.b"]),
+		"project.c" : set()
+	}
+	# Bytes, lines and imports of every module
+	SIZES = {
+		"project" : (10, 1, 1),
+		"project.a" : (100, 10, 2),
+		"project.pack" : (0, 0, 0),
+		"project.pack.b" : (1000, 100, 1),
+		"project.pack.d" : (10000, 1000, 1),
+		"project.c" : (100000, 10000, 0)
+	}
+
+	def setUp(self):
+		self.analyser = WeightAnalyser()
+
+	def tearDown(self):
+		self.analyser = None
+
+	def test_measureFile(self):
+		with open("files/some_dependencies.py", "rb") as f:
+			data = f.read()
+		self.assertEqual(measureFile("files/some_dependencies.py"),
+			(len(data), len(data.splitlines())))
+		with self.assertRaises(IOError):
+			measureFile("non-existent")
+
+	def test_analyse(self):
+		weights = self.analyser.analyse(self.DEPENDENCIES, self.SIZES)
+		# Test own sizes include the module itself
+		self.assertEqual(weights.getSize("project.a"), (1, 100, 10, 2))
+		self.assertEqual(weights.getSize("project.c.function"), ImportWeights.EMPTY_SIZE)
+		with self.assertRaises(KeyError):
+			weights.getSize("project.unknown")
+		with self.assertRaises(KeyError):
+			weights.getTotal("project.unknown")
+		# Test importing a module loads its packages, and importing a
+		# name loads the module containing it
+		self.assertEqual(weights.getTotal("project.a"), (6, 111110, 11111, 5))
+		self.assertEqual(weights.getTotal("project.c.function"), (3, 100010, 10001, 1))
+		# Test modules in an import cycle have the same total
+		self.assertEqual(weights.getTotal("project.pack.b"), (4, 11010, 1101, 3))
+		self.assertEqual(weights.getTotal("project.pack.d"), weights.getTotal("project.pack.b"))
+		self.assertEqual(weights.getTotal("project"), (2, 10, 1, 1))
+		self.assertEqual(weights.getTotal("project.pack"), weights.getTotal("project"))
+		# Test DependencyGraph gives the same weights
+		graphWeights = self.analyser.analyse(DependencyGraph(self.DEPENDENCIES), self.SIZES)
+		self.assertEqual(graphWeights.totals, weights.totals)
+		# Test empty graph
+		self.assertEqual(self.analyser.analyse({}, {}).totals, {})
+
+	def test_getHeaviest(self):
+		weights = self.analyser.analyse(self.DEPENDENCIES, self.SIZES)
+		self.assertEqual(weights.getHeaviest(2), [ "project.a", "project.c" ])
+		self.assertEqual(weights.getHeaviest(metric="modules"), [ "project.a", "project.pack.b",
+			"project.pack.d", "project.c", "project", "project.pack" ])
+		with self.assertRaises(ValueError):
+			weights.getHeaviest(metric="unknown")
+		lines = weights.format(2).split("\n")
+		self.assertEqual(len(lines), 3)
+		self.assertEqual(lines[1].split(), [ "project.a", "6", "111110", "11111", "5" ])
+
+	def test_randomGraphs(self):
+		# Compare totals to the sizes of every name each name reaches
+		randomGenerator = random.Random(0)
+		for i in range(20):
+			names = [ "project.m{}".format(j) for j in range(30) ]
+			dependencies = { name : set( randomGenerator.sample(names, randomGenerator.randint(0, 3)) )
+				for name in names }
+			sizes = { name : (randomGenerator.randint(0, 5000), randomGenerator.randint(0, 100),
+				randomGenerator.randint(0, 3)) for name in names }
+			weights = self.analyser.analyse(dependencies, sizes)
+			graph = DependencyGraph(dependencies)
+			for name in names:
+				reachable = graph.getTransitiveDependencies(name) | set([ name ])
+				expected = (len(reachable),) + tuple( sum( sizes[other][metric] for other in reachable )
+					for metric in range(3) )
+				self.assertEqual(weights.getTotal(name), expected)
@@ -5,7 +5,74 @@ import platform
 import shutil
 
 sys.path.append(os.environ.get("PROJECT_ROOT_DIRECTORY", "."))
-from moduledependency.whitelist import WhitelistGenerator, WhitelistApplier
+from moduledependency.whitelist import Whitelist, WhitelistGenerator, WhitelistApplier
+from moduledependency.graph import DependencyGraph
+
+
+class TestWhitelist(unittest.TestCase):
+
+	def setUp(self):
+		self.whitelist = Whitelist([ "a", "b.c", "b.c.d.e", "f" ])
+
+	def tearDown(self):
+		self.whitelist = None
+
+	def test_construction(self):
+		with self.assertRaises(TypeError):
+			Whitelist([ 5 ])
+		self.assertEqual(len(Whitelist()), 0)
+		self.assertEqual(len(self.whitelist), 4)
+		self.assertEqual(set(self.whitelist), set([ "a", "b.c", "b.c.d.e", "f" ]))
+		self.assertEqual(self.whitelist, Whitelist([ "f", "b.c.d.e", "b.c", "a" ]))
+		self.assertNotEqual(self.whitelist, Whitelist([ "a" ]))
+
+	def test_contains(self):
+		self.assertTrue( "a" in self.whitelist )
+		self.assertTrue( "b.c.d.e" in self.whitelist )
+		self.assertFalse( "b" in self.whitelist )
+		self.assertFalse( "b.c.d" in self.whitelist )
+
+	def test_allows(self):
+		# Test direct matches
+		self.assertTrue( self.whitelist.allows("a") )
+		self.assertTrue( self.whitelist.allows("b.c") )
+		# Test names directly contained in whitelisted packages
+		self.assertTrue( self.whitelist.allows("a.x") )
+		self.assertTrue( self.whitelist.allows("b.c.d") )
+		self.assertTrue( self.whitelist.allows("b.c.d.e.x") )
+		# Test names not in or too deep in whitelisted packages
+		self.assertFalse( self.whitelist.allows("b") )
+		self.assertFalse( self.whitelist.allows("a.x.y") )
+		self.assertFalse( self.whitelist.allows("x") )
+
+	def test_containsPackageOf(self):
+		self.assertTrue( self.whitelist.containsPackageOf("a") )
+		self.assertTrue( self.whitelist.containsPackageOf("a.x.y") )
+		self.assertTrue( self.whitelist.containsPackageOf("b.c.d.e.f") )
+		self.assertFalse( self.whitelist.containsPackageOf("b") )
+		self.assertFalse( self.whitelist.containsPackageOf("") )
+		self.assertFalse( self.whitelist.containsPackageOf("x.a") )
+		# Test the empty name contains everything
+		self.assertTrue( Whitelist([ "" ]).containsPackageOf("x.a") )
+
+	def test_hasComponent(self):
+		self.assertTrue( self.whitelist.hasComponent("a") )
+		self.assertTrue( self.whitelist.hasComponent("d") )
+		self.assertFalse( self.whitelist.hasComponent("x") )
+		self.assertFalse( self.whitelist.hasComponent("") )
+
+	def test_hasPrefix(self):
+		self.assertTrue( self.whitelist.hasPrefix("a") )
+		self.assertTrue( self.whitelist.hasPrefix("b") )
+		self.assertTrue( self.whitelist.hasPrefix("b.c.d") )
+		self.assertFalse( self.whitelist.hasPrefix("a.x") )
+		self.assertFalse( self.whitelist.hasPrefix("c") )
+
+	def test_getContained(self):
+		self.assertEqual(self.whitelist.getContained("b"), [ "b.c", "b.c.d.e" ])
+		self.assertEqual(self.whitelist.getContained("b.c.d"), [ "b.c.d.e" ])
+		self.assertEqual(self.whitelist.getContained("a"), [ "a" ])
+		self.assertEqual(self.whitelist.getContained("x"), [])
 
 
 class TestWhitelistGenerator(unittest.TestCase):
@@ -75,6 +142,12 @@ class TestWhitelistGenerator(unittest.TestCase):
 			set([ "nested.a", "nested.c", "nested.a.b", "nested.m1", "nested.a.b.m2",
 				  "nested.a.b.m3", "nested.c.m4", "nested.c.m5" ]) )
 
+	def test_generateWhitelist(self):
+		whitelist = self.whitelistGenerator.generateWhitelist(".test_whitelist_generator/nested")
+		self.assertTrue( isinstance(whitelist, Whitelist) )
+		self.assertEqual(whitelist.getContained("nested.a"), [ "nested.a", "nested.a.b",
+			"nested.a.b.m2", "nested.a.b.m3" ])
+
 
 class TestWhitelistApplier(unittest.TestCase):
 
@@ -96,6 +169,11 @@ class TestWhitelistApplier(unittest.TestCase):
 		self.assertTrue( self.applier.inWhitelist("b.c.d", WHITELIST) )
 		# Test nested module one level too deep to match element in whitelist
 		self.assertFalse( self.applier.inWhitelist("b.c.d.e", WHITELIST) )
+		# Test the same lookups with an indexed whitelist
+		whitelist = Whitelist(WHITELIST)
+		self.assertTrue( self.applier.inWhitelist("a", whitelist) )
+		self.assertTrue( self.applier.inWhitelist("b.c.d", whitelist) )
+		self.assertFalse( self.applier.inWhitelist("b.c.d.e", whitelist) )
 
 	def test_applyToProject(self):
 		PROJECT_PATH = "project"
@@ -142,3 +220,7 @@ class TestWhitelistApplier(unittest.TestCase):
 		# Test dependencies where most are in given project
 		self.assertEqual( self.applier.applyToProject(PROJECT_PATH,
 			INPUT_DEPENDENCIES), EXPECTED_FILTERED_DEPENDENCIES)
+		# Test dependencies given as a DependencyGraph
+		filtered = self.applier.applyToProject(PROJECT_PATH, DependencyGraph(INPUT_DEPENDENCIES))
+		self.assertIsInstance(filtered, DependencyGraph)
+		self.assertEqual(filtered, EXPECTED_FILTERED_DEPENDENCIES)
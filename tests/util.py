@@ -2,6 +2,7 @@
 
 import unittest
 import os
+import io
 
 class OutputterTestHarness:
 
@@ -33,6 +34,17 @@ class OutputterTestHarness:
                     self.assertEqual(os.path.exists(self.TEST_OUTPUT_FILE), True)
                     with open(self.TEST_OUTPUT_FILE, "r") as f:
                         self.assertEqual(f.read(), outputData)
+                # Test output written to a stream is the same, plus a newline
+                stream = io.StringIO()
+                stdoutOutputter.writeOutput(inputData, stream)
+                self.assertEqual(stream.getvalue(), "{}\n".format(outputData))
+                if self.testFiles:
+                    stream = io.StringIO()
+                    os.remove(self.TEST_OUTPUT_FILE)
+                    fileOutputter.writeOutput(inputData, stream)
+                    self.assertEqual(stream.getvalue(), "{}\n".format(outputData))
+                    with open(self.TEST_OUTPUT_FILE, "r") as f:
+                        self.assertEqual(f.read(), outputData)
         finally:
             # Ensure test file is deleted
             if self.testFiles: